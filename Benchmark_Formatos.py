@@ -0,0 +1,187 @@
+"""
+Benchmark_Formatos.py
+---------------------
+Benchmark de formatos de armazenamento para a tabela de alimentos.
+
+Compara CSV, Parquet (vários codecs e tamanhos de row group), Feather e
+Arrow IPC, em leituras completas e de subconjunto de colunas, com cache
+quente e frio, medindo tempo (várias repetições) e pico de memória. A base
+pode ser ampliada sinteticamente para simular catálogos maiores.
+
+Uso:
+    python Benchmark_Formatos.py
+    python Benchmark_Formatos.py --escalas 1 10 50 --repeticoes 7
+    python Benchmark_Formatos.py food.csv --saida benchmarks --sem-memoria
+
+Os resultados são gravados em JSON (uma execução) e acrescentados a um CSV
+de histórico, para acompanhar a evolução ao longo do tempo.
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from dados import COLUNA_ID, carregar_tabela, fonte_padrao
+from dados.medicao import LEITORES, REPETICOES, medir_leitura, medir_pico_memoria
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+CODECS_PARQUET = ["snappy", "zstd", "gzip", "brotli"]
+ROW_GROUPS = [10_000, 100_000, 1_000_000]
+ESCALAS = [1, 10]
+DIR_SAIDA = "benchmarks"
+
+# Subconjunto típico de uma página (ver COLUNAS_USADAS em Dashboard.py)
+COLUNAS_SUBCONJUNTO = [
+    "Description",
+    "Data.Kilocalories",
+    "Data.Protein",
+    "Data.Carbohydrate",
+    "Data.Fat.Total Lipid",
+]
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def ampliar(df: pd.DataFrame, escala: int) -> pd.DataFrame:
+    """Replica a base `escala` vezes, com IDs distintos, para simular catálogos maiores."""
+    if escala == 1:
+        return df
+    partes = []
+    passo = int(df[COLUNA_ID].max()) + 1
+    for i in range(escala):
+        parte = df.copy()
+        parte[COLUNA_ID] = parte[COLUNA_ID] + i * passo
+        partes.append(parte)
+    return pd.concat(partes, ignore_index=True)
+
+
+def gerar_arquivos(df: pd.DataFrame, destino: Path) -> list[dict]:
+    """Grava a base em todos os formatos/variações e devolve a descrição de cada arquivo."""
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    arquivos = []
+
+    caminho = destino / "dados.csv"
+    df.to_csv(caminho, index=False)
+    arquivos.append({"formato": "csv", "codec": None, "row_group": None, "caminho": caminho})
+
+    for codec in CODECS_PARQUET:
+        for row_group in ROW_GROUPS:
+            if row_group > len(df) and row_group != ROW_GROUPS[0]:
+                continue  # row group maior que a base equivale ao anterior
+            caminho = destino / f"dados_{codec}_{row_group}.parquet"
+            pq.write_table(tabela, caminho, compression=codec, row_group_size=row_group)
+            arquivos.append({"formato": "parquet", "codec": codec, "row_group": row_group, "caminho": caminho})
+
+    caminho = destino / "dados.feather"
+    feather.write_feather(tabela, caminho, compression="lz4")
+    arquivos.append({"formato": "feather", "codec": "lz4", "row_group": None, "caminho": caminho})
+
+    caminho = destino / "dados.arrow"
+    feather.write_feather(tabela, caminho, compression="uncompressed")
+    arquivos.append({"formato": "arrow_ipc", "codec": None, "row_group": None, "caminho": caminho})
+
+    return arquivos
+
+
+def salvar_resultados(resultados: list[dict], saida: Path) -> Path:
+    """Grava a execução em JSON e acrescenta as linhas ao histórico CSV."""
+    saida.mkdir(parents=True, exist_ok=True)
+    carimbo = datetime.now().strftime("%Y%m%d-%H%M%S")
+
+    execucao = {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "ambiente": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "pyarrow": pa.__version__,
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "resultados": resultados,
+    }
+    caminho_json = saida / f"benchmark_{carimbo}.json"
+    caminho_json.write_text(json.dumps(execucao, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    historico = saida / "historico.csv"
+    linhas = pd.DataFrame(resultados).assign(data=execucao["data"])
+    linhas.to_csv(historico, mode="a", header=not historico.exists(), index=False)
+    return caminho_json
+
+
+# ===============================================
+# 🚀 EXECUÇÃO PRINCIPAL
+# ===============================================
+
+def executar(fonte, escalas=ESCALAS, repeticoes: int = REPETICOES, memoria: bool = True) -> list[dict]:
+    """Roda a matriz completa de formatos × leituras × cache × escalas."""
+    base = carregar_tabela(fonte)
+    resultados = []
+
+    for escala in escalas:
+        df = ampliar(base, escala)
+        print(f"\n📏 Escala {escala}x ({len(df):,} registros)")
+
+        with tempfile.TemporaryDirectory(prefix="viva-bem-bench-") as tmp:
+            for arquivo in gerar_arquivos(df, Path(tmp)):
+                formato = arquivo["formato"]
+                leitor = LEITORES[formato]
+                rotulo = " ".join(str(v) for v in (formato, arquivo["codec"], arquivo["row_group"]) if v)
+
+                for leitura, colunas in (("completa", None), ("subconjunto", COLUNAS_SUBCONJUNTO)):
+                    pico = medir_pico_memoria(formato, arquivo["caminho"], colunas) if memoria else None
+                    for cache in ("quente", "frio"):
+                        tempos = medir_leitura(leitor, arquivo["caminho"], colunas, repeticoes, frio=cache == "frio")
+                        resultados.append({
+                            "escala": escala,
+                            "linhas": len(df),
+                            "formato": formato,
+                            "codec": arquivo["codec"],
+                            "row_group": arquivo["row_group"],
+                            "tamanho_bytes": arquivo["caminho"].stat().st_size,
+                            "leitura": leitura,
+                            "cache": cache,
+                            **tempos,
+                            "pico_memoria_mb": pico,
+                        })
+                        print(f"   • {rotulo:<24} {leitura:<11} {cache:<6} "
+                              f"{tempos['tempo_mediana_s'] * 1000:8.1f} ms")
+
+    return resultados
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de formatos de armazenamento da base de alimentos.")
+    parser.add_argument("fonte", nargs="?", default=None, help="CSV/XLSX/Parquet de origem (padrão: base do projeto)")
+    parser.add_argument("--escalas", type=int, nargs="+", default=ESCALAS,
+                        help="Fatores de ampliação sintética da base (padrão: 1 10)")
+    parser.add_argument("--repeticoes", type=int, default=REPETICOES, help="Repetições por medida")
+    parser.add_argument("--saida", default=DIR_SAIDA, help="Diretório dos resultados JSON/CSV")
+    parser.add_argument("--sem-memoria", action="store_true", help="Não mede pico de memória (mais rápido)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    fonte = args.fonte or fonte_padrao()
+    print(f"🏁 Benchmark de formatos a partir de '{fonte}'")
+
+    resultados = executar(fonte, args.escalas, args.repeticoes, memoria=not args.sem_memoria)
+    caminho = salvar_resultados(resultados, Path(args.saida))
+    print(f"\n💾 Resultados salvos em '{caminho}' e em '{Path(args.saida) / 'historico.csv'}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,18 +3,65 @@ convert_to_parquet.py
 ---------------------
 Script para converter o arquivo 'food.csv' para o formato Parquet,
 otimizando espaço e desempenho em análises de dados nutricionais.
+
+Uso:
+    python Convert_Parquet.py                         # conversão completa em memória
+    python Convert_Parquet.py --streaming             # conversão em blocos (memória constante)
+    python Convert_Parquet.py dump.csv dump.parquet --streaming --chunksize 200000
+    python Convert_Parquet.py --particionar           # dataset food_dataset/Category=<valor>/
+    python Convert_Parquet.py delta.csv food.parquet --upsert   # só linhas novas/alteradas
+    python Convert_Parquet.py --consolidar            # junta os fragmentos de upsert na base
+    python Convert_Parquet.py regioes/ --diretorio --workers 8  # vários CSV/XLSX → regioes_dataset/
+    python Convert_Parquet.py --porcoes               # nutrientes por medida caseira → food_porcoes.parquet
 """
 
+import argparse
+import itertools
+import json
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import time
 import os
+import shutil
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+from dados import (
+    COLUNAS,
+    COLUNAS_TEXTO_PORCAO,
+    COLUNA_CATEGORIA,
+    COLUNA_DESCRICAO,
+    COLUNA_ID,
+    ErroValidacao,
+    aplicar_esquema,
+    caminho_dataset,
+    ler_arquivo,
+    caminho_fragmentos,
+    consolidar,
+    gravar_porcoes,
+    particionamento,
+    upsert,
+    validar_blocos,
+    validar_tabela,
+)
+from dados.indice import ordenar, tamanho_row_group
+from dados.medicao import ler_csv, ler_parquet, medir_leitura
 
 # ===============================================
 # 🔧 CONFIGURAÇÕES
 # ===============================================
 CSV_FILE = "food.csv"
 PARQUET_FILE = "food.parquet"
+CHUNK_SIZE = 100_000  # linhas por bloco no modo streaming
+MAX_PARTITIONS = 100_000  # o pyarrow limita a 1024 por padrão; há ~1.200 categorias
+MANIFESTO = "_manifesto.json"  # prefixo "_": ignorado pelo leitor de datasets
+
+# Colunas textuais gravadas sempre como string, mesmo que o 1º bloco venha vazio
+COLUNAS_TEXTO = [COLUNA_CATEGORIA, COLUNA_DESCRICAO, *COLUNAS_TEXTO_PORCAO]
 
 # ===============================================
 # ⚙️ FUNÇÕES AUXILIARES
@@ -24,6 +71,262 @@ def format_size(size_bytes: float) -> str:
     """Formata o tamanho do arquivo em MB."""
     return f"{size_bytes / (1024 * 1024):.2f} MB"
 
+def peak_rss() -> int | None:
+    """Pico de memória residente do processo em bytes (None se indisponível)."""
+    try:
+        import resource
+    except ImportError:
+        # Windows: usa psutil se estiver instalado
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss)
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta em KB, macOS em bytes
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def fixar_schema(schema: pa.Schema) -> pa.Schema:
+    """Esquema do primeiro bloco, com as colunas textuais sempre como string."""
+    for col in COLUNAS_TEXTO:
+        i = schema.get_field_index(col)
+        if i >= 0:
+            schema = schema.set(i, pa.field(col, pa.large_string()))
+    return schema
+
+
+def ler_blocos(csv_path: str, chunksize: int = CHUNK_SIZE):
+    """
+    Lê o CSV em blocos e gera tabelas Arrow tipadas com um esquema único.
+
+    O esquema é fixado pelo primeiro bloco; os seguintes são convertidos para ele.
+    Cada bloco é validado antes da conversão de tipos (`dados.validar_blocos`):
+    a leitura para com `ErroValidacao` no primeiro bloco com violação fatal,
+    em vez de texto em coluna numérica virar NaN. Depois sai ordenado pelas
+    colunas-chave (ver `dados.indice`), para que os row groups gravados a
+    partir dele tenham faixas de min/max estreitas.
+    """
+    schema = None
+    for chunk in validar_blocos(pd.read_csv(csv_path, chunksize=chunksize)):
+        table = pa.Table.from_pandas(ordenar(aplicar_esquema(chunk)), preserve_index=False)
+        if schema is None:
+            schema = fixar_schema(table.schema)
+        yield table.cast(schema)
+
+
+def report_throughput(total: int, elapsed: float) -> None:
+    """Mostra linhas/s e o pico de memória do processo."""
+    rss = peak_rss()
+    print(f"\n✅ {total:,} registros em {elapsed:.2f} s ({total / max(elapsed, 1e-9):,.0f} linhas/s)")
+    print(f"🧠 Pico de memória (RSS): {format_size(rss) if rss is not None else 'indisponível'}")
+
+
+def convert_streaming(csv_path: str, parquet_path: str, chunksize: int = CHUNK_SIZE,
+                      compression: str = "snappy") -> int:
+    """
+    Converte CSV → Parquet em blocos, cada um ordenado e dividido em row groups.
+
+    A memória fica limitada a um bloco, independente do tamanho do CSV. A
+    ordenação é só dentro do bloco (ordenar o arquivo todo exigiria tê-lo em
+    memória), então um filtro por faixa pula row groups em cada bloco.
+    O arquivo é gravado num temporário e só substitui o destino no fim: um
+    bloco inválido no meio do CSV não deixa um Parquet pela metade.
+    Retorna o número de linhas gravadas.
+    """
+    writer = None
+    total = 0
+    start = time.perf_counter()
+    temporario = Path(parquet_path).with_suffix(".tmp")
+
+    try:
+        for table in ler_blocos(csv_path, chunksize):
+            if writer is None:
+                writer = pq.ParquetWriter(temporario, table.schema, compression=compression)
+            writer.write_table(table, row_group_size=tamanho_row_group(chunksize))
+            total += table.num_rows
+            print(f"   • {total:,} registros gravados...", end="\r")
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        temporario.unlink(missing_ok=True)
+        raise
+    if writer is not None:
+        writer.close()
+        temporario.replace(parquet_path)
+
+    report_throughput(total, time.perf_counter() - start)
+    return total
+
+
+def convert_partitioned(csv_path: str, dataset_dir: str, chunksize: int = CHUNK_SIZE,
+                        compression: str = "snappy") -> int:
+    """
+    Converte CSV → dataset Parquet no estilo Hive, particionado por Category.
+
+    Cada categoria vira uma pasta `Category=<valor>/`, permitindo que os
+    dashboards leiam só as partições selecionadas. Também lê (e valida) em
+    blocos; o dataset é montado numa pasta temporária e só substitui o
+    anterior se todos os blocos passarem.
+    Retorna o número de linhas gravadas.
+    """
+    blocos = ler_blocos(csv_path, chunksize)
+    primeiro = next(blocos, None)
+    if primeiro is None:
+        print("⚠️ CSV sem registros; nada a particionar.")
+        return 0
+
+    total = 0
+    start = time.perf_counter()
+
+    def contar(tabelas):
+        nonlocal total
+        for table in tabelas:
+            total += table.num_rows
+            yield from table.to_batches()
+
+    temporario = Path(dataset_dir).with_name(Path(dataset_dir).name + ".tmp")
+    shutil.rmtree(temporario, ignore_errors=True)
+    try:
+        ds.write_dataset(
+            contar(itertools.chain([primeiro], blocos)),
+            temporario,
+            schema=primeiro.schema,
+            format="parquet",
+            partitioning=particionamento(),
+            max_partitions=MAX_PARTITIONS,
+            file_options=ds.ParquetFileFormat().make_write_options(compression=compression),
+        )
+    except BaseException:
+        shutil.rmtree(temporario, ignore_errors=True)
+        raise
+    shutil.rmtree(dataset_dir, ignore_errors=True)
+    temporario.rename(dataset_dir)
+    # Marca o dataset como mais novo que o CSV (usado pelo loader)
+    os.utime(dataset_dir)
+
+    report_throughput(total, time.perf_counter() - start)
+    return total
+
+
+def esquema_canonico() -> pa.Schema:
+    """
+    Esquema Arrow fixo das 48 colunas, usado por todas as partes do dataset.
+
+    Category fica como string (igual ao particionamento) para que partes de
+    arquivos diferentes sempre se unam no mesmo dataset.
+    """
+    campos = []
+    for col in COLUNAS:
+        if col == COLUNA_CATEGORIA:
+            tipo = pa.string()
+        elif col in COLUNAS_TEXTO:
+            tipo = pa.large_string()
+        elif col == COLUNA_ID:
+            tipo = pa.int32()
+        else:
+            tipo = pa.float32()
+        campos.append(pa.field(col, tipo))
+    return pa.schema(campos)
+
+
+def ingerir_arquivo(origem: str, destino: str, compression: str = "snappy") -> dict:
+    """
+    Executado em um processo do pool: lê um CSV/XLSX, normaliza para o
+    esquema `Data.*` e grava uma parte Parquet. Devolve as estatísticas
+    (só elas voltam ao processo principal, não os dados).
+    """
+    inicio = time.perf_counter()
+    origem, destino = Path(origem), Path(destino)
+    bruto = ler_arquivo(origem)
+    # Violação fatal vira erro do arquivo no manifesto (os demais seguem)
+    validar_tabela(bruto, [c for c in bruto.columns if c in COLUNAS])
+
+    df = ordenar(aplicar_esquema(bruto.reindex(columns=COLUNAS)))
+    table = pa.Table.from_pandas(df, preserve_index=False).cast(esquema_canonico())
+    pq.write_table(table, destino, compression=compression, row_group_size=tamanho_row_group(len(df)))
+
+    tempo = time.perf_counter() - inicio
+    return {
+        "origem": str(origem),
+        "parte": destino.name,
+        "linhas": len(df),
+        "bytes_origem": origem.stat().st_size,
+        "bytes_parquet": destino.stat().st_size,
+        "tempo_s": round(tempo, 4),
+        "linhas_por_s": round(len(df) / max(tempo, 1e-9)),
+        "colunas_ausentes": [c for c in COLUNAS if c not in bruto.columns],
+        "colunas_descartadas": [c for c in bruto.columns if c not in COLUNAS],
+    }
+
+
+def ingest_directory(diretorio: str, dataset_dir, workers: int | None = None,
+                     compression: str = "snappy") -> dict:
+    """
+    Ingestão paralela de todos os CSV/XLSX de um diretório em um único dataset.
+
+    Cada arquivo é processado por um worker do pool e vira uma parte
+    `NNNN-<nome>.parquet`; ao final, grava `_manifesto.json` com origem,
+    contagens, colunas ausentes/descartadas e vazão por arquivo. Um arquivo
+    com erro fica registrado no manifesto sem interromper os demais.
+    """
+    arquivos = sorted(
+        p for p in Path(diretorio).iterdir()
+        if p.is_file() and p.suffix.lower() in (".csv", ".xlsx")
+    )
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum CSV/XLSX em '{diretorio}'.")
+
+    dataset_dir = Path(dataset_dir)
+    if dataset_dir.exists():
+        if not (dataset_dir / MANIFESTO).exists():
+            raise FileExistsError(f"'{dataset_dir}' já existe e não foi gerado por esta ingestão.")
+        shutil.rmtree(dataset_dir)
+    dataset_dir.mkdir(parents=True)
+
+    workers = workers or os.cpu_count()
+    print(f"🧵 {len(arquivos)} arquivo(s) com {workers} processo(s)...\n")
+    inicio = time.perf_counter()
+    entradas = []
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {
+            pool.submit(ingerir_arquivo, str(origem), str(dataset_dir / f"{i:04d}-{origem.stem}.parquet"),
+                        compression): origem
+            for i, origem in enumerate(arquivos)
+        }
+        for futuro in as_completed(futuros):
+            origem = futuros[futuro]
+            try:
+                entrada = futuro.result()
+            except Exception as e:
+                entrada = {"origem": str(origem), "erro": str(e)}
+                print(f"   ❌ {origem.name}: {e}")
+            else:
+                print(f"   • {origem.name:<30} {entrada['linhas']:>10,} linhas "
+                      f"{entrada['tempo_s']:7.2f} s  ({entrada['linhas_por_s']:,} linhas/s)")
+            entradas.append(entrada)
+
+    tempo = time.perf_counter() - inicio
+    total = sum(e.get("linhas", 0) for e in entradas)
+    manifesto = {
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "origem": str(Path(diretorio).resolve()),
+        "workers": workers,
+        "tempo_total_s": round(tempo, 4),
+        "linhas": total,
+        "linhas_por_s": round(total / max(tempo, 1e-9)),
+        "colunas": COLUNAS,
+        "arquivos": sorted(entradas, key=lambda e: e["origem"]),
+    }
+    (dataset_dir / MANIFESTO).write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    report_throughput(total, tempo)
+    return manifesto
+
+
 def compare_files(csv_path: str, parquet_path: str) -> None:
     """Compara tamanho e tempo de leitura entre CSV e Parquet."""
     print("\n📊 Comparando desempenho entre formatos...\n")
@@ -38,48 +341,120 @@ def compare_files(csv_path: str, parquet_path: str) -> None:
     print(f"💾 Redução: {reduction:.1f}%\n")
 
 
-    start_csv = time.time()
-    pd.read_csv(csv_path)
-    csv_time = time.time() - start_csv
+    # Mediana de várias leituras (com aquecimento), em vez de uma amostra ruidosa
+    csv_time = medir_leitura(ler_csv, csv_path)["tempo_mediana_s"]
+    parquet_time = medir_leitura(ler_parquet, parquet_path)["tempo_mediana_s"]
 
-    start_parquet = time.time()
-    pd.read_parquet(parquet_path)
-    parquet_time = time.time() - start_parquet
-
-    print(f"⏱️ Tempo de leitura CSV: {csv_time:.4f} s")
-    print(f"⚡ Tempo de leitura Parquet: {parquet_time:.4f} s")
-
-
-    if parquet_time < csv_time:
-        print("\n✅ Parquet mais rápido e mais leve!")
-    else:
-        print("\nℹ️ CSV mais rápido (dataset pequeno, variação normal).")
+    print(f"⏱️ Tempo de leitura CSV (mediana): {csv_time:.4f} s")
+    print(f"⚡ Tempo de leitura Parquet (mediana): {parquet_time:.4f} s")
+    print(f"🚀 Speedup: {csv_time / parquet_time:.1f}x")
+    print("\nℹ️ Para comparar codecs, row groups, Feather/Arrow e escalas maiores,"
+          " rode: python Benchmark_Formatos.py")
 
 
 # ===============================================
 # 🚀 EXECUÇÃO PRINCIPAL
 # ===============================================
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Converte o CSV de alimentos para Parquet.")
+    parser.add_argument("csv", nargs="?", default=CSV_FILE, help=f"CSV de entrada (padrão: {CSV_FILE})")
+    parser.add_argument("parquet", nargs="?", default=PARQUET_FILE, help=f"Parquet de saída (padrão: {PARQUET_FILE})")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Converte em blocos, com memória constante (para CSVs grandes)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE,
+                        help=f"Linhas por bloco no modo streaming (padrão: {CHUNK_SIZE:,})")
+    parser.add_argument("--particionar", action="store_true",
+                        help="Grava um dataset Hive particionado por Category em <csv>_dataset/")
+    parser.add_argument("--diretorio", action="store_true",
+                        help="Trata a entrada como diretório: ingere todos os CSV/XLSX em <dir>_dataset/")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processos usados por --diretorio (padrão: núcleos disponíveis)")
+    parser.add_argument("--upsert", action="store_true",
+                        help="Trata o CSV como delta: grava só linhas novas/alteradas como fragmento do Parquet")
+    parser.add_argument("--consolidar", action="store_true",
+                        help="Reescreve o Parquet juntando os fragmentos gravados por --upsert")
+    parser.add_argument("--porcoes", action="store_true",
+                        help="Grava ao lado do Parquet a matriz de nutrientes por medida caseira (<parquet>_porcoes.parquet)")
+    parser.add_argument("--compression", default="snappy",
+                        choices=["snappy", "zstd", "gzip", "brotli", "none"])
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.consolidar:
+        total = consolidar(args.parquet, args.compression)
+        print(f"🧱 Parquet consolidado em '{args.parquet}' ({total:,} registros)\n")
+        return
+
+    if args.porcoes:
+        destino = gravar_porcoes(args.parquet, args.compression)
+        print(f"🥄 Nutrientes por porção salvos em '{destino}'\n")
+        return
+
     print("🔄 Iniciando conversão CSV → Parquet...\n")
 
 
-    if not os.path.exists(CSV_FILE):
-        print(f"❌ Arquivo '{CSV_FILE}' não encontrado.")
+    if not os.path.exists(args.csv):
+        print(f"❌ Arquivo '{args.csv}' não encontrado.")
         sys.exit(1)
 
 
     try:
-        df = pd.read_csv(CSV_FILE)
+        if args.diretorio:
+            dataset_dir = caminho_dataset(args.csv)
+            manifesto = ingest_directory(args.csv, dataset_dir, args.workers, args.compression)
+            erros = sum("erro" in e for e in manifesto["arquivos"])
+            print(f"🎉 Dataset salvo em '{dataset_dir}' (manifesto: {MANIFESTO}"
+                  f"{f', {erros} arquivo(s) com erro' if erros else ''})\n")
+            return
+
+        if args.upsert:
+            start = time.perf_counter()
+            resumo = upsert(args.csv, args.parquet, args.compression)
+            print(f"✅ Delta com {resumo['linhas_delta']:,} registros: "
+                  f"{resumo['novas']:,} novos, {resumo['alteradas']:,} alterados "
+                  f"({time.perf_counter() - start:.2f} s)")
+            if resumo["fragmento"]:
+                print(f"🧩 Fragmento gravado em '{resumo['fragmento']}'")
+            if resumo["consolidado"]:
+                print(f"🧱 Fragmentos consolidados em '{args.parquet}'")
+            return
+
+        if args.particionar:
+            dataset_dir = caminho_dataset(args.csv)
+            convert_partitioned(args.csv, dataset_dir, args.chunksize, args.compression)
+            print(f"🎉 Dataset particionado salvo em '{dataset_dir}'\n")
+            return
+
+        # Conversão completa: o CSV passa a ser a verdade e os fragmentos antigos sobram
+        shutil.rmtree(caminho_fragmentos(args.parquet), ignore_errors=True)
+
+        if args.streaming:
+            convert_streaming(args.csv, args.parquet, args.chunksize, args.compression)
+            print(f"🎉 Arquivo salvo como '{args.parquet}'\n")
+            return
+
+        df = pd.read_csv(args.csv)
+        validar_tabela(df, [c for c in df.columns if c in COLUNAS])
         print(f"✅ CSV carregado com sucesso! ({len(df):,} registros)\n")
 
 
-        df.to_parquet(PARQUET_FILE, index=False)
-        print(f"🎉 Arquivo salvo como '{PARQUET_FILE}'\n")
+        # Ordenado por calorias/proteína em row groups pequenos: filtros por faixa pulam o resto
+        df = ordenar(df)
+        df.to_parquet(args.parquet, index=False, compression=args.compression,
+                      row_group_size=tamanho_row_group(len(df)))
+        print(f"🎉 Arquivo salvo como '{args.parquet}'\n")
 
 
-        compare_files(CSV_FILE, PARQUET_FILE)
+        compare_files(args.csv, args.parquet)
 
 
+    except ErroValidacao as e:
+        print("❌ O arquivo não segue o esquema; nada foi gravado.\n")
+        print(e.resumo.to_string(index=False))
+        sys.exit(1)
     except Exception as e:
         print(f"❌ Erro durante a conversão: {e}")
         sys.exit(1)
@@ -1,13 +1,47 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from dados import (
+    abrir_arrow,
+    caminho_cache,
+    caminho_versoes,
+    carregar_impressoes,
+    chave_conteudo,
+    compactar,
+    gravar_indexado,
+    gravar_versao,
+    impressao_dataset,
+    impressoes_linhas,
+    posicoes_duplicadas,
+    resumo_impressoes,
+    salvar_arrow,
+    segue_esquema,
+    validar_tabela,
+    visao_pandas,
+)
+
 st.set_page_config(page_title="Dashboard", page_icon="📊", layout="wide")
 
+# Copy-on-write: páginas que alteram o DataFrame copiam só o que mudam
+# (padrão a partir do pandas 3)
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
 # -----------------------------------------------------------
-# FUNÇÃO COM CACHE PARA CARREGAR O DATASET
+# FUNÇÕES PARA CARREGAR O DATASET
 # -----------------------------------------------------------
 
-@st.cache_data
+def normalizar_colunas(df):
+    """Nomes sem espaços nas pontas e sem quebras de linha (antes do cache e da impressão)"""
+    df.columns = df.columns.map(
+        lambda c: c.strip().replace('\n', ' ') if isinstance(c, str) else c
+    )
+    return df
+
 def carregar_dados(uploaded_file):
     """Carrega o dataset a partir do arquivo uploadado"""
     try:
@@ -18,11 +52,106 @@ def carregar_dados(uploaded_file):
         else:
             st.error("Formato de arquivo não suportado. Use .xlsx ou .csv")
             return pd.DataFrame()
-        return df
+        return normalizar_colunas(df)
     except Exception as e:
         st.error(f"Erro ao carregar o arquivo: {e}")
         return pd.DataFrame()
 
+@st.cache_resource(max_entries=8)
+def tabela_compartilhada(caminho):
+    """Tabela mapeada em memória, aberta uma única vez para todas as sessões"""
+    return abrir_arrow(caminho)
+
+def publicar_dados(uploaded_file):
+    """
+    Devolve uma visão sem cópia da tabela compartilhada do arquivo enviado.
+
+    O cache em disco é endereçado pelo conteúdo: um arquivo já visto (mesmo
+    antes de reiniciar o servidor) é aberto direto da cópia Arrow, sem parsing.
+    Os nomes das colunas são normalizados na leitura, antes de gravar: o
+    arquivo Arrow (lido pelos filtros em SQL), o df da sessão e a impressão
+    usam os mesmos nomes.
+    Antes de gravar, a tabela de alimentos passa pela validação de esquema
+    (violação fatal rejeita o arquivo) e os tipos são compactados; o
+    relatório de economia fica salvo ao lado do arquivo Arrow.
+    Ao lado fica também a cópia Parquet indexada (curva Z, row groups
+    pequenos) em que os filtros em SQL pulam row groups fora das faixas.
+    """
+    caminho = caminho_cache(chave_conteudo(uploaded_file.getvalue()))
+    caminho_relatorio = caminho.with_suffix(".compactacao.csv")
+    caminho_indexado = caminho.with_suffix(".parquet")
+    st.session_state.dados_do_cache = caminho.exists()
+    st.session_state.validacao = None
+    # Arquivo colunar por trás do df; None se só em memória
+    st.session_state.arquivo_colunar = None
+    # Parquet indexado consultado pelos filtros em SQL; None se não foi possível gravar
+    st.session_state.arquivo_indexado = None
+
+    if not caminho.exists():
+        df = carregar_dados(uploaded_file)
+        if df.empty:
+            return df
+        if segue_esquema(df):
+            resumo = validar_tabela(df, levantar=False)
+            st.session_state.validacao = resumo
+            if resumo["fatal"].any():
+                return pd.DataFrame()
+        df, relatorio = compactar(df)
+        st.session_state.relatorio_compactacao = relatorio
+        try:
+            salvar_arrow(df, caminho)
+        except (TypeError, ValueError):
+            # Colunas com tipos mistos não cabem em Arrow: fica só nesta sessão
+            return df
+        relatorio.to_csv(caminho_relatorio, index=False)
+    elif caminho_relatorio.exists():
+        st.session_state.relatorio_compactacao = pd.read_csv(caminho_relatorio)
+
+    st.session_state.arquivo_colunar = str(caminho)
+    df = visao_pandas(tabela_compartilhada(str(caminho)))
+    try:
+        if not caminho_indexado.exists():
+            gravar_indexado(df, caminho_indexado)
+        st.session_state.arquivo_indexado = str(caminho_indexado)
+    except (TypeError, ValueError):
+        # Tipos que o Parquet não aceita: os filtros em SQL leem o Arrow mesmo
+        pass
+    return df
+
+def publicar_impressoes(df):
+    """
+    Hash e nulos por linha, calculados uma vez por dataset.
+
+    Com arquivo colunar, ficam gravados ao lado dele e são reaproveitados por
+    qualquer sessão que abrir o mesmo arquivo; o resumo e as duplicatas leem
+    só essas duas colunas em vez de varrer a tabela a cada rerun.
+    """
+    arquivo = st.session_state.get('arquivo_colunar')
+    impressoes = carregar_impressoes(df, arquivo) if arquivo else impressoes_linhas(df)
+    st.session_state.impressoes = impressoes
+    # Chave dos caches compartilhados entre páginas (ex.: metadados das colunas)
+    st.session_state.impressao_dataset = impressao_dataset(df, impressoes)
+    return impressoes
+
+def versionar_dados(df, nome_arquivo):
+    """
+    Registra o DataFrame como nova versão do arquivo (só o que mudou é gravado).
+
+    A pasta de versões fica na sessão para que as páginas peçam o diff entre
+    versões (`dados.versoes.diferenca`) e atualizem só as linhas alteradas.
+    """
+    pasta = caminho_versoes(Path(nome_arquivo).name)
+    st.session_state.pasta_versoes = None
+    st.session_state.versao = None
+    try:
+        st.session_state.versao = gravar_versao(
+            df, pasta, origem=nome_arquivo, impressoes=st.session_state.get('impressoes')
+        )
+    except (TypeError, ValueError):
+        # Colunas com tipos mistos não cabem em Parquet: segue sem versão
+        return
+    st.session_state.pasta_versoes = str(pasta)
+
 # -----------------------------------------------------------
 # UPLOAD DO ARQUIVO E CARREGAMENTO DOS DADOS
 # -----------------------------------------------------------
@@ -42,13 +171,52 @@ if not dados_carregados:
     
     if uploaded_file is not None:
         with st.spinner('Carregando dados...'):
-            st.session_state.df = carregar_dados(uploaded_file)
+            st.session_state.df = publicar_dados(uploaded_file)
             st.session_state.uploaded_file_name = uploaded_file.name
-        st.success(f"Arquivo '{uploaded_file.name}' carregado com sucesso!")
-        st.rerun()
+            if not st.session_state.df.empty:
+                publicar_impressoes(st.session_state.df)
+                versionar_dados(st.session_state.df, uploaded_file.name)
+        if st.session_state.df.empty:
+            # Sem rerun: a mensagem de erro (leitura ou validação) fica na tela
+            validacao = st.session_state.get('validacao')
+            if validacao is not None and validacao["fatal"].any():
+                st.error(f"❌ Arquivo '{uploaded_file.name}' rejeitado pela validação de esquema")
+                st.dataframe(validacao, use_container_width=True, hide_index=True)
+        else:
+            st.success(f"Arquivo '{uploaded_file.name}' carregado com sucesso!")
+            st.rerun()
 else:
     # Mostra informações do arquivo já carregado
     st.success(f"✅ Arquivo carregado: {st.session_state.get('uploaded_file_name', 'Arquivo')}")
+    if st.session_state.get('dados_do_cache'):
+        st.caption("⚡ Reaproveitado do cache colunar (sem novo parsing)")
+    
+    versao = st.session_state.get('versao')
+    if versao is not None:
+        if versao['versao'] == 1:
+            st.caption(f"🗂️ Versão 1 ({versao['linhas']:,} linhas)")
+        else:
+            st.caption(
+                f"🗂️ Versão {versao['versao']}: +{versao['adicionadas']:,} novas, "
+                f"~{versao['alteradas']:,} alteradas, -{versao['removidas']:,} removidas em relação à anterior"
+            )
+    
+    validacao = st.session_state.get('validacao')
+    if validacao is not None and not validacao.empty:
+        with st.expander(f"⚠️ Validação de esquema: {len(validacao)} aviso(s)"):
+            st.dataframe(validacao, use_container_width=True, hide_index=True)
+    
+    relatorio = st.session_state.get('relatorio_compactacao')
+    if relatorio is not None:
+        antes = relatorio["bytes_antes"].sum()
+        depois = relatorio["bytes_depois"].sum()
+        economia = (1 - depois / antes) * 100 if antes else 0
+        with st.expander(f"🗜️ Compactação de tipos: {antes / 1e6:.2f} MB → {depois / 1e6:.2f} MB (-{economia:.0f}%)"):
+            st.dataframe(
+                relatorio.sort_values("economia_bytes", ascending=False),
+                use_container_width=True,
+                hide_index=True,
+            )
     
     # Botão para recarregar outro arquivo
     if st.button("📤 Carregar outro arquivo"):
@@ -56,6 +224,16 @@ else:
         del st.session_state.df
         if 'uploaded_file_name' in st.session_state:
             del st.session_state.uploaded_file_name
+        st.session_state.pop('relatorio_compactacao', None)
+        st.session_state.pop('validacao', None)
+        st.session_state.pop('versao', None)
+        st.session_state.pop('impressoes', None)
+        st.session_state.pop('impressao_dataset', None)
+        # Arquivos do dataset anterior: os filtros em SQL não podem lê-los com o novo df
+        st.session_state.pop('arquivo_colunar', None)
+        st.session_state.pop('arquivo_indexado', None)
+        st.session_state.pop('pasta_versoes', None)
+        st.session_state.pop('dados_do_cache', None)
         st.rerun()
 
 # -----------------------------------------------------------
@@ -71,10 +249,16 @@ if 'df' in st.session_state and not st.session_state.df.empty:
     
     st.subheader("📊 Resumo do Dataset")
     
-    num_linhas = df.shape[0]
+    # Contagens lidas das impressões por linha (calculadas uma vez no upload)
+    impressoes = st.session_state.get('impressoes')
+    if impressoes is None or len(impressoes) != len(df):
+        impressoes = publicar_impressoes(df)
+    resumo = resumo_impressoes(impressoes)
+    
+    num_linhas = resumo["linhas"]
     num_colunas = df.shape[1]
-    num_nulos = df.isna().sum().sum()
-    num_duplicados = df.duplicated().sum()
+    num_nulos = resumo["nulos"]
+    num_duplicados = resumo["duplicadas"]
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -94,6 +278,11 @@ if 'df' in st.session_state and not st.session_state.df.empty:
         st.markdown("**Duplicatas**")
         st.markdown(f"<h2>{num_duplicados}</h2>", unsafe_allow_html=True)
     
+    if num_duplicados:
+        with st.expander(f"🔁 Ver linhas duplicadas ({num_duplicados})"):
+            # Todas as ocorrências, agrupadas pela impressão da linha
+            st.dataframe(df.iloc[posicoes_duplicadas(impressoes)], use_container_width=True)
+    
     st.markdown("<hr>", unsafe_allow_html=True)
     
     # -----------------------------------------------------------
@@ -135,9 +324,15 @@ if 'df' in st.session_state and not st.session_state.df.empty:
         st.switch_page(f"pages/{pagina}.py")
 
 elif 'df' in st.session_state and st.session_state.df.empty:
-    st.error("O arquivo carregado está vazio. Por favor, carregue outro arquivo.")
+    validacao = st.session_state.get('validacao')
+    if validacao is not None and validacao["fatal"].any():
+        st.error("O arquivo foi rejeitado pela validação de esquema. Corrija as violações abaixo e carregue-o novamente.")
+        st.dataframe(validacao, use_container_width=True, hide_index=True)
+    else:
+        st.error("O arquivo carregado está vazio. Por favor, carregue outro arquivo.")
     if st.button("🔄 Tentar novamente"):
         del st.session_state.df
+        st.session_state.pop('validacao', None)
         st.rerun()
 else:
     st.info("👆 Por favor, faça upload de um arquivo Excel (.xlsx) ou CSV (.csv) para começar.")
\ No newline at end of file
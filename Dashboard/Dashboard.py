@@ -1,7 +1,13 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from dados import carregar_tabela, listar_categorias
+
 # --- Configuração da página ---
 st.set_page_config(
     page_title="Dashboard Nutricional",
@@ -10,13 +16,21 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# --- Leitura dos dados ---
-df = pd.read_excel("C:/Users/leand/VS Code Projetos/food.xlsx")
+# --- Leitura dos dados (Parquet se houver; tipos já convertidos pelo loader) ---
+# Colunas usadas pela página; as demais nem são lidas do disco
+COLUNAS_USADAS = [
+    "Category", "Description",
+    "Data.Kilocalories", "Data.Protein", "Data.Carbohydrate", "Data.Fat.Total Lipid"
+]
+
+@st.cache_data
+def carregar_dados(categorias=None):
+    # Com categorias, só as partições selecionadas são lidas do disco
+    return carregar_tabela(categorias=categorias, colunas=COLUNAS_USADAS)
 
-# Converter colunas numéricas
-for col in df.columns:
-    if col.startswith("Data."):
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+@st.cache_data
+def carregar_categorias():
+    return listar_categorias()
 
 # --- Paleta de cores personalizada ---
 cores = {
@@ -40,9 +54,8 @@ else:
 st.title("🍎 Dashboard Nutricional Completo")
 
 # --- Filtros globais ---
-categorias = st.multiselect("Filtrar por categoria:", df["Category"].unique())
-if categorias:
-    df = df[df["Category"].isin(categorias)]
+categorias = st.multiselect("Filtrar por categoria:", carregar_categorias())
+df = carregar_dados(tuple(categorias) or None)
 
 # --- Abas principais ---
 tab1, tab2, tab3, tab4 = st.tabs([
@@ -87,7 +100,7 @@ with tab2:
     nutriente = st.selectbox("Escolha o nutriente:", nutrientes, index=0)
 
     # Média por categoria
-    cat_media = df.groupby("Category")[nutrientes].mean().reset_index()
+    cat_media = df.groupby("Category", observed=True)[nutrientes].mean().reset_index()
 
     # Seleciona as 20 categorias com maior valor no nutriente escolhido
     top20 = cat_media.nlargest(20, nutriente).sort_values(by=nutriente)
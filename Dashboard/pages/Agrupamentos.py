@@ -2,6 +2,9 @@
 """
 Tela 3 — Agrupamentos (groupby) com análises avançadas
 """
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -9,6 +12,9 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 # ==========================================================
 # CONFIGURAÇÕES DA PÁGINA
 # ==========================================================
@@ -32,6 +38,7 @@ if 'df' not in st.session_state or st.session_state.df.empty:
 
 # Carrega os dados do session state
 df = st.session_state.df
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
 
 # ==========================================================
 # SIDEBAR GLOBAL
@@ -45,14 +52,14 @@ st.sidebar.markdown("---")
 st.sidebar.markdown("### ℹ️ Informações do Dataset")
 st.sidebar.write(f"**Linhas:** {df.shape[0]}")
 st.sidebar.write(f"**Colunas:** {df.shape[1]}")
-st.sidebar.write(f"**Grupos disponíveis:** {df.select_dtypes(include=['object']).shape[1]}")
+st.sidebar.write(f"**Grupos disponíveis:** {len(meta['texto'])}")
 
 # ==========================================================
 # PREPARAÇÃO DOS DADOS
 # ==========================================================
-df.columns = df.columns.str.strip()
-text_cols = df.select_dtypes(include=['object']).columns.tolist()
-num_cols = df.select_dtypes(include=['number']).columns.tolist()
+# Nomes das colunas já chegam sem espaços nas pontas (normalizados no upload)
+text_cols = meta['texto']
+num_cols = meta['numericas']
 
 if not text_cols:
     st.error("❌ Nenhuma coluna de texto encontrada para agrupamento.")
@@ -383,7 +390,7 @@ with tabs[5]:
 with tabs[6]:
     st.subheader("⏳ Séries Temporais")
 
-    date_cols = df.select_dtypes(include=["datetime"]).columns.tolist()
+    date_cols = meta['datas']
 
     if not date_cols:
         st.warning("⚠️ Nenhuma coluna de data/hora encontrada no dataset.")
@@ -392,8 +399,9 @@ with tabs[6]:
         col_date = st.selectbox("Coluna de data:", date_cols, key="date_col")
         
         # Agrupar por data e calcular estatísticas
-        df[col_date] = pd.to_datetime(df[col_date])
-        ts_data = df.groupby(df[col_date].dt.date)[agg_col].agg(['sum', 'mean', 'count']).reset_index()
+        # Conversão local: o df da sessão é compartilhado e não deve mudar
+        datas = pd.to_datetime(df[col_date])
+        ts_data = df.groupby(datas.dt.date)[agg_col].agg(['sum', 'mean', 'count']).reset_index()
         ts_data.columns = ['data', 'soma', 'media', 'contagem']
         
         # Selecionar tipo de agregação
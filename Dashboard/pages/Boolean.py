@@ -3,12 +3,18 @@
 Tela 4 — Booleans e filtros binários
 """
 
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 # Configuração da página
 st.set_page_config(page_title='Booleans', layout='wide')
 st.title('🚫 Desabilitando Booleans')
@@ -23,37 +29,10 @@ if "df" not in st.session_state:
 df = st.session_state.df
 
 # ========== DETECÇÃO ROBUSTA DE COLUNAS BOOLEANAS ==========
-def detect_boolean_columns(df):
-    """
-    Detecta colunas que representam valores booleanos
-    Suporta: 0/1, True/False, Sim/Não, S/N, Y/N, etc.
-    """
-    bool_cols = []
-    
-    for col_name in df.columns:
-        if df[col_name].dtype == 'bool':
-            bool_cols.append(col_name)
-            continue
-            
-        # Para colunas não-booleanas, verifica se contêm apenas 2 valores
-        unique_vals = df[col_name].dropna().unique()
-        
-        if len(unique_vals) == 2:
-            val_set = set(unique_vals)
-            # Pares booleanos comuns
-            boolean_pairs = [
-                {0, 1}, {True, False}, 
-                {'0', '1'}, {'S', 'N'}, {'s', 'n'},
-                {'Sim', 'Não'}, {'sim', 'não'}, {'SIM', 'NÃO'},
-                {'Y', 'N'}, {'y', 'n'}, {'Yes', 'No'}, {'yes', 'no'}
-            ]
-            
-            if any(val_set == pair for pair in boolean_pairs):
-                bool_cols.append(col_name)
-    
-    return bool_cols
-
-bool_cols = detect_boolean_columns(df)
+# 0/1, True/False, Sim/Não, S/N, Y/N...: detectadas uma vez por dataset e
+# compartilhadas entre as páginas (ver dados/metadados.py)
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
+bool_cols = meta['booleanas']
 
 # ========== INTERFACE PRINCIPAL ==========
 if bool_cols:
@@ -66,8 +45,9 @@ if bool_cols:
         help="Colunas com apenas dois valores (Sim/Não, 0/1, etc.)"
     )
     
-    # Converter para booleano se necessário
-    if df[coluna_selecionada].dtype != 'bool':
+    # Converter para booleano se necessário (numa cópia local: o df é compartilhado)
+    serie = df[coluna_selecionada]
+    if serie.dtype != 'bool':
         mapping = {
             0: False, 1: True, '0': False, '1': True,
             'S': True, 'N': False, 's': True, 'n': False,
@@ -76,7 +56,7 @@ if bool_cols:
             'Yes': True, 'No': False, 'yes': True, 'no': False,
             True: True, False: False
         }
-        df[coluna_selecionada] = df[coluna_selecionada].map(mapping)
+        serie = serie.map(mapping)
     
     # Seleção do valor booleano
     valor_filtro = st.radio(
@@ -87,7 +67,7 @@ if bool_cols:
     )
     
     # Aplicar filtro
-    filtered_df = df[df[coluna_selecionada] == valor_filtro]
+    filtered_df = df[serie == valor_filtro]
     
     # Layout em colunas para métricas
     col1, col2, col3 = st.columns(3)
@@ -234,9 +214,9 @@ if bool_cols:
                 )
                 
                 # Dados para True
-                dados_true = df[df[coluna_selecionada] == True][coluna_comp].dropna()
+                dados_true = df[serie == True][coluna_comp].dropna()
                 # Dados para False
-                dados_false = df[df[coluna_selecionada] == False][coluna_comp].dropna()
+                dados_false = df[serie == False][coluna_comp].dropna()
                 
                 fig_comp.add_trace(
                     go.Box(y=dados_true, name="Verdadeiro", marker_color='#2E8B57'),
@@ -276,7 +256,7 @@ if bool_cols:
         # Mostra gráfico da distribuição original da coluna booleana
         st.subheader("📊 Distribuição Original da Coluna Booleana")
         
-        contagem_valores = df[coluna_selecionada].value_counts()
+        contagem_valores = serie.value_counts()
         fig_pie = px.pie(
             values=contagem_valores.values,
             names=contagem_valores.index.astype(str),
@@ -1,4 +1,7 @@
 # FILE: pages/10_🧠_Classificação.py
+import sys
+from pathlib import Path
+
 import streamlit as st
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
@@ -9,6 +12,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 st.set_page_config(page_title='Classificação', layout='wide')
 st.title('🧠 Classificação — Modelo Random Forest')
 
@@ -65,8 +71,10 @@ if y.nunique() < 2:
     st.stop()
 
 # Converter colunas categóricas
-cat_cols = X.select_dtypes(include=['object']).columns.tolist()
-num_cols = X.select_dtypes(include=[np.number]).columns.tolist()
+# X tem os mesmos tipos do df (sem a coluna alvo): usa os metadados compartilhados
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
+cat_cols = [c for c in meta['texto'] if c != target_column]
+num_cols = [c for c in meta['numericas'] if c != target_column]
 
 st.write(f"- Colunas numéricas: {len(num_cols)}")
 st.write(f"- Colunas categóricas: {len(cat_cols)}")
@@ -82,14 +90,15 @@ if cat_cols:
             X_processed[col] = encoded_values
             label_encoders[col] = le
         except Exception as e:
+            st.warning(f"Coluna '{col}' removida: não foi possível codificá-la ({e})")
             if col in X_processed.columns:
                 X_processed = X_processed.drop(columns=[col])
 
 # Preencher missing values
 for col in X_processed.columns:
     if X_processed[col].isna().any():
-        if X_processed[col].dtype in [np.float64, np.int64]:
-            X_processed[col].fillna(X_processed[col].mean(), inplace=True)
+        if pd.api.types.is_numeric_dtype(X_processed[col]):
+            X_processed[col] = X_processed[col].fillna(X_processed[col].mean())
 
 st.write(f"📊 Shape final: {X_processed.shape}")
 
@@ -2,10 +2,16 @@
 """
 Tela 1 — Join de DataFrames (versão profissional somente com gráficos)
 """
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 # -----------------------------------------------------------------------------
 # Configuração da página
 # -----------------------------------------------------------------------------
@@ -48,7 +54,8 @@ with col3:
 # -----------------------------------------------------------------------------
 st.write("### 📊 Distribuição das Categorias por Coluna")
 
-text_cols = df.select_dtypes(include=["object"]).columns.tolist()
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
+text_cols = meta["texto"]
 
 if text_cols:
     # Seletor interativo de coluna
@@ -90,9 +97,7 @@ else:
 # -----------------------------------------------------------------------------
 st.write("### 🔍 Configuração do Join")
 
-PALAVRAS_CHAVE = ["alimento", "nome", "produto", "categoria", "descr", "item", "descrição", "description"]
-
-possible_names = [c for c in text_cols if any(k in c.lower() for k in PALAVRAS_CHAVE)]
+possible_names = meta["descricao"]
 
 if possible_names:
     col_desc = st.selectbox(
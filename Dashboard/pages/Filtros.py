@@ -3,11 +3,19 @@
 Tela 2 — Filtragem Interativa de Dados (Versão com Session State)
 """
 
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 from io import BytesIO
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.consulta import DUCKDB_DISPONIVEL, faixas_numericas, filtrar, valores_distintos
+from dados.indice import estatisticas_row_groups, row_groups_relevantes
+from dados.metadados import metadados_colunas
+
 # ---------------------------------------------------------------------
 # ⚙️ CONFIGURAÇÕES INICIAIS
 # ---------------------------------------------------------------------
@@ -33,14 +41,39 @@ if df.empty:
 # ---------------------------------------------------------------------
 # 📌 DETECÇÃO AUTOMÁTICA DE COLUNAS
 # ---------------------------------------------------------------------
-text_cols = df.select_dtypes(include=['object']).columns.tolist()
-num_cols = df.select_dtypes(include=['number']).columns.tolist()
+# Metadados das colunas: calculados uma vez por dataset e compartilhados entre as páginas
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
+text_cols = meta['texto']
+num_cols = meta['numericas']
+
+# ---------------------------------------------------------------------
+# 🦆 MOTOR DE FILTRAGEM
+# ---------------------------------------------------------------------
+# Com DuckDB e um arquivo colunar por trás do df, os filtros rodam em SQL
+# sobre o arquivo (só as linhas filtradas chegam ao pandas). A cópia Parquet
+# indexada tem min/max por row group; o Arrow do cache, não
+arquivo_indexado = st.session_state.get('arquivo_indexado')
+arquivo_colunar = arquivo_indexado or st.session_state.get('arquivo_colunar')
+sql_disponivel = DUCKDB_DISPONIVEL and arquivo_colunar is not None
+
+usar_sql = st.sidebar.toggle(
+    "🦆 Filtrar com DuckDB (SQL)",
+    value=sql_disponivel,
+    disabled=not sql_disponivel,
+    help="Executa os filtros em SQL direto no arquivo colunar, com pushdown de predicados"
+         if sql_disponivel else "Requer o pacote 'duckdb' e um arquivo carregado pelo cache colunar"
+)
+
+@st.cache_data(show_spinner=False)
+def limites_sql(arquivo, colunas):
+    return faixas_numericas(arquivo, colunas)
+
+@st.cache_data(show_spinner=False)
+def distintos_sql(arquivo, coluna):
+    return valores_distintos(arquivo, coluna)
 
 # Heurística para coluna de descrição
-possible_names = [
-    c for c in text_cols
-    if any(k in c.lower() for k in ['alimento', 'nome', 'produto', 'categoria', 'descr', 'item', 'food'])
-]
+possible_names = meta['descricao']
 auto_desc_col = possible_names[0] if possible_names else None
 
 # ---------------------------------------------------------------------
@@ -62,7 +95,10 @@ with col_f1:
 # Filtro por nome
 with col_f2:
     if desc_col != "(Nenhuma)":
-        valores = sorted(df[desc_col].dropna().unique().tolist())
+        if usar_sql:
+            valores = distintos_sql(arquivo_colunar, desc_col)
+        else:
+            valores = sorted(df[desc_col].dropna().unique().tolist())
         
         # 🔄 MULTIPLAS SELEÇÕES (NOVA FUNCIONALIDADE)
         nomes_selecionados = st.multiselect(
@@ -91,11 +127,17 @@ else:
     ranges = {}
     cols = st.columns(2)
     
+    # Mínimos e máximos de todas as colunas numa única varredura
+    if usar_sql:
+        limites = limites_sql(arquivo_colunar, tuple(num_cols))
+    else:
+        limites = {c: (df[c].min(), df[c].max()) for c in num_cols}
+    
     for i, c in enumerate(num_cols):
         col_idx = i % 2
         with cols[col_idx]:
-            if pd.notna(df[c].min()) and pd.notna(df[c].max()) and df[c].min() < df[c].max():
-                mi, ma = df[c].min(), df[c].max()
+            mi, ma = limites[c]
+            if pd.notna(mi) and pd.notna(ma) and mi < ma:
                 ranges[c] = st.slider(
                     label=f"**{c}:**",
                     min_value=float(mi),
@@ -116,18 +158,31 @@ with col_reset2:
 # ---------------------------------------------------------------------
 # 🧮 APLICAÇÃO DOS FILTROS (OTIMIZADA)
 # ---------------------------------------------------------------------
-# Aplicação eficiente usando máscaras booleanas
-mask = pd.Series(True, index=df.index)
+if usar_sql:
+    # WHERE em SQL: o DuckDB pula row groups/partições e devolve só as linhas filtradas
+    filtered = filtrar(
+        arquivo_colunar,
+        coluna_texto=desc_col if desc_col != "(Nenhuma)" else None,
+        valores=nomes_selecionados,
+        faixas=ranges,
+    )
+    if arquivo_indexado and ranges:
+        lidos = len(row_groups_relevantes(arquivo_indexado, ranges))
+        total = len(estatisticas_row_groups(arquivo_indexado, []))
+        st.sidebar.caption(f"📦 Row groups lidos: {lidos} de {total}")
+else:
+    # Aplicação eficiente usando máscaras booleanas
+    mask = pd.Series(True, index=df.index)
 
-# Filtro por descrição
-if desc_col != "(Nenhuma)" and nomes_selecionados:
-    mask &= df[desc_col].isin(nomes_selecionados)
+    # Filtro por descrição
+    if desc_col != "(Nenhuma)" and nomes_selecionados:
+        mask &= df[desc_col].isin(nomes_selecionados)
 
-# Filtros numéricos
-for c, (low, high) in ranges.items():
-    mask &= (df[c] >= low) & (df[c] <= high)
+    # Filtros numéricos
+    for c, (low, high) in ranges.items():
+        mask &= (df[c] >= low) & (df[c] <= high)
 
-filtered = df[mask]
+    filtered = df[mask]
 
 # ---------------------------------------------------------------------
 # 📈 PAINEL DE MÉTRICAS (NOVA FUNCIONALIDADE)
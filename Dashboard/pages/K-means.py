@@ -2,18 +2,25 @@
 """
 Clustering com K-Means - Análise de Agrupamentos
 """
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import silhouette_score
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados import impressao_dataset
+from dados.agrupamento import metricas_kmeans
+from dados.silhueta import LIMITE_EXATA, METODOS, NOMES_METODO, descrever_silhueta, silhueta
+
 # Configuração da página
 st.set_page_config(
     page_title='Análise de Clusters - K-Means',
@@ -69,8 +76,8 @@ def main():
         st.markdown("</div>", unsafe_allow_html=True)
         return
     
-    # Carregar dados do session state
-    original_df = st.session_state.df.copy()
+    # Carregar dados do session state (cópia rasa: os dados só são copiados se alterados)
+    original_df = st.session_state.df.copy(deep=False)
     
     # Cabeçalho profissional
     st.markdown('<div class="main-header">🔬 Análise de Clusters - Algoritmo K-Means</div>', 
@@ -145,6 +152,15 @@ def main():
             help='Número de vezes que o algoritmo será executado com diferentes seeds'
         )
         
+        metodo_silhueta = st.selectbox(
+            'Estimador do Silhouette',
+            METODOS,
+            format_func=NOMES_METODO.get,
+            help=f'O Silhouette exato é O(n²). No automático, acima de {LIMITE_EXATA:,} linhas '
+                 'usa uma amostra estratificada (com IC 95%) e, em bases muito grandes, '
+                 'a versão simplificada pelos centroides'
+        )
+        
         st.subheader("🔧 Pré-processamento")
         normalize = st.checkbox(
             'Normalizar Dados',
@@ -204,8 +220,7 @@ def main():
     # Pré-processamento dos dados
     st.header("🔧 Pré-processamento dos Dados")
     
-    # Limpar e preparar dados numéricos
-    original_df.columns = original_df.columns.str.strip().str.replace('\n', ' ')
+    # Limpar e preparar dados numéricos (nomes de colunas já normalizados no upload)
     numeric_df = original_df.select_dtypes(include=[np.number])
     
     if numeric_df.empty:
@@ -257,33 +272,31 @@ def main():
         
         def find_optimal_clusters(data, max_k=15):
             """Encontra o número ótimo de clusters usando método do cotovelo"""
-            inertias = []
-            silhouette_scores = []
             k_range = range(2, min(max_k + 1, 16))
             
             progress_bar = st.progress(0)
             status_text = st.empty()
             
-            for i, k_val in enumerate(k_range):
-                status_text.text(f"Calculando para K={k_val}...")
-                kmeans = KMeans(n_clusters=k_val, random_state=42, n_init=10)
-                labels = kmeans.fit_predict(data)
-                inertias.append(kmeans.inertia_)
-                
-                if len(set(labels)) > 1:
-                    silhouette_scores.append(silhouette_score(data, labels))
-                else:
-                    silhouette_scores.append(0)
-                
-                progress_bar.progress((i + 1) / len(k_range))
+            def progresso(feitos, total):
+                status_text.text(f"Calculados {feitos} de {total} valores de K...")
+                progress_bar.progress(feitos / total)
+            
+            # Cada K roda em um processo; K já calculados para estes dados (e este
+            # flag de normalização) são reaproveitados entre reruns e quando a faixa cresce
+            metricas = metricas_kmeans(data, impressao_dataset(data), k_range,
+                                       normalizar=normalize, n_init=10, progresso=progresso,
+                                       metodo_silhueta=metodo_silhueta)
             
             progress_bar.empty()
             status_text.empty()
             
-            return inertias, silhouette_scores, k_range
+            inertias = [metricas[k_val]["inercia"] for k_val in k_range]
+            silhouette_scores = [metricas[k_val]["silhueta"] for k_val in k_range]
+            return inertias, silhouette_scores, k_range, metricas[k_range[0]]["metodo_silhueta"]
         
         with st.spinner('Calculando métricas de otimização...'):
-            inertias, silhouette_scores, k_range = find_optimal_clusters(analysis_data, max_k=min(15, k+5))
+            inertias, silhouette_scores, k_range, metodo_varredura = find_optimal_clusters(analysis_data, max_k=min(15, k+5))
+        st.caption(f"Silhouette da varredura: {NOMES_METODO[metodo_varredura]}")
         
         # Encontrar K ótimo baseado em Silhouette Score
         if silhouette_scores:
@@ -350,10 +363,9 @@ def main():
         cluster_labels = kmeans.fit_predict(analysis_data)
     
     # Calcular Silhouette Score para o K selecionado
-    if len(set(cluster_labels)) > 1:
-        silhouette_avg = silhouette_score(analysis_data, cluster_labels)
-    else:
-        silhouette_avg = 0
+    # Exato só até LIMITE_EXATA linhas no automático; acima, estimado (ver dados/silhueta.py)
+    silhueta_k = silhueta(analysis_data, cluster_labels, kmeans.cluster_centers_, metodo_silhueta)
+    silhouette_avg = silhueta_k["valor"]
     
     # Métricas de avaliação
     col1, col2, col3, col4 = st.columns(4)
@@ -364,6 +376,7 @@ def main():
     
     with col2:
         st.metric("Silhouette Score", f"{silhouette_avg:.3f}")
+        st.caption(descrever_silhueta(silhueta_k))
     
     with col3:
         st.metric("Clusters Criados", k)
@@ -527,7 +540,7 @@ def main():
         Dataset: {st.session_state.get('uploaded_file_name', 'food.xlsx')}
         Clusters (K): {k}
         Amostras: {len(original_df)}
-        Silhouette Score: {silhouette_avg:.3f}
+        Silhouette Score: {silhouette_avg:.3f} ({descrever_silhueta(silhueta_k)})
         Inércia: {inertia:,.2f}
         
         DISTRIBUIÇÃO DOS CLUSTERS:
@@ -34,7 +34,8 @@ def verificar_dados():
         if st.button("🏠 Voltar ao Dashboard"):
             st.switch_page("app.py")
         st.stop()
-    df_local = st.session_state.df.copy()
+    # Cópia rasa: os dados compartilhados só são copiados se alterados
+    df_local = st.session_state.df.copy(deep=False)
     return df_local
 
 df = verificar_dados()
@@ -2,10 +2,18 @@
 """
 Tela 6 — Parquet demo
 """
+import os
+import sys
+import tempfile
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 from io import BytesIO
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.ajuste import OBJETIVOS, medir_combinacoes, opcoes_escrita, recomendar
+
 st.set_page_config(page_title='Parquet', layout='wide')
 st.title('📦 Arquivos Parquet')
 
@@ -20,6 +28,8 @@ if 'df' not in st.session_state:
 
 # Carrega os dados do session state
 df = st.session_state.df
+# Identifica o dataset nos caches da página (impressão calculada no App)
+chave_dados = st.session_state.get('impressao_dataset') or (st.session_state.get('uploaded_file_name'), df.shape)
 
 # Header informativo
 st.success(f"✅ **Dados carregados com sucesso!** ({df.shape[0]} linhas × {df.shape[1]} colunas)")
@@ -46,8 +56,8 @@ col1, col2, col3 = st.columns(3)
 with col1:
     compression = st.selectbox(
         "Método de Compressão",
-        ['snappy', 'gzip', 'brotli', 'none'],
-        help="snappy: rápido | gzip: boa compressão | brotli: alta compressão"
+        ['snappy', 'gzip', 'brotli', 'none', 'auto'],
+        help="snappy: rápido | gzip: boa compressão | brotli: alta compressão | auto: testa as combinações nos seus dados"
     )
 
 with col2:
@@ -56,59 +66,151 @@ with col2:
 with col3:
     include_index = st.checkbox("Incluir índice", value=False, help="Incluir coluna de índice no arquivo")
 
+opcoes = {"compression": compression}
+
+# Ajuste automático: codec, nível, dicionário e row group medidos numa amostra
+if compression == 'auto':
+    st.markdown("#### 🤖 Ajuste Automático")
+    objetivo = st.radio(
+        "Objetivo",
+        options=list(OBJETIVOS),
+        format_func=OBJETIVOS.get,
+        index=list(OBJETIVOS).index("equilibrio"),
+        horizontal=True,
+    )
+
+    # Medições valem para este arquivo; trocar o objetivo só reordena
+    medicoes = st.session_state.get('ajuste_parquet')
+    if medicoes is None or medicoes[0] != chave_dados:
+        if st.button("🔍 Testar combinações", use_container_width=True):
+            with st.spinner("Medindo codecs, níveis, dicionário e row groups numa amostra..."):
+                st.session_state.ajuste_parquet = (chave_dados, medir_combinacoes(df))
+            st.rerun()
+        st.info("Clique para medir as combinações antes de exportar (padrão enquanto isso: snappy).")
+        opcoes = {"compression": "snappy"}
+    else:
+        ranking = recomendar(medicoes[1], objetivo)
+        melhor = ranking.iloc[0]
+        nivel = f" nível {int(melhor['nivel'])}" if pd.notna(melhor['nivel']) else ""
+
+        st.success(
+            f"✅ Recomendado: **{melhor['codec']}{nivel}**, dicionário "
+            f"{'ligado' if melhor['dicionario'] else 'desligado'}, row group de {int(melhor['row_group']):,} linhas"
+        )
+        col_a, col_b, col_c = st.columns(3)
+        col_a.metric("Tamanho (amostra)", f"{melhor['bytes'] // 1024} KB")
+        col_b.metric("Escrita", f"{melhor['tempo_escrita_s'] * 1000:.1f} ms")
+        col_c.metric("Leitura", f"{melhor['tempo_leitura_s'] * 1000:.1f} ms")
+
+        with st.expander("📋 Todas as combinações testadas"):
+            st.dataframe(ranking, use_container_width=True, hide_index=True)
+
+        if st.checkbox("Aplicar recomendação na exportação", value=True):
+            opcoes = opcoes_escrita(melhor.to_dict())
+        else:
+            opcoes = {"compression": "snappy"}
+
 # Botão de exportação
 st.markdown("---")
 st.subheader("🚀 Exportar Arquivo")
 
+# Amostra usada para estimar o tamanho em CSV/Excel sem codificar tudo
+AMOSTRA_ESTIMATIVA = 2_000
+
+def exportar_parquet(df, include_index, opcoes):
+    """Grava o Parquet uma única vez num arquivo temporário (sem buffer em memória)"""
+    fd, caminho = tempfile.mkstemp(prefix="viva-bem-", suffix=".parquet")
+    os.close(fd)
+    df.to_parquet(caminho, index=include_index, engine='pyarrow', **opcoes)
+    return caminho
+
+def tamanho_codificado(dados, formato, include_index):
+    """Bytes do DataFrame em CSV ou Excel (tell() evita copiar o buffer)"""
+    buffer = BytesIO()
+    if formato == "csv":
+        dados.to_csv(buffer, index=include_index)
+    else:
+        dados.to_excel(buffer, index=include_index)
+    return buffer.tell()
+
+def estimar_tamanho(df, formato, include_index, amostra=AMOSTRA_ESTIMATIVA):
+    """Tamanho extrapolado de uma amostra; devolve (bytes, estimado?)"""
+    if len(df) <= amostra:
+        return tamanho_codificado(df, formato, include_index), False
+    parte = df.sample(amostra, random_state=0)
+    return int(tamanho_codificado(parte, formato, include_index) * len(df) / amostra), True
+
+@st.cache_data(show_spinner="Calculando tamanhos em CSV e Excel...", max_entries=16)
+def comparar_formatos(_df, chave_dados, include_index, exato):
+    """{formato: (bytes, estimado?)} em CSV e Excel, calculado uma vez por dataset e opções"""
+    if exato:
+        return {f: (tamanho_codificado(_df, f, include_index), False) for f in ("csv", "excel")}
+    return {f: estimar_tamanho(_df, f, include_index) for f in ("csv", "excel")}
+
+# O arquivo gerado vale para este dataset com estas opções de escrita
+chave_exportacao = (chave_dados, include_index, tuple(sorted(opcoes.items())))
+
+# Arquivo de outro dataset ou de opções antigas não será mais baixado: sai do disco
+exportado = st.session_state.get('parquet_exportado')
+if exportado and exportado[0] != chave_exportacao:
+    if os.path.exists(exportado[1]):
+        os.remove(exportado[1])
+    del st.session_state.parquet_exportado
+
 if st.button("📦 Gerar Arquivo Parquet", type="primary", use_container_width=True):
     try:
-        # Criar arquivo em memória
-        buffer = BytesIO()
-        df.to_parquet(
-            buffer, 
-            index=include_index, 
-            compression=compression,
-            engine='pyarrow'
-        )
-        buffer.seek(0)
-        
-        # Informações do arquivo
-        file_size = len(buffer.getvalue())
-        
-        # Botão de download
+        caminho = exportar_parquet(df, include_index, opcoes)
+        # Só o arquivo mais recente fica no disco
+        anterior = st.session_state.get('parquet_exportado')
+        if anterior and os.path.exists(anterior[1]):
+            os.remove(anterior[1])
+        st.session_state.parquet_exportado = (chave_exportacao, caminho)
+    except Exception as e:
+        st.error(f"❌ Erro ao gerar arquivo Parquet: {str(e)}")
+
+exportado = st.session_state.get('parquet_exportado')
+if exportado and exportado[0] == chave_exportacao and os.path.exists(exportado[1]):
+    caminho = exportado[1]
+    file_size = os.path.getsize(caminho)
+    
+    # Botão de download lendo direto do arquivo temporário
+    with open(caminho, "rb") as arquivo:
         st.download_button(
             label=f"⬇️ Baixar {filename} ({file_size // 1024} KB)",
-            data=buffer,
+            data=arquivo,
             file_name=filename,
             mime="application/octet-stream",
             use_container_width=True
         )
-        
-        # Estatísticas de compressão
-        st.success("✅ Arquivo Parquet gerado com sucesso!")
-        
-        # Comparação de tamanhos (opcional)
-        with st.expander("📈 Comparação com outros formatos"):
-            csv_buffer = BytesIO()
-            df.to_csv(csv_buffer, index=include_index)
-            csv_size = len(csv_buffer.getvalue())
-            
-            excel_buffer = BytesIO()
-            df.to_excel(excel_buffer, index=include_index)
-            excel_size = len(excel_buffer.getvalue())
-            
+    
+    # Estatísticas de compressão
+    st.success("✅ Arquivo Parquet gerado com sucesso!")
+    
+    # Comparação de tamanhos (opcional): estimada por amostra, exata só sob demanda
+    with st.expander("📈 Comparação com outros formatos"):
+        exato = st.checkbox(
+            "Calcular tamanhos exatos",
+            value=False,
+            help="Codifica o DataFrame inteiro em CSV e Excel (lento em bases grandes)"
+        )
+        try:
+            tamanhos = comparar_formatos(df, chave_dados, include_index, exato)
+            csv_size, csv_estimado = tamanhos["csv"]
+            excel_size, excel_estimado = tamanhos["excel"]
+        except Exception as e:
+            st.error(f"❌ Erro ao calcular a comparação: {str(e)}")
+        else:
             col1, col2, col3 = st.columns(3)
             with col1:
                 reduction = ((csv_size - file_size) / csv_size) * 100
-                st.metric("CSV", f"{csv_size // 1024} KB", f"-{reduction:.1f}%")
+                st.metric("CSV" + (" (≈)" if csv_estimado else ""), f"{csv_size // 1024} KB", f"-{reduction:.1f}%")
             with col2:
                 st.metric("Parquet", f"{file_size // 1024} KB")
             with col3:
                 reduction_excel = ((excel_size - file_size) / excel_size) * 100
-                st.metric("Excel", f"{excel_size // 1024} KB", f"-{reduction_excel:.1f}%")
-                
-    except Exception as e:
-        st.error(f"❌ Erro ao gerar arquivo Parquet: {str(e)}")
+                st.metric("Excel" + (" (≈)" if excel_estimado else ""), f"{excel_size // 1024} KB", f"-{reduction_excel:.1f}%")
+            if csv_estimado or excel_estimado:
+                st.caption(f"(≈) estimado a partir de {AMOSTRA_ESTIMATIVA:,} linhas amostradas")
 
 # Seção educacional
 st.markdown("---")
@@ -2,12 +2,18 @@
 """
 Tela 7 — Plots variados
 """
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 st.set_page_config(page_title='Plots', layout='wide')
 st.title('📊 Análise Visual dos Dados')
 
@@ -43,10 +49,12 @@ def remove_duplicate_columns(df):
 # Aplica a limpeza
 df = remove_duplicate_columns(df)
 
-# Preprocessamento básico
-df.columns = df.columns.str.strip()
-num_cols = df.select_dtypes(include=['number']).columns.tolist()
-cat_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+# Metadados das colunas: calculados uma vez por dataset e compartilhados entre as
+# páginas (se colunas duplicadas foram removidas, o df mudou e é recalculado)
+impressao = st.session_state.get('impressao_dataset') if df is st.session_state.df else None
+meta = metadados_colunas(df, impressao)
+num_cols = meta['numericas']
+cat_cols = meta['texto']
 
 # CORREÇÃO: Função alternativa segura para scatter plot
 def create_scatter_safe(df, x_col, y_col, color_col=None, show_trend=False):
@@ -2,10 +2,16 @@
 """
 Tela 5 — Profiling (simplificado)
 """
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 st.set_page_config(page_title='Profiling', layout='wide')
 st.title('📋 Profiling de Dados')
 
@@ -42,16 +48,18 @@ with st.sidebar:
 # Estatísticas gerais do dataset
 st.subheader("📊 Visão Geral do Dataset")
 
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
+
 col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.metric("Total de Linhas", f"{df.shape[0]:,}")
 with col2:
     st.metric("Total de Colunas", df.shape[1])
 with col3:
-    num_cols = df.select_dtypes(include=['number']).columns.tolist()
+    num_cols = meta['numericas']
     st.metric("Colunas Numéricas", len(num_cols))
 with col4:
-    cat_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
+    cat_cols = meta['texto']
     st.metric("Colunas Categóricas", len(cat_cols))
 
 # Informações de qualidade dos dados
@@ -2,11 +2,17 @@
 """
 Tela 8 — Subplots (plotly)
 """
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from dados.metadados import metadados_colunas
+
 st.set_page_config(page_title='Subplots', layout='wide')
 st.title('📈 Subplots')
 
@@ -24,9 +30,8 @@ if 'df' not in st.session_state or st.session_state.df is None:
 # Carrega os dados do session state
 df = st.session_state.df
 
-# Processamento dos dados
-df.columns = df.columns.str.strip()
-num_cols = df.select_dtypes(include=['number']).columns.tolist()
+meta = metadados_colunas(df, st.session_state.get('impressao_dataset'))
+num_cols = meta['numericas']
 
 if len(num_cols) >= 2:
     # Configurações dos subplots
@@ -1,10 +1,12 @@
-import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.preprocessing import StandardScaler
 from sklearn.cluster import KMeans
 
-df = pd.read_csv('food.cv.csv')
+from dados import COLUNA_DESCRICAO, COLUNAS_NUTRIENTES, carregar_tabela
+
+# Só a descrição e os nutrientes (as medidas caseiras não são usadas)
+df = carregar_tabela('food.cv.csv', colunas=[COLUNA_DESCRICAO, *COLUNAS_NUTRIENTES])
 
 # APRESENTANDO OS DADOS (ANÁLISE EXPLORATÓRIA)
 
@@ -0,0 +1,173 @@
+"""
+dados
+-----
+Camada compartilhada de acesso à tabela de alimentos.
+
+Uso:
+    from dados import carregar_tabela
+    df = carregar_tabela()              # Parquet se houver, senão CSV/XLSX
+    df = carregar_tabela(categorias=["BUTTER"])   # lê só as partições pedidas
+    df = carregar_tabela(colunas=["Description", "Data.Protein"])  # projeção
+    df = carregar_tabela(faixas={"Data.Kilocalories": (50, 80)})   # pula row groups fora da faixa
+    gravar_indexado(df, "filtros.parquet")  # curva Z: faixas de kcal e proteína pulam row groups
+    upsert("delta.csv", "food.parquet")  # grava só linhas novas/alteradas
+    carregar_porcoes("food.parquet")  # nutrientes por medida caseira (food_porcoes.parquet)
+    v = gravar_versao(df, caminho_versoes("food.csv"))  # grava só o que mudou
+    diferenca(caminho_versoes("food.csv"), v["versao"] - 1)  # adicionadas/removidas/alteradas
+
+    from dados.metadados import metadados_colunas  # tipos das colunas, 1x por dataset
+    from dados.modelos import obter_modelo  # modelo ajustado 1x por (dataset, parâmetros)
+    from dados.agrupamento import resultado_kmeans  # K-Means de k=2..10 pré-calculado
+    from dados.consulta import filtrar  # filtros em SQL com DuckDB (opcional)
+    from dados.medicao import medir_leitura, ler_parquet  # tempo de leitura (benchmarks)
+    filtrar("food.parquet", "Category", ["BUTTER"], {"Data.Protein": (0, 10)})
+"""
+
+from .carregamento import (
+    aplicar_esquema,
+    caminho_dataset,
+    carregar_tabela,
+    fonte_padrao,
+    ler_arquivo,
+    listar_categorias,
+    particionamento,
+    resolver_fonte,
+)
+from .compactacao import compactar, compactar_coluna
+from .compartilhado import (
+    DIR_CACHE,
+    VERSAO_CACHE,
+    abrir_arrow,
+    caminho_cache,
+    chave_conteudo,
+    salvar_arrow,
+    visao_pandas,
+)
+from .esquema import (
+    COLUNA_CATEGORIA,
+    COLUNA_DESCRICAO,
+    COLUNA_ID,
+    COLUNAS,
+    COLUNAS_NUMERICAS,
+    COLUNAS_NUTRIENTES,
+    COLUNAS_ORDENACAO,
+    COLUNAS_PESO_PORCAO,
+    COLUNAS_TEXTO_PORCAO,
+    TIPO_TEXTO,
+    TIPOS,
+)
+from .incremental import (
+    caminho_fragmentos,
+    consolidar,
+    ler_com_fragmentos,
+    listar_fragmentos,
+    upsert,
+)
+from .impressoes import (
+    carregar_impressoes,
+    gravar_impressoes,
+    hash_linhas,
+    impressao_dataset,
+    impressoes_linhas,
+    posicoes_duplicadas,
+    resumo_impressoes,
+)
+from .indice import (
+    COLUNA_POSICAO,
+    colunas_chave,
+    estatisticas_row_groups,
+    filtros_faixas,
+    gravar_indexado,
+    mascara_faixas,
+    ordenar,
+    row_groups_relevantes,
+    tamanho_row_group,
+)
+from .porcoes import (
+    caminho_porcoes,
+    carregar_porcoes,
+    gramas_por_medida,
+    gravar_porcoes,
+    interpretar_medidas,
+    matriz_por_porcao,
+    tabela_porcoes,
+)
+from .versoes import (
+    caminho_versoes,
+    diferenca,
+    gravar_versao,
+    ler_versao,
+    listar_versoes,
+    resumo_versao,
+)
+from .validacao import ErroValidacao, segue_esquema, validar_arquivo, validar_blocos, validar_tabela
+
+__all__ = [
+    "compactar",
+    "compactar_coluna",
+    "caminho_fragmentos",
+    "consolidar",
+    "ler_com_fragmentos",
+    "listar_fragmentos",
+    "upsert",
+    "carregar_impressoes",
+    "gravar_impressoes",
+    "hash_linhas",
+    "impressao_dataset",
+    "impressoes_linhas",
+    "posicoes_duplicadas",
+    "resumo_impressoes",
+    "COLUNA_POSICAO",
+    "colunas_chave",
+    "estatisticas_row_groups",
+    "filtros_faixas",
+    "gravar_indexado",
+    "mascara_faixas",
+    "ordenar",
+    "row_groups_relevantes",
+    "tamanho_row_group",
+    "caminho_porcoes",
+    "carregar_porcoes",
+    "gramas_por_medida",
+    "gravar_porcoes",
+    "interpretar_medidas",
+    "matriz_por_porcao",
+    "tabela_porcoes",
+    "caminho_versoes",
+    "diferenca",
+    "gravar_versao",
+    "ler_versao",
+    "listar_versoes",
+    "resumo_versao",
+    "ErroValidacao",
+    "segue_esquema",
+    "validar_arquivo",
+    "validar_blocos",
+    "validar_tabela",
+    "DIR_CACHE",
+    "VERSAO_CACHE",
+    "abrir_arrow",
+    "caminho_cache",
+    "chave_conteudo",
+    "salvar_arrow",
+    "visao_pandas",
+    "aplicar_esquema",
+    "caminho_dataset",
+    "carregar_tabela",
+    "fonte_padrao",
+    "ler_arquivo",
+    "listar_categorias",
+    "particionamento",
+    "resolver_fonte",
+    "COLUNA_CATEGORIA",
+    "COLUNA_DESCRICAO",
+    "COLUNA_ID",
+    "COLUNAS",
+    "COLUNAS_NUMERICAS",
+    "COLUNAS_NUTRIENTES",
+    "COLUNAS_ORDENACAO",
+    "COLUNAS_PESO_PORCAO",
+    "COLUNAS_TEXTO_PORCAO",
+    "TIPO_TEXTO",
+    "TIPOS",
+]
@@ -0,0 +1,262 @@
+"""
+agrupamento.py
+--------------
+Varredura de K-Means pré-calculada: todos os k de uma faixa, uma vez por dataset.
+
+Mover o slider de número de grupos reajustava o pipeline do zero e refazia o
+resumo dos clusters. Aqui cada k da faixa (padrão 2–10) é ajustado uma vez
+por impressão do dataset, numa thread em segundo plano, e o resultado
+(rótulos, centroides, inércia e resumo por cluster) fica em memória e em
+`.cache/clusters/<chave>/k<k>.joblib`. O k pedido entra na frente da fila;
+se ele ainda estiver esperando, é ajustado na hora na thread de quem pediu.
+
+`metricas_kmeans` é a varredura da escolha do k ótimo (inércia e silhouette
+por k): cada k roda em um processo separado e os valores já calculados para
+o mesmo dataset são reaproveitados quando a faixa de k cresce. O silhouette
+vem de `silhueta.py` (exato, amostrado ou simplificado conforme o tamanho).
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+
+from .carregamento import DIR_CACHE
+from .silhueta import silhueta
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+DIR_CLUSTERS = DIR_CACHE / "clusters"
+
+K_PADRAO = range(2, 11)
+
+# Varreduras mantidas em memória (as mais antigas saem primeiro)
+MAX_VARREDURAS = 4
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="varredura-kmeans")
+_VARREDURAS: OrderedDict = OrderedDict()
+_METRICAS: OrderedDict = OrderedDict()
+_TRAVA = threading.Lock()
+
+# Dados da varredura de métricas em cada processo (enviados uma vez por processo)
+_DADOS_PROCESSO = None
+
+
+# ===============================================
+# 🧮 AJUSTE DE UM K
+# ===============================================
+
+def ajustar_k(X: pd.DataFrame, k: int, random_state: int = 42) -> dict:
+    """
+    Imputação pela média, padronização e K-Means com `k` grupos.
+
+    Retorna `k`, `rotulos` (um por linha de `X`), `centroides` (nas
+    unidades originais), `inercia` e `resumo` (média de cada coluna por
+    cluster, arredondada, e `Qtd. Itens`).
+    """
+    pipeline = Pipeline([
+        ("imputer", SimpleImputer(strategy="mean")),
+        ("scaler", StandardScaler()),
+        ("kmeans", KMeans(n_clusters=k, random_state=random_state)),
+    ])
+    pipeline.fit(X)
+    kmeans = pipeline.named_steps["kmeans"]
+    rotulos = kmeans.labels_.astype("int32")
+
+    centroides = pd.DataFrame(
+        pipeline.named_steps["scaler"].inverse_transform(kmeans.cluster_centers_),
+        columns=X.columns,
+    )
+    centroides.index.name = "Cluster"
+
+    grupos = X.groupby(pd.Index(rotulos, name="Cluster"))
+    resumo = grupos.mean().round(1)
+    resumo["Qtd. Itens"] = grupos.size()
+
+    return {
+        "k": k,
+        "rotulos": rotulos,
+        "centroides": centroides,
+        "inercia": float(kmeans.inertia_),
+        "resumo": resumo,
+    }
+
+
+def _iniciar_processo(dados: np.ndarray) -> None:
+    global _DADOS_PROCESSO
+    _DADOS_PROCESSO = dados
+
+
+def metricas_k(dados: np.ndarray, k: int, n_init: int = 10, random_state: int = 42,
+               metodo_silhueta: str = "auto") -> dict:
+    """
+    Inércia e silhouette do K-Means com `k` grupos.
+
+    `metodo_silhueta` e `ic_silhueta` dizem qual estimador foi usado (ver
+    `silhueta.silhueta`) e o intervalo de 95% quando amostrado.
+    """
+    kmeans = KMeans(n_clusters=k, random_state=random_state, n_init=n_init)
+    rotulos = kmeans.fit_predict(dados)
+    estimativa = silhueta(dados, rotulos, kmeans.cluster_centers_, metodo_silhueta, random_state=random_state)
+    return {
+        "inercia": float(kmeans.inertia_),
+        "silhueta": estimativa["valor"],
+        "metodo_silhueta": estimativa["metodo"],
+        "ic_silhueta": estimativa["ic"],
+    }
+
+
+def _metricas_no_processo(k: int, n_init: int, random_state: int, metodo_silhueta: str) -> tuple[int, dict]:
+    # Um processo por k: sem isso cada um abriria uma thread OpenMP por núcleo
+    with threadpool_limits(limits=1):
+        return k, metricas_k(_DADOS_PROCESSO, k, n_init, random_state, metodo_silhueta)
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def chave_varredura(impressao: str, colunas, random_state: int = 42) -> str:
+    """Chave da varredura: dataset, colunas usadas e semente."""
+    conteudo = json.dumps([impressao, [str(c) for c in colunas], random_state])
+    return hashlib.sha256(conteudo.encode()).hexdigest()[:16]
+
+
+def caminho_varredura(chave: str) -> Path:
+    """Diretório com um arquivo por k ajustado."""
+    return DIR_CLUSTERS / chave
+
+
+def _calcular(X: pd.DataFrame, k: int, random_state: int, pasta: Path) -> dict:
+    """Resultado gravado de `k`, ou ajusta e grava."""
+    arquivo = pasta / f"k{k:02d}.joblib"
+    if arquivo.exists():
+        return joblib.load(arquivo)
+    resultado = ajustar_k(X, k, random_state)
+    pasta.mkdir(parents=True, exist_ok=True)
+    temporario = arquivo.with_suffix(".tmp")
+    joblib.dump(resultado, temporario)
+    temporario.replace(arquivo)
+    return resultado
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def varredura_kmeans(X: pd.DataFrame, impressao: str, ks=K_PADRAO, random_state: int = 42,
+                     primeiro: int | None = None) -> dict:
+    """
+    Dispara (uma vez por dataset) o ajuste de todos os `ks` em segundo plano.
+
+    Retorna `{k: Future}`; chamadas seguintes só devolvem os mesmos futures.
+    `primeiro` vai para a frente da fila dos k ainda não enviados.
+    """
+    chave = chave_varredura(impressao, X.columns, random_state)
+    pasta = caminho_varredura(chave)
+
+    with _TRAVA:
+        futuros = _VARREDURAS.get(chave)
+        if futuros is None:
+            futuros = _VARREDURAS[chave] = {}
+            while len(_VARREDURAS) > MAX_VARREDURAS:
+                _VARREDURAS.popitem(last=False)
+        _VARREDURAS.move_to_end(chave)
+
+        faltam = sorted((k for k in ks if k not in futuros), key=lambda k: k != primeiro)
+        if faltam:
+            dados = X.copy()
+            for k in faltam:
+                futuros[k] = _EXECUTOR.submit(_calcular, dados, k, random_state, pasta)
+        return {k: futuros[k] for k in ks}
+
+
+def resultado_kmeans(X: pd.DataFrame, impressao: str, k: int, ks=K_PADRAO, random_state: int = 42) -> dict:
+    """
+    Resultado de `k` (ver `ajustar_k`), garantindo a varredura de `ks` em andamento.
+
+    Se `k` já terminou, volta na hora; se está rodando, espera; se ainda
+    está na fila, sai dela e é ajustado imediatamente nesta thread.
+    """
+    ks = sorted(set(ks) | {k})
+    futuro = varredura_kmeans(X, impressao, ks, random_state, primeiro=k)[k]
+    if not futuro.cancel():
+        return futuro.result()
+
+    chave = chave_varredura(impressao, X.columns, random_state)
+    resultado = _calcular(X, k, random_state, caminho_varredura(chave))
+    pronto = Future()
+    pronto.set_result(resultado)
+    with _TRAVA:
+        if chave in _VARREDURAS:
+            _VARREDURAS[chave][k] = pronto
+    return resultado
+
+
+def progresso_varredura(futuros: dict) -> tuple[int, int]:
+    """(k prontos, total) de uma varredura."""
+    return sum(f.done() for f in futuros.values()), len(futuros)
+
+
+def metricas_kmeans(dados, impressao: str, ks, normalizar: bool = True, n_init: int = 10,
+                    random_state: int = 42, workers: int | None = None, progresso=None,
+                    metodo_silhueta: str = "auto") -> dict:
+    """
+    Métricas de cada k de `ks` (ver `metricas_k`): `{k: {"inercia", "silhueta", ...}}`.
+
+    O cache é por (impressão, `normalizar`, `n_init`, semente, estimador do
+    silhouette): só os k
+    ainda não calculados são ajustados, um por processo (no máximo
+    `workers`, padrão: núcleos da máquina). `progresso(feitos, total)` é
+    chamada a cada k concluído, na thread de quem chamou.
+    """
+    ks = list(ks)
+    chave = (impressao, bool(normalizar), n_init, random_state, metodo_silhueta)
+    with _TRAVA:
+        calculadas = _METRICAS.setdefault(chave, {})
+        _METRICAS.move_to_end(chave)
+        while len(_METRICAS) > MAX_VARREDURAS:
+            _METRICAS.popitem(last=False)
+        faltam = [k for k in ks if k not in calculadas]
+
+    total, feitos = len(ks), len(ks) - len(faltam)
+    if progresso is not None:
+        progresso(feitos, total)
+
+    if faltam:
+        matriz = np.ascontiguousarray(dados, dtype="float64")
+        workers = min(len(faltam), workers or os.cpu_count() or 1)
+        if workers == 1:
+            resultados = ((k, metricas_k(matriz, k, n_init, random_state, metodo_silhueta)) for k in faltam)
+            for k, metricas in resultados:
+                calculadas[k] = metricas
+                feitos += 1
+                if progresso is not None:
+                    progresso(feitos, total)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_processo,
+                                     initargs=(matriz,)) as pool:
+                # k maiores demoram mais: saem primeiro para equilibrar os processos
+                futuros = [pool.submit(_metricas_no_processo, k, n_init, random_state, metodo_silhueta)
+                           for k in sorted(faltam, reverse=True)]
+                for futuro in as_completed(futuros):
+                    k, metricas = futuro.result()
+                    calculadas[k] = metricas
+                    feitos += 1
+                    if progresso is not None:
+                        progresso(feitos, total)
+
+    return {k: calculadas[k] for k in ks}
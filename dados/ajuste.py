@@ -0,0 +1,137 @@
+"""
+ajuste.py
+---------
+Ajuste automático das opções de escrita Parquet.
+
+Testa codecs, níveis de compressão, dictionary encoding e tamanhos de row
+group sobre uma amostra do DataFrame, medindo tempo de escrita, tempo de
+leitura e tamanho de cada combinação, e recomenda a melhor para o objetivo
+escolhido (leitura rápida, arquivo pequeno ou equilíbrio entre os dois).
+"""
+
+import io
+import itertools
+import statistics
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+# Níveis testados por codec (None = codec sem nível configurável)
+NIVEIS = {
+    "snappy": [None],
+    "lz4": [None],
+    "zstd": [1, 3, 9],
+    "gzip": [1, 6, 9],
+    "brotli": [1, 5, 9],
+    "none": [None],
+}
+ROW_GROUPS = [10_000, 100_000]
+AMOSTRA = 50_000
+REPETICOES = 2
+
+OBJETIVOS = {
+    "leitura": "Leitura mais rápida",
+    "tamanho": "Menor arquivo",
+    "equilibrio": "Equilíbrio leitura × tamanho",
+}
+
+
+# ===============================================
+# ⚙️ MEDIÇÃO
+# ===============================================
+
+def opcoes_escrita(combinacao: dict) -> dict:
+    """Argumentos de `pq.write_table` / `DataFrame.to_parquet` para uma combinação."""
+    opcoes = {
+        "compression": combinacao["codec"],
+        "use_dictionary": bool(combinacao["dicionario"]),
+        "row_group_size": int(combinacao["row_group"]),
+    }
+    # Vindo de uma linha do DataFrame de resultados, "sem nível" é NaN
+    if pd.notna(combinacao.get("nivel")):
+        opcoes["compression_level"] = int(combinacao["nivel"])
+    return opcoes
+
+
+def medir(tabela: pa.Table, combinacao: dict, repeticoes: int = REPETICOES) -> dict:
+    """Mediana do tempo de escrita e de leitura (até pandas) e tamanho em bytes."""
+    opcoes = opcoes_escrita(combinacao)
+    escritas, leituras = [], []
+
+    for _ in range(repeticoes):
+        buffer = io.BytesIO()
+        inicio = time.perf_counter()
+        pq.write_table(tabela, buffer, **opcoes)
+        escritas.append(time.perf_counter() - inicio)
+
+        dados = buffer.getvalue()
+        inicio = time.perf_counter()
+        pq.read_table(pa.BufferReader(dados)).to_pandas()
+        leituras.append(time.perf_counter() - inicio)
+
+    return {
+        **combinacao,
+        "tempo_escrita_s": statistics.median(escritas),
+        "tempo_leitura_s": statistics.median(leituras),
+        "bytes": len(dados),
+    }
+
+
+def combinacoes(linhas: int) -> list[dict]:
+    """Grade de combinações; row groups maiores que a amostra viram um só."""
+    row_groups = sorted({min(rg, linhas) for rg in ROW_GROUPS})
+    return [
+        {"codec": codec, "nivel": nivel, "dicionario": dicionario, "row_group": rg}
+        for (codec, niveis), dicionario, rg in itertools.product(NIVEIS.items(), (True, False), row_groups)
+        for nivel in niveis
+    ]
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def medir_combinacoes(df: pd.DataFrame, amostra: int = AMOSTRA, repeticoes: int = REPETICOES) -> pd.DataFrame:
+    """Mede todas as combinações sobre uma amostra de até `amostra` linhas."""
+    if len(df) > amostra:
+        df = df.sample(amostra, random_state=0)
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    return pd.DataFrame([medir(tabela, c, repeticoes) for c in combinacoes(len(df))])
+
+
+def recomendar(resultados: pd.DataFrame, objetivo: str = "equilibrio") -> pd.DataFrame:
+    """
+    Ordena as medições pela pontuação do objetivo (a primeira linha é a recomendação).
+
+    A pontuação é relativa à melhor combinação de cada métrica (1.0 = a
+    melhor): `leitura` usa o tempo de leitura, `tamanho` usa os bytes e
+    `equilibrio` soma os dois. Trocar de objetivo não exige medir de novo.
+    """
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo inválido: '{objetivo}'. Use {', '.join(OBJETIVOS)}")
+
+    leitura = resultados["tempo_leitura_s"] / resultados["tempo_leitura_s"].min()
+    tamanho = resultados["bytes"] / resultados["bytes"].min()
+    pontuacao = {
+        "leitura": leitura,
+        "tamanho": tamanho,
+        "equilibrio": leitura + tamanho,
+    }[objetivo]
+
+    # Empates (ex.: mesmo tamanho) ficam com a escrita mais rápida
+    return (
+        resultados.assign(pontuacao=pontuacao)
+        .sort_values(["pontuacao", "tempo_escrita_s"])
+        .reset_index(drop=True)
+    )
+
+
+def ajustar(df: pd.DataFrame, objetivo: str = "equilibrio", amostra: int = AMOSTRA,
+            repeticoes: int = REPETICOES) -> pd.DataFrame:
+    """Mede e recomenda em um passo; use `opcoes_escrita` na primeira linha para gravar."""
+    return recomendar(medir_combinacoes(df, amostra, repeticoes), objetivo)
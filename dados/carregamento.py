@@ -0,0 +1,287 @@
+"""
+carregamento.py
+---------------
+Carregamento único da tabela de alimentos para dashboards e scripts.
+
+Prefere o dataset particionado por categoria ou o Parquet (mais rápidos) e
+cai para CSV/XLSX quando eles não existem ou estão desatualizados. Planilhas
+são convertidas para Parquet uma única vez e guardadas no cache local. O
+resultado sempre segue o esquema de `esquema.py`.
+"""
+
+import hashlib
+import importlib.util
+import os
+from pathlib import Path
+from urllib.parse import unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from .esquema import COLUNA_CATEGORIA, COLUNAS, COLUNAS_NUMERICAS, TIPOS
+from .incremental import caminho_fragmentos, ler_com_fragmentos
+from .indice import filtros_faixas, mascara_faixas
+from .validacao import CHUNK_SIZE, validar_blocos, validar_tabela
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+RAIZ = Path(__file__).resolve().parent.parent
+DIR_CACHE = Path(os.environ.get("VIVA_BEM_CACHE", RAIZ / ".cache"))
+
+# Ordem de busca quando nenhum caminho é informado (ou VIVA_BEM_DADOS)
+FONTES_PADRAO = ("food.csv", "food.cv.csv", "food.xlsx")
+
+EXTENSOES_SUPORTADAS = (".parquet", ".csv", ".xlsx")
+
+# Dataset Hive (Category=<valor>/...) gravado ao lado da fonte
+SUFIXO_DATASET = "_dataset"
+PARTICAO_NULA = "__HIVE_DEFAULT_PARTITION__"
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def fonte_padrao() -> Path:
+    """Caminho padrão do dataset: variável VIVA_BEM_DADOS ou a raiz do projeto."""
+    env = os.environ.get("VIVA_BEM_DADOS")
+    if env:
+        return Path(env)
+    for nome in FONTES_PADRAO:
+        if (RAIZ / nome).exists():
+            return RAIZ / nome
+    return RAIZ / FONTES_PADRAO[0]
+
+
+def caminho_dataset(fonte) -> Path:
+    """Diretório do dataset particionado correspondente a uma fonte (food.csv → food_dataset/)."""
+    fonte = Path(fonte)
+    return fonte.with_name(fonte.with_suffix("").name + SUFIXO_DATASET)
+
+
+def particionamento() -> ds.Partitioning:
+    """Particionamento Hive por Category, compartilhado entre escrita e leitura."""
+    return ds.partitioning(pa.schema([(COLUNA_CATEGORIA, pa.string())]), flavor="hive")
+
+
+def _atualizado(derivado: Path, fonte: Path) -> bool:
+    return derivado.exists() and (not fonte.exists() or derivado.stat().st_mtime >= fonte.stat().st_mtime)
+
+
+def resolver_fonte(caminho=None, categorias=None) -> Path:
+    """
+    Escolhe o que ler: dataset particionado, Parquet irmão ou a própria fonte.
+
+    O dataset por categoria só compensa quando há `categorias` para podar as
+    partições; sem filtro, um único Parquet é lido mais rápido que milhares
+    de arquivos pequenos. Um dataset mais antigo que os fragmentos de upsert
+    do Parquet está desatualizado.
+    """
+    fonte = Path(caminho) if caminho is not None else fonte_padrao()
+
+    if fonte.is_dir():
+        return fonte
+
+    if fonte.suffix.lower() not in EXTENSOES_SUPORTADAS:
+        raise ValueError(f"Formato não suportado: '{fonte.suffix}'. Use .parquet, .csv ou .xlsx")
+
+    dataset = caminho_dataset(fonte)
+    parquet = fonte if fonte.suffix.lower() == ".parquet" else fonte.with_suffix(".parquet")
+
+    dataset_atualizado = _atualizado(dataset, fonte) and _atualizado(dataset, caminho_fragmentos(parquet))
+
+    if categorias and dataset_atualizado:
+        return dataset
+    if _atualizado(parquet, fonte):
+        return parquet
+    if dataset_atualizado:
+        return dataset
+    if not fonte.exists():
+        raise FileNotFoundError(f"Arquivo '{fonte}' não encontrado.")
+    return fonte
+
+
+def caminho_cache_excel(fonte) -> Path:
+    """
+    Parquet em cache de uma planilha, chaveado por caminho, mtime e tamanho.
+
+    O nome é `<hash do caminho>-<hash de mtime/tamanho>.parquet`: editar a
+    planilha gera uma entrada nova e a antiga pode ser apagada pelo prefixo.
+    """
+    fonte = Path(fonte).resolve()
+    info = fonte.stat()
+    prefixo = hashlib.sha256(str(fonte).encode()).hexdigest()[:16]
+    versao = hashlib.sha256(f"{info.st_mtime_ns}:{info.st_size}".encode()).hexdigest()[:16]
+    return DIR_CACHE / "excel" / f"{prefixo}-{versao}.parquet"
+
+
+def motor_excel() -> str | None:
+    """Motor mais rápido disponível para .xlsx (calamine, em Rust) ou o padrão do pandas."""
+    return "calamine" if importlib.util.find_spec("python_calamine") else None
+
+
+def aplicar_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """Converte as colunas conhecidas para os tipos do esquema (valores inválidos viram NaN)."""
+    for col, tipo in TIPOS.items():
+        if col not in df.columns or str(df[col].dtype) == tipo:
+            continue
+        if col in COLUNAS_NUMERICAS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype(tipo)
+        elif tipo == "Int32":
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype(tipo)
+        else:
+            df[col] = df[col].astype(tipo)
+
+    # Mantém a ordem canônica e preserva colunas extras no final
+    ordem = [c for c in COLUNAS if c in df.columns]
+    extras = [c for c in df.columns if c not in ordem]
+    return df[ordem + extras]
+
+
+def ler_arquivo(fonte: Path, categorias=None, colunas=None, faixas=None, validar: bool = False) -> pd.DataFrame:
+    """
+    Lê o arquivo conforme a extensão, já pedindo os tipos ao leitor quando possível.
+
+    Com `categorias`, o dataset particionado abre apenas as partições pedidas
+    e o Parquet (ou o cache da planilha) filtra por row group; o CSV é lido
+    inteiro. Com `colunas`, só essas colunas são lidas (projeção feita pelo
+    próprio leitor). `faixas` (`{coluna: (mín, máx)}`) também desce até o
+    leitor: row groups cujo min/max não cruza a faixa nem são abertos (ver
+    `indice.py`).
+
+    Com `validar`, as colunas do esquema lidas passam por `validacao.py`
+    antes de qualquer conversão; o CSV é lido e validado em blocos e a
+    leitura para no primeiro bloco com violação fatal (`ErroValidacao`).
+    """
+    bruto = _ler_bruto(fonte, categorias, colunas, faixas, validar)
+    if validar and (fonte.is_dir() or fonte.suffix.lower() != ".csv"):
+        validar_tabela(bruto, [c for c in bruto.columns if c in COLUNAS])
+    return bruto
+
+
+def _ler_bruto(fonte: Path, categorias=None, colunas=None, faixas=None, validar: bool = False) -> pd.DataFrame:
+    """Leitura conforme a extensão (ver `ler_arquivo`); só o CSV valida aqui, em blocos."""
+    sufixo = fonte.suffix.lower()
+    colunas = list(colunas) if colunas is not None else None
+
+    if fonte.is_dir():
+        dataset = ds.dataset(fonte, format="parquet", partitioning=particionamento())
+        filtro = ds.field(COLUNA_CATEGORIA).isin(list(categorias)) if categorias else None
+        for coluna, operador, valor in filtros_faixas(faixas):
+            condicao = ds.field(coluna) >= valor if operador == ">=" else ds.field(coluna) <= valor
+            filtro = condicao if filtro is None else filtro & condicao
+        return dataset.to_table(columns=colunas, filter=filtro).to_pandas()
+
+    if sufixo == ".parquet":
+        # Aplica também os fragmentos gravados por upsert (ver incremental.py)
+        return ler_com_fragmentos(fonte, colunas, categorias, faixas=faixas)
+
+    # Sem pushdown de filtro: Category e as colunas das faixas precisam ser lidas para filtrar em memória
+    if colunas is not None:
+        extras = ([COLUNA_CATEGORIA] if categorias else []) + list(faixas or {})
+        colunas += [c for c in extras if c not in colunas]
+
+    if sufixo == ".csv":
+        if validar:
+            # Sem tipos na leitura: texto em coluna numérica precisa chegar à validação
+            blocos = pd.read_csv(fonte, usecols=colunas, chunksize=CHUNK_SIZE)
+            partes = list(validar_blocos(blocos))
+            return pd.concat(partes, ignore_index=True) if partes else pd.read_csv(fonte, usecols=colunas, nrows=0)
+        try:
+            return pd.read_csv(fonte, usecols=colunas, dtype=TIPOS)
+        except (ValueError, TypeError):
+            # Valores não numéricos em colunas Data.*: lê sem tipos e converte depois
+            return pd.read_csv(fonte, usecols=colunas)
+
+    return ler_excel(fonte, categorias, colunas, faixas)
+
+
+def ler_excel(fonte: Path, categorias=None, colunas=None, faixas=None) -> pd.DataFrame:
+    """
+    Lê a planilha pela cópia Parquet em cache, convertendo-a na primeira vez.
+
+    Só o cache frio paga o `read_excel` (com o motor mais rápido disponível);
+    as leituras seguintes projetam colunas e filtram categorias no Parquet.
+    """
+    cache = caminho_cache_excel(fonte)
+    if not cache.exists():
+        df = aplicar_esquema(pd.read_excel(fonte, engine=motor_excel()))
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        prefixo = cache.name.split("-")[0]
+        try:
+            temporario = cache.with_suffix(".tmp")
+            df.to_parquet(temporario, index=False)
+            temporario.replace(cache)
+        except (TypeError, ValueError):
+            # Colunas com tipos mistos não cabem em Parquet: segue sem cache
+            return df[colunas] if colunas is not None else df
+        for antigo in cache.parent.glob(f"{prefixo}-*.parquet"):
+            if antigo != cache:
+                antigo.unlink()
+
+    filtros = ([(COLUNA_CATEGORIA, "in", list(categorias))] if categorias else []) + filtros_faixas(faixas)
+    return pd.read_parquet(cache, columns=colunas, filters=filtros or None)
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def carregar_tabela(caminho=None, categorias=None, colunas=None, faixas=None,
+                    validar: bool = True) -> pd.DataFrame:
+    """
+    Carrega a tabela de alimentos tipada.
+
+    `caminho` pode apontar para .csv, .xlsx, .parquet ou um diretório de
+    dataset; sem caminho, usa `fonte_padrao()`. Se existir ao lado da fonte
+    um dataset particionado ou um .parquet que não seja mais antigo que ela,
+    ele é lido no lugar (ver `resolver_fonte`). `categorias` restringe o
+    resultado a essas categorias, lendo só as partições correspondentes.
+    `colunas` declara as colunas usadas pela página/script; as demais nem
+    chegam a ser lidas do Parquet, e o resultado vem nessa ordem. `faixas`
+    (`{coluna: (mín, máx)}`, None = sem limite) mantém só as linhas dentro
+    de todas as faixas; no Parquet, os row groups fora delas são pulados.
+
+    Com `validar`, as colunas lidas passam pela validação de esquema antes
+    da conversão de tipos (no CSV, bloco a bloco durante a leitura): uma
+    violação fatal (texto em coluna numérica, identificador nulo ou
+    repetido...) gera `ErroValidacao` em vez de virar NaN silenciosamente.
+    """
+    fonte = resolver_fonte(caminho, categorias)
+    df = aplicar_esquema(ler_arquivo(fonte, categorias, colunas, faixas, validar))
+    if not (fonte.is_dir() or fonte.suffix.lower() == ".parquet"):
+        # CSV (e planilha sem cache): sem estatísticas por row group, filtra em memória
+        mascara = mascara_faixas(df, faixas)
+        if categorias:
+            mascara &= df[COLUNA_CATEGORIA].isin(categorias)
+        if not mascara.all():
+            df = df[mascara].reset_index(drop=True)
+    if colunas is not None:
+        df = df[list(colunas)]
+    return df
+
+
+def listar_categorias(caminho=None) -> list[str]:
+    """Categorias disponíveis; no dataset particionado vêm só dos nomes das pastas."""
+    fonte = Path(caminho) if caminho is not None else fonte_padrao()
+    dataset = caminho_dataset(fonte)
+    fragmentos = caminho_fragmentos(fonte.with_suffix(".parquet"))
+    fonte = dataset if _atualizado(dataset, fonte) and _atualizado(dataset, fragmentos) else resolver_fonte(fonte)
+
+    if fonte.is_dir():
+        prefixo = f"{COLUNA_CATEGORIA}="
+        valores = {
+            unquote(p.name[len(prefixo):])
+            for p in fonte.iterdir()
+            if p.is_dir() and p.name.startswith(prefixo) and p.name != prefixo + PARTICAO_NULA
+        }
+        if not valores:
+            # Dataset sem partições (ex.: ingestão de diretório): lê só a coluna
+            valores = set(ler_arquivo(fonte, colunas=[COLUNA_CATEGORIA])[COLUNA_CATEGORIA].dropna())
+    elif fonte.suffix.lower() == ".parquet":
+        valores = set(ler_com_fragmentos(fonte, [COLUNA_CATEGORIA])[COLUNA_CATEGORIA].dropna())
+    else:
+        valores = set(carregar_tabela(fonte)[COLUNA_CATEGORIA].dropna())
+    return sorted(valores)
@@ -0,0 +1,152 @@
+"""
+compactacao.py
+--------------
+Compactação automática de tipos logo após o upload.
+
+- float64 → float32 quando os valores sobrevivem à conversão;
+- colunas inteiras → menor int. Floats só viram inteiros nas colunas que
+  são inteiras por definição (`COLUNAS_INTEIRAS`, ex.: o ID) e quando não
+  têm nulos/infinitos e cabem em int64;
+- colunas que o esquema declara float (os nutrientes `Data.*`) ficam float
+  mesmo que o upload só traga valores redondos (lidos como int64): o tipo
+  não depende do conteúdo de cada arquivo;
+- texto com baixa cardinalidade → category;
+- demais colunas de texto → string em buffers Arrow (string[pyarrow]).
+
+Conversões que não diminuem a memória da coluna são descartadas. Devolve
+também um relatório por coluna com a memória economizada.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .esquema import COLUNA_ID, TIPO_TEXTO, TIPOS
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+# Texto vira category quando únicos/linhas fica até este limite
+LIMITE_CARDINALIDADE = 0.5
+
+# Tolerância relativa aceita ao passar de float64 para float32 (~7 dígitos)
+TOLERANCIA_FLOAT32 = 1e-6
+
+# Faixa de int64 em float (2**63 é exato em float64; o limite superior é aberto)
+MENOR_INT64 = -float(2 ** 63)
+MAIOR_INT64 = float(2 ** 63)
+
+# Colunas float que podem virar inteiras (as demais ficam float)
+COLUNAS_INTEIRAS = {COLUNA_ID}
+
+# Colunas float no esquema: inteiros nelas passam a float
+COLUNAS_FLOAT = {c for c, t in TIPOS.items() if t.startswith("float")}
+
+
+# ===============================================
+# ⚙️ REGRAS POR TIPO
+# ===============================================
+
+def _inteira(serie: pd.Series) -> bool:
+    """Float finito (sem nulos nem ±inf), com valores inteiros que cabem em int64."""
+    valores = serie.to_numpy()
+    if not np.isfinite(valores).all():
+        return False
+    if valores.min() < MENOR_INT64 or valores.max() >= MAIOR_INT64:
+        return False
+    return np.array_equal(valores, np.round(valores))
+
+
+def _cabe_em_float32(serie: pd.Series) -> bool:
+    valores = serie.to_numpy()
+    finitos = valores[np.isfinite(valores)]
+    if finitos.size and np.abs(finitos).max() > np.finfo(np.float32).max:
+        return False
+    convertidos = valores.astype(np.float32).astype(np.float64)
+    return np.allclose(valores, convertidos, rtol=TOLERANCIA_FLOAT32, atol=0, equal_nan=True)
+
+
+def _menor(original: pd.Series, compacta: pd.Series) -> pd.Series:
+    """A compacta só se ocupar menos memória que a original."""
+    if compacta is original:
+        return original
+    antes = original.memory_usage(index=False, deep=True)
+    return compacta if compacta.memory_usage(index=False, deep=True) < antes else original
+
+
+def compactar_coluna(serie: pd.Series) -> pd.Series:
+    """Versão compacta de uma coluna (ou a própria coluna, se não houver ganho seguro)."""
+    return _menor(serie, _converter(serie))
+
+
+def _converter(serie: pd.Series) -> pd.Series:
+    tipo = serie.dtype
+
+    if pd.api.types.is_bool_dtype(tipo):
+        return serie
+
+    if pd.api.types.is_string_dtype(tipo) or tipo == object:
+        if len(serie) and serie.nunique(dropna=True) / len(serie) <= LIMITE_CARDINALIDADE:
+            try:
+                return serie.astype("category")
+            except TypeError:
+                # Objetos não hasheáveis (listas, dicts): mantém
+                return serie
+        if tipo == object and pd.api.types.infer_dtype(serie, skipna=True) == "string":
+            # Só texto: um buffer Arrow no lugar de um objeto Python por célula
+            return serie.astype(TIPO_TEXTO)
+        return serie
+
+    if not isinstance(tipo, np.dtype):
+        # category e tipos de extensão (Int32, datas com fuso...) ficam como estão
+        return serie
+
+    if tipo.kind in "iu" and serie.name in COLUNAS_FLOAT:
+        serie, tipo = serie.astype(np.float64), np.dtype(np.float64)
+
+    if tipo.kind in "iu":
+        return pd.to_numeric(serie, downcast="integer" if tipo.kind == "i" else "unsigned")
+
+    if tipo.kind == "f":
+        if serie.name in COLUNAS_INTEIRAS and len(serie) and _inteira(serie):
+            return pd.to_numeric(serie.astype(np.int64), downcast="integer")
+        if tipo == np.float64 and _cabe_em_float32(serie):
+            return serie.astype(np.float32)
+
+    return serie
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def compactar(df: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compacta os tipos do DataFrame.
+
+    Retorna `(df_compacto, relatorio)`, onde o relatório tem uma linha por
+    coluna com tipo antes/depois e bytes economizados (memory_usage deep).
+    """
+    colunas = {}
+    linhas = []
+
+    for i, nome in enumerate(df.columns):
+        original = df.iloc[:, i]
+        compacta = compactar_coluna(original)
+        colunas[i] = compacta
+
+        antes = int(original.memory_usage(index=False, deep=True))
+        depois = int(compacta.memory_usage(index=False, deep=True))
+        linhas.append({
+            "coluna": nome,
+            "tipo_original": str(original.dtype),
+            "tipo_novo": str(compacta.dtype),
+            "bytes_antes": antes,
+            "bytes_depois": depois,
+            "economia_bytes": antes - depois,
+            "economia_pct": (1 - depois / antes) * 100 if antes else 0.0,
+        })
+
+    compacto = pd.concat(colunas, axis=1)
+    compacto.columns = df.columns
+    compacto.index = df.index
+    return compacto, pd.DataFrame(linhas)
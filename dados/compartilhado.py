@@ -0,0 +1,102 @@
+"""
+compartilhado.py
+----------------
+Tabela Arrow mapeada em memória e compartilhada entre sessões do Streamlit.
+
+O dataset é gravado uma vez como Arrow IPC (Feather v2) sem compressão e
+aberto com memory map: o sistema operacional mantém uma única cópia em cache
+e cada sessão recebe só uma visão pandas apontando para os mesmos buffers.
+Os buffers numéricos são somente leitura: atribuir uma coluna inteira
+(`df[col] = ...`) cria uma coluna nova e funciona, mas escrever células
+(`df.loc[i, col] = x`) levanta ValueError mesmo com copy-on-write. Páginas
+que precisam editar células trabalham em `df.copy()`.
+
+Os arquivos ficam em um cache em disco endereçado pelo conteúdo (SHA-256):
+reenviar o mesmo arquivo, mesmo após reiniciar o servidor, abre a cópia
+colunar já tipada em vez de refazer o parsing. A chave inclui
+`VERSAO_CACHE`: quando o que é gravado muda (normalização dos nomes,
+compactação, validação, cópia indexada), as entradas antigas deixam de valer.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .carregamento import DIR_CACHE
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+# Versão do que o upload grava no cache; aumente ao mudar o processamento
+# (2: nomes de colunas normalizados antes de gravar; floats só viram inteiros
+# quando finitos e dentro do int64; 3: nutrientes sempre float)
+VERSAO_CACHE = 3
+
+
+# ===============================================
+# 🗂️ CACHE ENDEREÇADO POR CONTEÚDO
+# ===============================================
+
+def chave_conteudo(conteudo: bytes) -> str:
+    """Hash SHA-256 da versão do cache e do conteúdo: o mesmo arquivo cai na mesma entrada."""
+    return hashlib.sha256(f"viva-bem-cache-v{VERSAO_CACHE}\n".encode() + conteudo).hexdigest()
+
+
+def caminho_cache(chave: str, grupo: str = "uploads") -> Path:
+    """Arquivo Arrow do cache para uma chave (ex.: .cache/uploads/<sha256>.arrow)."""
+    return DIR_CACHE / grupo / f"{chave}.arrow"
+
+
+# ===============================================
+# 🏹 ARROW IPC MAPEADO EM MEMÓRIA
+# ===============================================
+
+def tabela_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Converte o DataFrame para Arrow mantendo NaN como valor nas colunas float.
+
+    Sem bitmap de nulos, o `to_pandas` dessas colunas não precisa copiar nem
+    preencher NaN: a visão aponta direto para o arquivo mapeado.
+    """
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    for i, tipo in enumerate(df.dtypes):
+        if isinstance(tipo, np.dtype) and tipo.kind == "f":
+            valores = pa.array(df.iloc[:, i].to_numpy(), from_pandas=False)
+            tabela = tabela.set_column(i, tabela.field(i), valores)
+    return tabela
+
+
+def salvar_arrow(df: pd.DataFrame, caminho) -> Path:
+    """Grava o DataFrame como Arrow IPC sem compressão (requisito para o memory map)."""
+    caminho = Path(caminho)
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(".tmp")
+    feather.write_feather(tabela_arrow(df), temporario, compression="uncompressed")
+    # Troca atômica: outra sessão nunca vê um arquivo pela metade
+    temporario.replace(caminho)
+    return caminho
+
+
+def abrir_arrow(caminho) -> pa.Table:
+    """Abre o arquivo Arrow com memory map (nenhum dado é copiado para o heap)."""
+    return feather.read_table(caminho, memory_map=True)
+
+
+def visao_pandas(tabela: pa.Table) -> pd.DataFrame:
+    """
+    DataFrame sem cópia sobre a tabela mapeada (colunas numéricas somente leitura).
+
+    Colunas de texto viram string[pyarrow] apontando para os buffers do
+    arquivo, em vez de um objeto Python por célula; as codificadas em
+    dicionário continuam como category.
+
+    Escrever em células numéricas (`.loc`, `.iloc`, `.at`) levanta
+    `ValueError: assignment destination is read-only`; substituir a coluna
+    inteira ou editar uma `copy()` funciona.
+    """
+    texto = pd.StringDtype("pyarrow")
+    return tabela.to_pandas(split_blocks=True, types_mapper={pa.string(): texto, pa.large_string(): texto}.get)
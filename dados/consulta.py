@@ -0,0 +1,169 @@
+"""
+consulta.py
+-----------
+Filtros em SQL direto sobre os arquivos colunares, com DuckDB (opcional).
+
+Em vez de montar uma máscara booleana sobre o DataFrame inteiro a cada
+rerun, os filtros viram um WHERE executado pelo DuckDB sobre o Parquet,
+o dataset particionado ou o Arrow IPC do cache de uploads. Projeção e
+predicados descem até o leitor (row groups e partições são pulados) e só as
+linhas que passam no filtro chegam ao pandas, então o catálogo pode ser
+maior que a memória.
+
+Os row groups só são pulados em Parquet com estatísticas úteis, como a cópia
+indexada dos uploads (`indice.gravar_indexado`); nela, as linhas voltam na
+ordem original pela coluna `COLUNA_POSICAO`, que não aparece no resultado.
+
+Sem o pacote `duckdb` instalado, `DUCKDB_DISPONIVEL` é False e as páginas
+seguem com o filtro em pandas.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from .esquema import COLUNA_ID
+from .incremental import listar_fragmentos
+from .indice import COLUNA_POSICAO
+
+try:
+    import duckdb
+except ImportError:  # backend opcional
+    duckdb = None
+
+DUCKDB_DISPONIVEL = duckdb is not None
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def _identificador(nome) -> str:
+    """Nome de coluna entre aspas duplas (as colunas têm espaços e pontos)."""
+    return '"' + str(nome).replace('"', '""') + '"'
+
+
+def _literal(texto) -> str:
+    return "'" + str(texto).replace("'", "''") + "'"
+
+
+def _conectar(fonte):
+    """
+    Conexão em memória com a fonte registrada como a view `dados`.
+
+    Parquet e datasets são lidos pelo leitor nativo do DuckDB; o Arrow IPC
+    do cache é registrado como dataset pyarrow (o DuckDB empurra projeção e
+    filtros para o scanner do Arrow).
+    """
+    if not DUCKDB_DISPONIVEL:
+        raise ImportError("Instale o pacote 'duckdb' para usar o backend SQL.")
+
+    fonte = Path(fonte)
+    con = duckdb.connect()
+
+    if fonte.is_dir():
+        caminho = _literal(fonte / "**" / "*.parquet")
+        con.execute(f"CREATE VIEW dados AS SELECT * FROM read_parquet({caminho}, hive_partitioning = true)")
+    elif fonte.suffix.lower() == ".parquet":
+        fragmentos = listar_fragmentos(fonte)
+        if not fragmentos:
+            con.execute(f"CREATE VIEW dados AS SELECT * FROM read_parquet({_literal(fonte)})")
+        else:
+            # Fragmentos de upsert: vale a versão mais nova de cada ID (ver incremental.py)
+            arquivos = ", ".join(_literal(p) for p in [fonte, *fragmentos])
+            con.execute(f"""
+                CREATE VIEW dados AS
+                SELECT * EXCLUDE (filename)
+                FROM read_parquet([{arquivos}], filename = true, union_by_name = true)
+                QUALIFY row_number() OVER (
+                    PARTITION BY {_identificador(COLUNA_ID)}
+                    ORDER BY filename = {_literal(fonte)}, filename DESC
+                ) = 1
+            """)
+    else:
+        con.register("dados", ds.dataset(fonte, format="ipc"))
+    return con
+
+
+def _where(coluna_texto=None, valores=None, faixas=None) -> tuple[str, list]:
+    """Cláusula WHERE parametrizada: `coluna_texto IN valores` e um BETWEEN por faixa."""
+    condicoes, parametros = [], []
+    if coluna_texto is not None and valores:
+        condicoes.append(f"{_identificador(coluna_texto)} IN ({', '.join('?' * len(valores))})")
+        parametros += [str(v) for v in valores]
+    for coluna, (minimo, maximo) in (faixas or {}).items():
+        condicoes.append(f"{_identificador(coluna)} BETWEEN ? AND ?")
+        parametros += [float(minimo), float(maximo)]
+    return (" WHERE " + " AND ".join(condicoes)) if condicoes else "", parametros
+
+
+def _tem_posicao(con) -> bool:
+    colunas = [d[0] for d in con.execute("SELECT * FROM dados LIMIT 0").description]
+    return COLUNA_POSICAO in colunas
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def filtrar(fonte, coluna_texto=None, valores=None, faixas=None, colunas=None) -> pd.DataFrame:
+    """
+    Linhas da fonte que passam nos filtros, executados em SQL.
+
+    Mesma semântica da máscara do Filtros.py: `coluna_texto IN valores`
+    (ignorado se `valores` estiver vazio) e, para cada coluna de `faixas`,
+    `mínimo <= valor <= máximo` (nulos ficam de fora).
+    """
+    selecao = ", ".join(map(_identificador, colunas)) if colunas else "*"
+    where, parametros = _where(coluna_texto, valores, faixas)
+    with _conectar(fonte) as con:
+        ordem = ""
+        if _tem_posicao(con):
+            posicao = _identificador(COLUNA_POSICAO)
+            selecao = selecao if colunas else f"* EXCLUDE ({posicao})"
+            ordem = f" ORDER BY {posicao}"
+        return con.execute(f"SELECT {selecao} FROM dados{where}{ordem}", parametros).df()
+
+
+def contar(fonte, coluna_texto=None, valores=None, faixas=None) -> int:
+    """Quantidade de linhas que passam nos filtros, sem trazê-las para o pandas."""
+    where, parametros = _where(coluna_texto, valores, faixas)
+    with _conectar(fonte) as con:
+        return con.execute(f"SELECT count(*) FROM dados{where}", parametros).fetchone()[0]
+
+
+def _sem_nan(coluna) -> str:
+    """
+    Filtro de agregado que descarta NaN.
+
+    No Arrow do cache, floats ausentes são NaN (não NULL) e o DuckDB ordena
+    NaN acima de qualquer número: sem o filtro, `max` viraria NaN.
+    """
+    return f"FILTER (WHERE NOT isnan(CAST({_identificador(coluna)} AS DOUBLE)))"
+
+
+def faixas_numericas(fonte, colunas) -> dict:
+    """
+    Mínimo e máximo de cada coluna em uma única varredura (limites dos sliders).
+
+    Nulos e NaN ficam de fora, como em `Series.min()`/`max()` do pandas.
+    """
+    colunas = list(colunas)
+    if not colunas:
+        return {}
+    agregados = ", ".join(
+        f"min({_identificador(c)}) {_sem_nan(c)}, max({_identificador(c)}) {_sem_nan(c)}"
+        for c in colunas
+    )
+    with _conectar(fonte) as con:
+        linha = con.execute(f"SELECT {agregados} FROM dados").fetchone()
+    return {c: (linha[2 * i], linha[2 * i + 1]) for i, c in enumerate(colunas)}
+
+
+def valores_distintos(fonte, coluna) -> list:
+    """Valores distintos (não nulos) de uma coluna, ordenados."""
+    col = _identificador(coluna)
+    with _conectar(fonte) as con:
+        linhas = con.execute(f"SELECT DISTINCT {col} FROM dados WHERE {col} IS NOT NULL ORDER BY 1").fetchall()
+    return [v for (v,) in linhas]
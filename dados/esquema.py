@@ -0,0 +1,106 @@
+"""
+esquema.py
+----------
+Esquema da tabela de alimentos (food.csv).
+
+Declara as 48 colunas do dataset e os tipos usados por todos os pontos de
+entrada, para que CSV, XLSX e Parquet produzam o mesmo DataFrame tipado.
+"""
+
+# ===============================================
+# 🏷️ COLUNAS DE IDENTIFICAÇÃO
+# ===============================================
+COLUNA_CATEGORIA = "Category"
+COLUNA_DESCRICAO = "Description"
+COLUNA_ID = "Nutrient Data Bank Number"
+
+# Descrições das medidas caseiras ("1 cup", "1 tbsp"): únicas colunas Data.* textuais
+COLUNAS_TEXTO_PORCAO = [
+    "Data.Household Weights.1st Household Weight Description",
+    "Data.Household Weights.2nd Household Weight Description",
+]
+
+# Peso em gramas de cada medida caseira, na mesma ordem das descrições
+COLUNAS_PESO_PORCAO = [
+    "Data.Household Weights.1st Household Weight",
+    "Data.Household Weights.2nd Household Weight",
+]
+
+# ===============================================
+# 📋 ORDEM CANÔNICA DAS 48 COLUNAS
+# ===============================================
+COLUNAS = [
+    COLUNA_CATEGORIA,
+    COLUNA_DESCRICAO,
+    COLUNA_ID,
+    "Data.Alpha Carotene",
+    "Data.Ash",
+    "Data.Beta Carotene",
+    "Data.Beta Cryptoxanthin",
+    "Data.Carbohydrate",
+    "Data.Cholesterol",
+    "Data.Choline",
+    "Data.Fiber",
+    "Data.Kilocalories",
+    "Data.Lutein and Zeaxanthin",
+    "Data.Lycopene",
+    "Data.Manganese",
+    "Data.Niacin",
+    "Data.Pantothenic Acid",
+    "Data.Protein",
+    "Data.Refuse Percentage",
+    "Data.Retinol",
+    "Data.Riboflavin",
+    "Data.Selenium",
+    "Data.Sugar Total",
+    "Data.Thiamin",
+    "Data.Water",
+    "Data.Fat.Monosaturated Fat",
+    "Data.Fat.Polysaturated Fat",
+    "Data.Fat.Saturated Fat",
+    "Data.Fat.Total Lipid",
+    COLUNAS_PESO_PORCAO[0],
+    COLUNAS_TEXTO_PORCAO[0],
+    COLUNAS_PESO_PORCAO[1],
+    COLUNAS_TEXTO_PORCAO[1],
+    "Data.Major Minerals.Calcium",
+    "Data.Major Minerals.Copper",
+    "Data.Major Minerals.Iron",
+    "Data.Major Minerals.Magnesium",
+    "Data.Major Minerals.Phosphorus",
+    "Data.Major Minerals.Potassium",
+    "Data.Major Minerals.Sodium",
+    "Data.Major Minerals.Zinc",
+    "Data.Vitamins.Vitamin A - IU",
+    "Data.Vitamins.Vitamin A - RAE",
+    "Data.Vitamins.Vitamin B12",
+    "Data.Vitamins.Vitamin B6",
+    "Data.Vitamins.Vitamin C",
+    "Data.Vitamins.Vitamin E",
+    "Data.Vitamins.Vitamin K",
+]
+
+COLUNAS_NUMERICAS = [
+    c for c in COLUNAS if c.startswith("Data.") and c not in COLUNAS_TEXTO_PORCAO
+]
+
+# Nutrientes por 100 g (sem as medidas caseiras)
+COLUNAS_NUTRIENTES = [c for c in COLUNAS_NUMERICAS if "Household" not in c]
+
+# Chaves de ordenação do Parquet: filtros por faixa nelas pulam row groups
+COLUNAS_ORDENACAO = ["Data.Kilocalories", "Data.Protein"]
+
+# ===============================================
+# 🔢 TIPOS
+# ===============================================
+# Texto livre em buffers Arrow (sem um objeto Python por célula); Category
+# continua como category (codificada em dicionário).
+TIPO_TEXTO = "string[pyarrow]"
+
+TIPOS = {
+    COLUNA_CATEGORIA: "category",
+    COLUNA_DESCRICAO: TIPO_TEXTO,
+    COLUNA_ID: "Int32",
+    **{c: "float32" for c in COLUNAS_NUMERICAS},
+    **{c: TIPO_TEXTO for c in COLUNAS_TEXTO_PORCAO},
+}
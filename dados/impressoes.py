@@ -0,0 +1,98 @@
+"""
+impressoes.py
+-------------
+Impressões digitais por linha: hash de 64 bits e contagem de nulos.
+
+Duplicatas e nulos do resumo do dashboard exigiam varrer a tabela inteira
+a cada rerun (`df.duplicated()` e `df.isna()`). Aqui as duas coisas são
+calculadas uma vez por versão do dataset e gravadas ao lado dela; depois o
+resumo, a lista de duplicatas e a comparação do upsert leem só essas duas
+colunas pequenas.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+HASH = "_hash"
+NULOS = "_nulos"
+
+
+# ===============================================
+# 🧮 CÁLCULO
+# ===============================================
+
+def hash_linhas(df: pd.DataFrame) -> pd.Series:
+    """Hash de 64 bits do conteúdo de cada linha (o índice não entra)."""
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+def impressoes_linhas(df: pd.DataFrame) -> pd.DataFrame:
+    """Hash e número de nulos de cada linha, na ordem do DataFrame."""
+    return pd.DataFrame({
+        HASH: hash_linhas(df).to_numpy(),
+        NULOS: df.isna().sum(axis=1).to_numpy(dtype="int32"),
+    })
+
+
+def resumo_impressoes(impressoes: pd.DataFrame) -> dict:
+    """Linhas, nulos e duplicatas (mesma contagem de `df.duplicated().sum()`)."""
+    return {
+        "linhas": len(impressoes),
+        "nulos": int(impressoes[NULOS].sum()),
+        "duplicadas": int(impressoes[HASH].duplicated().sum()),
+    }
+
+
+def posicoes_duplicadas(impressoes: pd.DataFrame) -> np.ndarray:
+    """Posições de todas as ocorrências de linhas repetidas, agrupadas pela impressão."""
+    repetidas = impressoes[HASH].duplicated(keep=False).to_numpy()
+    posicoes = np.flatnonzero(repetidas)
+    return posicoes[np.argsort(impressoes[HASH].to_numpy()[repetidas], kind="stable")]
+
+
+def impressao_dataset(df: pd.DataFrame, impressoes: pd.DataFrame | None = None) -> str:
+    """
+    Impressão do dataset inteiro: hashes das linhas + nomes e tipos das colunas.
+
+    Com as impressões por linha já calculadas, custa só um SHA-256 sobre
+    8 bytes por linha.
+    """
+    impressoes = impressoes_linhas(df) if impressoes is None else impressoes
+    digest = hashlib.sha256(impressoes[HASH].to_numpy().tobytes())
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    return digest.hexdigest()
+
+
+# ===============================================
+# 💾 GRAVADAS AO LADO DO DATASET
+# ===============================================
+
+def caminho_impressoes(arquivo) -> Path:
+    """Arquivo das impressões de um dataset (<sha>.arrow → <sha>.impressoes.parquet)."""
+    return Path(arquivo).with_suffix(".impressoes.parquet")
+
+
+def gravar_impressoes(df: pd.DataFrame, arquivo) -> pd.DataFrame:
+    """Calcula as impressões de `df` e grava ao lado de `arquivo`."""
+    impressoes = impressoes_linhas(df)
+    destino = caminho_impressoes(arquivo)
+    temporario = destino.with_suffix(".tmp")
+    impressoes.to_parquet(temporario, index=False)
+    temporario.replace(destino)
+    return impressoes
+
+
+def carregar_impressoes(df: pd.DataFrame, arquivo) -> pd.DataFrame:
+    """Impressões gravadas para `arquivo`; calculadas a partir de `df` se ainda não existirem."""
+    caminho = caminho_impressoes(arquivo)
+    if caminho.exists():
+        impressoes = pd.read_parquet(caminho)
+        if len(impressoes) == len(df):
+            return impressoes
+    return gravar_impressoes(df, arquivo)
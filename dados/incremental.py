@@ -0,0 +1,211 @@
+"""
+incremental.py
+--------------
+Atualização incremental (upsert) do Parquet de alimentos.
+
+Um arquivo delta (CSV/XLSX/Parquet) é deduplicado pelo Nutrient Data Bank
+Number e só as linhas novas ou alteradas são gravadas como um fragmento
+Parquet em `<stem>_fragmentos/`, ao lado do Parquet base. O custo de cada
+atualização é proporcional ao delta, não ao catálogo.
+
+Na leitura, fragmentos mais novos substituem as linhas de mesmo ID da base
+(e dos fragmentos anteriores). Quando os fragmentos se acumulam, eles são
+consolidados de volta em um único Parquet.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .esquema import COLUNA_CATEGORIA, COLUNA_ID, COLUNAS
+from .impressoes import hash_linhas
+from .indice import filtros_faixas, mascara_faixas, ordenar, tamanho_row_group
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+SUFIXO_FRAGMENTOS = "_fragmentos"
+
+# Consolida automaticamente a partir deste número de fragmentos
+LIMITE_FRAGMENTOS = 10
+
+
+# ===============================================
+# 🗂️ FRAGMENTOS
+# ===============================================
+
+def caminho_fragmentos(parquet) -> Path:
+    """Diretório de fragmentos de um Parquet (food.parquet → food_fragmentos/)."""
+    parquet = Path(parquet)
+    return parquet.with_name(parquet.with_suffix("").name + SUFIXO_FRAGMENTOS)
+
+
+def listar_fragmentos(parquet) -> list[Path]:
+    """Fragmentos do mais antigo para o mais novo (o nome carrega o carimbo de tempo)."""
+    pasta = caminho_fragmentos(parquet)
+    if not pasta.is_dir():
+        return []
+    return sorted(pasta.glob("fragmento-*.parquet"))
+
+
+def ler_com_fragmentos(parquet, colunas=None, categorias=None, ids=None, faixas=None) -> pd.DataFrame:
+    """
+    Lê o Parquet base aplicando os fragmentos por cima.
+
+    `categorias`, `ids` e `faixas` viram filtros empurrados para o leitor;
+    os fragmentos são lidos sem os filtros de categoria e faixa, para que
+    uma linha alterada não deixe a versão antiga aparecer.
+    """
+    parquet = Path(parquet)
+    fragmentos = listar_fragmentos(parquet)
+    filtro_ids = [(COLUNA_ID, "in", list(ids))] if ids is not None else []
+    filtros = filtro_ids + ([(COLUNA_CATEGORIA, "in", list(categorias))] if categorias else [])
+    filtros += filtros_faixas(faixas)
+
+    if not fragmentos:
+        return pd.read_parquet(parquet, columns=colunas, filters=filtros or None)
+
+    leitura = None
+    if colunas is not None:
+        extras = [COLUNA_ID] + ([COLUNA_CATEGORIA] if categorias else []) + list(faixas or {})
+        leitura = list(colunas) + [c for c in extras if c not in colunas]
+
+    novos = pd.concat(
+        [pd.read_parquet(f, columns=leitura, filters=filtro_ids or None) for f in fragmentos],
+        ignore_index=True,
+    ).drop_duplicates(COLUNA_ID, keep="last")
+    substituidos = novos[COLUNA_ID]
+    if categorias:
+        novos = novos[novos[COLUNA_CATEGORIA].isin(categorias)]
+    novos = novos[mascara_faixas(novos, faixas)]
+
+    partes = [novos]
+    if parquet.exists():
+        base = pd.read_parquet(parquet, columns=leitura, filters=filtros or None)
+        partes.insert(0, base[~base[COLUNA_ID].isin(substituidos)])
+
+    df = pd.concat(partes, ignore_index=True)
+    return df[list(colunas)] if colunas is not None else df
+
+
+# ===============================================
+# 🔄 UPSERT E CONSOLIDAÇÃO
+# ===============================================
+
+def _linhas_alteradas(delta: pd.DataFrame, atual: pd.DataFrame) -> pd.DataFrame:
+    """
+    Linhas do delta que não existem em `atual` ou diferem em alguma coluna.
+
+    A comparação é pela impressão de 64 bits de cada linha (ver
+    `impressoes.py`), sem comparar célula a célula.
+    """
+    if atual.empty:
+        return delta
+    atual = atual.drop_duplicates(COLUNA_ID, keep="last")
+    colunas = list(delta.columns)
+    hash_atual = pd.Series(
+        hash_linhas(atual.reindex(columns=colunas)).to_numpy(),
+        index=atual[COLUNA_ID].to_numpy(),
+    )
+
+    ids = delta[COLUNA_ID]
+    existia = ids.isin(hash_atual.index).to_numpy()
+    iguais = np.zeros(len(delta), dtype=bool)
+    iguais[existia] = hash_linhas(delta).to_numpy()[existia] == hash_atual.loc[ids[existia]].to_numpy()
+    return delta[~iguais]
+
+
+def gravar_fragmento(df: pd.DataFrame, parquet, compression: str = "snappy") -> Path:
+    """Grava `df` como o fragmento mais novo do Parquet."""
+    pasta = caminho_fragmentos(parquet)
+    pasta.mkdir(parents=True, exist_ok=True)
+    caminho = pasta / f"fragmento-{datetime.now():%Y%m%d-%H%M%S-%f}.parquet"
+    temporario = caminho.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), temporario, compression=compression)
+    temporario.replace(caminho)
+    return caminho
+
+
+def consolidar(parquet, compression: str = "snappy") -> int:
+    """
+    Reescreve base + fragmentos como um único Parquet e apaga os fragmentos.
+
+    Retorna o número de linhas do Parquet consolidado.
+    """
+    # Importação tardia: carregamento.py depende deste módulo
+    from .carregamento import aplicar_esquema
+
+    parquet = Path(parquet)
+    fragmentos = listar_fragmentos(parquet)
+    if not fragmentos:
+        return pq.ParquetFile(parquet).metadata.num_rows if parquet.exists() else 0
+
+    df = ordenar(aplicar_esquema(ler_com_fragmentos(parquet)))
+    temporario = parquet.with_suffix(".tmp")
+    df.to_parquet(temporario, index=False, compression=compression, row_group_size=tamanho_row_group(len(df)))
+    temporario.replace(parquet)
+
+    for f in fragmentos:
+        f.unlink()
+    return len(df)
+
+
+def upsert(delta, parquet, compression: str = "snappy",
+           limite_fragmentos: int = LIMITE_FRAGMENTOS) -> dict:
+    """
+    Aplica um arquivo delta ao Parquet, gravando só linhas novas ou alteradas.
+
+    Cada linha do delta substitui por inteiro a linha de mesmo Nutrient Data
+    Bank Number; dentro do delta, vale a última ocorrência. Só as linhas do
+    catálogo com esses IDs são lidas para comparação. Retorna um resumo com
+    contagens e se houve consolidação.
+    """
+    from .carregamento import aplicar_esquema, ler_arquivo
+    from .validacao import validar_tabela
+
+    parquet = Path(parquet)
+    bruto = ler_arquivo(Path(delta))
+    # Delta malformado é rejeitado antes de tocar no catálogo
+    validar_tabela(bruto, [c for c in bruto.columns if c in COLUNAS])
+    delta = aplicar_esquema(bruto)
+    if COLUNA_ID not in delta.columns:
+        raise ValueError(f"O delta precisa da coluna '{COLUNA_ID}'.")
+    delta = delta.dropna(subset=[COLUNA_ID]).drop_duplicates(COLUNA_ID, keep="last")
+
+    existe = parquet.exists() or bool(listar_fragmentos(parquet))
+    atual = pd.DataFrame()
+    if existe:
+        colunas = pq.read_schema(parquet).names if parquet.exists() else list(delta.columns)
+        faltando = [c for c in colunas if c not in delta.columns]
+        if faltando:
+            raise ValueError(f"Colunas ausentes no delta: {faltando}")
+        delta = delta[colunas + [c for c in delta.columns if c not in colunas]]
+        atual = aplicar_esquema(ler_com_fragmentos(parquet, ids=delta[COLUNA_ID].tolist()))
+
+    alteradas = _linhas_alteradas(delta, atual)
+    novas = int((~alteradas[COLUNA_ID].isin(atual.get(COLUNA_ID, []))).sum())
+    resumo = {
+        "linhas_delta": len(delta),
+        "novas": novas,
+        "alteradas": len(alteradas) - novas,
+        "fragmento": None,
+        "consolidado": False,
+    }
+
+    if alteradas.empty:
+        return resumo
+
+    if not existe:
+        # Primeira carga: o delta já é a base
+        alteradas.to_parquet(parquet, index=False, compression=compression)
+        return resumo
+
+    resumo["fragmento"] = gravar_fragmento(alteradas, parquet, compression)
+    if len(listar_fragmentos(parquet)) >= limite_fragmentos:
+        consolidar(parquet, compression)
+        resumo["consolidado"] = True
+    return resumo
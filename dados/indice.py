@@ -0,0 +1,161 @@
+"""
+indice.py
+---------
+Layout do Parquet para filtros por faixa numérica.
+
+Gravando as linhas agrupadas pelos nutrientes mais filtrados (calorias e
+proteína) em row groups pequenos, o min/max que o Parquet guarda por row
+group vira um índice: um filtro `Data.Kilocalories BETWEEN 50 AND 80` só
+precisa abrir os poucos row groups cuja faixa cruza o intervalo. O pyarrow
+e o DuckDB fazem esse salto sozinhos quando recebem o filtro.
+
+A ordem é a da curva Z (Morton): os postos de cada coluna-chave têm os bits
+intercalados, então cada row group cobre uma faixa estreita de *todas* as
+colunas-chave. Uma ordenação lexicográfica por [calorias, proteína] só
+agruparia as calorias; a proteína ficaria espalhada por quase todos os row
+groups.
+
+`gravar_indexado` grava nesse layout a cópia Parquet dos uploads que a
+página de Filtros consulta em SQL (o Arrow IPC do cache não tem estatísticas
+por bloco), guardando a posição original de cada linha em `COLUNA_POSICAO`.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .esquema import COLUNAS_ORDENACAO
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+# Row groups por arquivo (pelo menos) e limites de tamanho de cada um
+MIN_ROW_GROUPS = 32
+ROW_GROUP_MIN = 1_000
+ROW_GROUP_MAX = 100_000
+
+# Bits do posto de cada coluna na chave Z (até 4 colunas cabem em 64 bits)
+BITS_CHAVE = 16
+
+# Posição da linha no arquivo original (o SQL devolve as linhas nessa ordem)
+COLUNA_POSICAO = "__posicao"
+
+
+# ===============================================
+# ✍️ ESCRITA
+# ===============================================
+
+def chave_z(df: pd.DataFrame, colunas) -> np.ndarray:
+    """
+    Chave da curva Z das `colunas`: posto de cada uma em `BITS_CHAVE` bits, intercalados.
+
+    Nulos ficam com o maior posto (vão para o fim, como `na_position="last"`).
+    """
+    bits = min(BITS_CHAVE, 64 // max(len(colunas), 1))
+    escala = (1 << bits) - 1
+    chave = np.zeros(len(df), dtype="uint64")
+    for j, coluna in enumerate(colunas):
+        postos = df[coluna].rank(method="min", pct=True, na_option="keep").to_numpy("float64", na_value=np.nan)
+        postos = np.where(np.isnan(postos), escala, np.floor(postos * escala)).astype("uint64")
+        for b in range(bits):
+            chave |= ((postos >> np.uint64(b)) & np.uint64(1)) << np.uint64(b * len(colunas) + j)
+    return chave
+
+
+def ordenar(df: pd.DataFrame, colunas=COLUNAS_ORDENACAO) -> pd.DataFrame:
+    """Ordena pela curva Z das colunas-chave presentes para estreitar o min/max de cada row group."""
+    chaves = [c for c in colunas if c in df.columns]
+    if not chaves:
+        return df
+    ordem = np.argsort(chave_z(df, chaves), kind="stable")
+    return df.take(ordem).reset_index(drop=True)
+
+
+def tamanho_row_group(linhas: int) -> int:
+    """Row group pequeno o bastante para haver o que pular, sem fragmentar demais."""
+    return max(ROW_GROUP_MIN, min(ROW_GROUP_MAX, linhas // MIN_ROW_GROUPS))
+
+
+def colunas_chave(df: pd.DataFrame) -> list:
+    """`COLUNAS_ORDENACAO` presentes; em outras tabelas, as duas primeiras colunas numéricas."""
+    chaves = [c for c in COLUNAS_ORDENACAO if c in df.columns]
+    return chaves or list(df.select_dtypes("number").columns[:2])
+
+
+def gravar_indexado(df: pd.DataFrame, destino, colunas=None) -> Path:
+    """
+    Parquet em curva Z e row groups pequenos, com a posição de cada linha.
+
+    `colunas` são as chaves da ordenação (padrão: `colunas_chave`). A
+    gravação é atômica, como a do Arrow do cache.
+    """
+    destino = Path(destino)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    posicionado = df.assign(**{COLUNA_POSICAO: np.arange(len(df), dtype="int64")})
+    ordenado = ordenar(posicionado, colunas_chave(df) if colunas is None else colunas)
+    temporario = destino.with_name(destino.name + ".tmp")
+    ordenado.to_parquet(temporario, index=False, row_group_size=tamanho_row_group(len(ordenado)))
+    temporario.replace(destino)
+    return destino
+
+
+# ===============================================
+# 🔍 LEITURA
+# ===============================================
+
+def filtros_faixas(faixas) -> list[tuple]:
+    """Faixas `{coluna: (mín, máx)}` no formato de `filters` do pandas/pyarrow (None = sem limite)."""
+    filtros = []
+    for coluna, (minimo, maximo) in (faixas or {}).items():
+        if minimo is not None:
+            filtros.append((coluna, ">=", minimo))
+        if maximo is not None:
+            filtros.append((coluna, "<=", maximo))
+    return filtros
+
+
+def mascara_faixas(df: pd.DataFrame, faixas) -> pd.Series:
+    """Mesmas faixas aplicadas em memória (fontes sem estatísticas, como CSV)."""
+    mascara = pd.Series(True, index=df.index)
+    for coluna, (minimo, maximo) in (faixas or {}).items():
+        if minimo is not None:
+            mascara &= df[coluna] >= minimo
+        if maximo is not None:
+            mascara &= df[coluna] <= maximo
+    return mascara
+
+
+def estatisticas_row_groups(parquet, colunas=COLUNAS_ORDENACAO) -> pd.DataFrame:
+    """Min/max por row group, direto dos metadados (nenhum dado é lido)."""
+    metadados = pq.ParquetFile(parquet).metadata
+    nomes = metadados.schema.names
+    linhas = []
+    for i in range(metadados.num_row_groups):
+        grupo = metadados.row_group(i)
+        linha = {"row_group": i, "linhas": grupo.num_rows}
+        for coluna in colunas:
+            if coluna not in nomes:
+                continue
+            stats = grupo.column(nomes.index(coluna)).statistics
+            tem = stats is not None and stats.has_min_max
+            linha[f"{coluna} min"] = stats.min if tem else None
+            linha[f"{coluna} max"] = stats.max if tem else None
+        linhas.append(linha)
+    return pd.DataFrame(linhas)
+
+
+def row_groups_relevantes(parquet, faixas) -> list[int]:
+    """Row groups que podem ter linhas dentro das faixas (os demais são pulados na leitura)."""
+    stats = estatisticas_row_groups(parquet, list(faixas))
+    relevantes = pd.Series(True, index=stats.index)
+    for coluna, (minimo, maximo) in faixas.items():
+        if f"{coluna} min" not in stats:
+            continue
+        # Sem estatística (NaN), a comparação é falsa e o row group é lido
+        if minimo is not None:
+            relevantes &= ~(pd.to_numeric(stats[f"{coluna} max"]) < minimo)
+        if maximo is not None:
+            relevantes &= ~(pd.to_numeric(stats[f"{coluna} min"]) > maximo)
+    return stats.loc[relevantes, "row_group"].tolist()
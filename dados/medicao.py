@@ -0,0 +1,165 @@
+"""
+medicao.py
+----------
+Leitores por formato e medições de leitura (tempo e pico de memória).
+
+Usado pelo `Benchmark_Formatos.py` e pelo resumo do `Convert_Parquet.py`.
+Os leitores são funções de módulo porque o pico de memória é medido em um
+processo novo (spawn), que precisa importá-los. Esse processo tem prazo:
+se travar ou morrer (ex.: sem memória), a medição volta None em vez de
+prender o benchmark.
+"""
+
+import gc
+import multiprocessing as mp
+import os
+import queue
+import statistics
+import sys
+import time
+
+import pandas as pd
+import pyarrow.feather as feather
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+REPETICOES = 5
+
+# Segundos para o subprocesso da medição de memória devolver o resultado
+TEMPO_LIMITE_MEMORIA = 300
+
+
+# ===============================================
+# 📖 LEITORES
+# ===============================================
+
+def ler_csv(caminho, colunas=None):
+    return pd.read_csv(caminho, usecols=colunas)
+
+
+def ler_parquet(caminho, colunas=None):
+    return pd.read_parquet(caminho, columns=colunas)
+
+
+def ler_feather(caminho, colunas=None):
+    return pd.read_feather(caminho, columns=colunas)
+
+
+def ler_arrow_ipc(caminho, colunas=None):
+    return feather.read_table(caminho, columns=colunas, memory_map=True).to_pandas()
+
+
+LEITORES = {
+    "csv": ler_csv,
+    "parquet": ler_parquet,
+    "feather": ler_feather,
+    "arrow_ipc": ler_arrow_ipc,
+}
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def descartar_cache(caminho) -> bool:
+    """Pede ao SO para tirar o arquivo do page cache (leitura fria). False se não suportado."""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(caminho, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def _rss_pico() -> int:
+    import resource
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def _medir_pico(fila, formato, caminho, colunas):
+    """Executado em subprocesso: pico de RSS causado só pela leitura."""
+    base = _rss_pico()
+    LEITORES[formato](caminho, colunas)
+    fila.put(_rss_pico() - base)
+
+
+def _receber(fila, proc, tempo_limite: float):
+    """Valor enviado pelo subprocesso; None se ele sair sem enviar ou passar do prazo."""
+    prazo = time.monotonic() + tempo_limite
+    while time.monotonic() < prazo:
+        try:
+            return fila.get(timeout=0.5)
+        except queue.Empty:
+            if not proc.is_alive():
+                # Pode ter enviado logo antes de sair
+                try:
+                    return fila.get(timeout=0.5)
+                except queue.Empty:
+                    return None
+    return None
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def medir_leitura(leitor, caminho, colunas=None, repeticoes: int = REPETICOES, frio: bool = False) -> dict:
+    """
+    Mede o tempo de leitura em várias repetições.
+
+    Com `frio=True`, o arquivo sai do page cache antes de cada repetição
+    (quando o SO permite; ver `cache_descartado`); caso contrário, uma
+    leitura de aquecimento é descartada.
+    """
+    descartado = frio and descartar_cache(caminho)
+    if not descartado:
+        leitor(caminho, colunas)
+
+    tempos = []
+    for _ in range(repeticoes):
+        if descartado:
+            descartar_cache(caminho)
+        gc.collect()
+        inicio = time.perf_counter()
+        leitor(caminho, colunas)
+        tempos.append(time.perf_counter() - inicio)
+
+    return {
+        "tempo_mediana_s": statistics.median(tempos),
+        "tempo_min_s": min(tempos),
+        "tempo_max_s": max(tempos),
+        "repeticoes": repeticoes,
+        "cache_descartado": descartado,
+    }
+
+
+def medir_pico_memoria(formato: str, caminho, colunas=None,
+                       tempo_limite: float = TEMPO_LIMITE_MEMORIA) -> float | None:
+    """
+    Pico de memória (MB) de uma leitura isolada em um processo novo.
+
+    None se não houver `resource` (Windows), se o processo terminar com erro
+    ou se não responder em `tempo_limite` segundos (é encerrado).
+    """
+    try:
+        import resource  # noqa: F401  (indisponível no Windows)
+    except ImportError:
+        return None
+    ctx = mp.get_context("spawn")
+    fila = ctx.Queue()
+    proc = ctx.Process(target=_medir_pico, args=(fila, formato, str(caminho), colunas))
+    proc.start()
+    delta = _receber(fila, proc, tempo_limite)
+    # Depois de enviar o resultado o processo só precisa sair
+    proc.join(timeout=5)
+    if proc.is_alive():
+        proc.terminate()
+        proc.join()
+    if delta is None or proc.exitcode != 0:
+        return None
+    return delta / (1024 * 1024)
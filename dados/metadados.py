@@ -0,0 +1,107 @@
+"""
+metadados.py
+------------
+Metadados de colunas derivados do DataFrame, calculados uma vez por dataset.
+
+Todas as páginas do dashboard repetiam a cada rerun o mesmo trabalho:
+`select_dtypes` para separar colunas numéricas e textuais, detecção de
+colunas booleanas e a heurística da coluna de descrição.
+Aqui isso é calculado uma vez por impressão do dataset (ver
+`impressoes.impressao_dataset`) e servido de um cache do processo,
+compartilhado entre páginas e sessões.
+"""
+
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+# Datasets diferentes mantidos no cache (os mais antigos saem primeiro)
+MAX_DATASETS = 16
+
+TIPOS_TEXTO = ["object", "string", "category"]
+
+# Partes de nome que indicam a coluna de descrição dos itens
+PALAVRAS_DESCRICAO = ["alimento", "nome", "produto", "categoria", "descr", "item", "food"]
+
+# Pares de valores tratados como booleanos
+PARES_BOOLEANOS = [
+    {0, 1}, {True, False},
+    {'0', '1'}, {'S', 'N'}, {'s', 'n'},
+    {'Sim', 'Não'}, {'sim', 'não'}, {'SIM', 'NÃO'},
+    {'Y', 'N'}, {'y', 'n'}, {'Yes', 'No'}, {'yes', 'no'},
+]
+
+_CACHE: OrderedDict = OrderedDict()
+_TRAVA = threading.Lock()
+
+
+# ===============================================
+# 🧮 CÁLCULO
+# ===============================================
+
+def colunas_booleanas(df: pd.DataFrame) -> list:
+    """Colunas bool ou com exatamente dois valores de um par booleano conhecido (0/1, S/N, Sim/Não...)."""
+    booleanas = []
+    for nome in df.columns:
+        serie = df[nome]
+        if serie.dtype == "bool":
+            booleanas.append(nome)
+            continue
+        valores = serie.dropna().unique()
+        if len(valores) == 2 and set(valores) in PARES_BOOLEANOS:
+            booleanas.append(nome)
+    return booleanas
+
+
+def calcular_metadados(df: pd.DataFrame) -> dict:
+    """
+    Metadados das colunas de `df`.
+
+    Chaves: `colunas`, `numericas`, `texto`, `booleanas`, `datas` e
+    `descricao` (colunas de texto cujo nome sugere a descrição dos itens).
+    """
+    def tipos(incluir):
+        return df.select_dtypes(include=incluir).columns.tolist()
+
+    texto = tipos(TIPOS_TEXTO)
+    return {
+        "colunas": df.columns.tolist(),
+        "numericas": tipos(["number"]),
+        "texto": texto,
+        "booleanas": colunas_booleanas(df),
+        "datas": tipos(["datetime"]),
+        "descricao": [c for c in texto if any(p in str(c).lower() for p in PALAVRAS_DESCRICAO)],
+    }
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def metadados_colunas(df: pd.DataFrame, impressao: str | None = None) -> dict:
+    """
+    Metadados de `df`, servidos do cache quando `impressao` já foi vista.
+
+    Sem `impressao`, calcula na hora (nada é guardado). O dicionário
+    devolvido é uma cópia: a página pode alterar as listas à vontade.
+    """
+    if impressao is None:
+        return calcular_metadados(df)
+
+    with _TRAVA:
+        metadados = _CACHE.get(impressao)
+        if metadados is not None:
+            _CACHE.move_to_end(impressao)
+
+    if metadados is None:
+        metadados = calcular_metadados(df)
+        with _TRAVA:
+            _CACHE[impressao] = metadados
+            while len(_CACHE) > MAX_DATASETS:
+                _CACHE.popitem(last=False)
+
+    return {chave: list(valores) for chave, valores in metadados.items()}
@@ -0,0 +1,151 @@
+"""
+modelos.py
+----------
+Registro de modelos ajustados, gravados em disco e carregados sob demanda.
+
+Cada modelo é identificado pelo nome, pela impressão do dataset em que foi
+ajustado (ver `impressoes.impressao_dataset`) e pelos hiperparâmetros. O
+pipeline vai para `.cache/modelos/<chave>.joblib` e uma entrada JSON ao lado
+guarda parâmetros, métricas, tempo de ajuste e data. Enquanto dataset e
+parâmetros não mudam, uma previsão é só carregar e prever: o ajuste acontece
+uma vez, não a cada rerun do Streamlit.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import pandas as pd
+
+from .carregamento import DIR_CACHE
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+DIR_MODELOS = DIR_CACHE / "modelos"
+
+# Modelos mantidos carregados no processo (os menos usados saem primeiro)
+MAX_MODELOS = 8
+
+_CACHE: OrderedDict = OrderedDict()
+_TRAVA = threading.Lock()
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def chave_modelo(nome: str, impressao: str, parametros: dict) -> str:
+    """Chave estável de (nome, dataset, hiperparâmetros), ex.: 'calorias-rf-3f9a…'."""
+    conteudo = json.dumps([nome, impressao, parametros], sort_keys=True, default=str)
+    return f"{nome}-{hashlib.sha256(conteudo.encode()).hexdigest()[:16]}"
+
+
+def caminho_modelo(chave: str) -> Path:
+    """Arquivo do pipeline serializado de uma chave."""
+    return DIR_MODELOS / f"{chave}.joblib"
+
+
+def _caminho_entrada(chave: str) -> Path:
+    return DIR_MODELOS / f"{chave}.json"
+
+
+def _guardar_em_memoria(chave: str, registro: dict) -> None:
+    with _TRAVA:
+        _CACHE[chave] = registro
+        _CACHE.move_to_end(chave)
+        while len(_CACHE) > MAX_MODELOS:
+            _CACHE.popitem(last=False)
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def registrar_modelo(modelo, nome: str, impressao: str, parametros: dict,
+                     metricas: dict | None = None, tempo_ajuste: float | None = None) -> dict:
+    """
+    Grava o pipeline ajustado e sua entrada no registro.
+
+    Retorna a entrada (chave, nome, impressão, parâmetros, métricas, tempo
+    de ajuste em segundos, data) com o próprio modelo em `modelo`.
+    """
+    DIR_MODELOS.mkdir(parents=True, exist_ok=True)
+    chave = chave_modelo(nome, impressao, parametros)
+
+    destino = caminho_modelo(chave)
+    temporario = destino.with_suffix(".tmp")
+    joblib.dump(modelo, temporario)
+    temporario.replace(destino)
+
+    entrada = {
+        "chave": chave,
+        "nome": nome,
+        "impressao": impressao,
+        "parametros": parametros,
+        "metricas": metricas or {},
+        "tempo_ajuste": tempo_ajuste,
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    arquivo = _caminho_entrada(chave)
+    temporario = arquivo.with_suffix(".json.tmp")
+    temporario.write_text(json.dumps(entrada, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+    temporario.replace(arquivo)
+
+    registro = {**entrada, "modelo": modelo}
+    _guardar_em_memoria(chave, registro)
+    return registro
+
+
+def carregar_modelo(nome: str, impressao: str, parametros: dict) -> dict | None:
+    """
+    Entrada registrada com o modelo em `modelo`, ou None se ainda não existe.
+
+    O pipeline só é lido do disco na primeira chamada do processo; depois
+    vem do cache em memória.
+    """
+    chave = chave_modelo(nome, impressao, parametros)
+    with _TRAVA:
+        registro = _CACHE.get(chave)
+        if registro is not None:
+            _CACHE.move_to_end(chave)
+            return registro
+
+    arquivo, entrada = caminho_modelo(chave), _caminho_entrada(chave)
+    if not (arquivo.exists() and entrada.exists()):
+        return None
+    registro = {**json.loads(entrada.read_text(encoding="utf-8")), "modelo": joblib.load(arquivo)}
+    _guardar_em_memoria(chave, registro)
+    return registro
+
+
+def obter_modelo(nome: str, impressao: str, parametros: dict, ajustar) -> dict:
+    """
+    Modelo registrado para (nome, dataset, parâmetros); ajusta e registra se faltar.
+
+    `ajustar()` devolve `(modelo, metricas)` e só é chamada quando não há
+    modelo gravado. A entrada devolvida traz `novo=True` nesse caso.
+    """
+    registro = carregar_modelo(nome, impressao, parametros)
+    if registro is not None:
+        return {**registro, "novo": False}
+
+    inicio = time.perf_counter()
+    modelo, metricas = ajustar()
+    tempo = round(time.perf_counter() - inicio, 3)
+    return {**registrar_modelo(modelo, nome, impressao, parametros, metricas, tempo), "novo": True}
+
+
+def listar_modelos(nome: str | None = None) -> pd.DataFrame:
+    """Uma linha por modelo registrado (sem carregar os pipelines), mais recentes primeiro."""
+    entradas = [json.loads(p.read_text(encoding="utf-8")) for p in DIR_MODELOS.glob("*.json")]
+    if nome is not None:
+        entradas = [e for e in entradas if e["nome"] == nome]
+    if not entradas:
+        return pd.DataFrame(columns=["chave", "nome", "impressao", "parametros", "metricas", "tempo_ajuste", "criado_em"])
+    return pd.DataFrame(entradas).sort_values("criado_em", ascending=False, ignore_index=True)
@@ -0,0 +1,162 @@
+"""
+porcoes.py
+----------
+Medidas caseiras em forma numérica e nutrientes por porção.
+
+As colunas `Data.Household Weights.*` trazem um texto ("1 cup, diced",
+".5 tbsp") e o peso em gramas dessa medida. Aqui as descrições viram
+quantidade, unidade e detalhe com operações de string do pandas sobre a
+coluna inteira (nada de laço por linha), e os nutrientes por 100 g viram
+nutrientes por porção com uma única multiplicação de matriz por vetor.
+
+A matriz por porção é gravada ao lado do Parquet (food.parquet →
+food_porcoes.parquet) e regenerada quando a base ou os fragmentos de upsert
+ficam mais novos que ela.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .carregamento import _atualizado, carregar_tabela, fonte_padrao
+from .esquema import COLUNA_ID, COLUNAS_NUTRIENTES, COLUNAS_PESO_PORCAO, COLUNAS_TEXTO_PORCAO
+from .incremental import caminho_fragmentos
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+SUFIXO_PORCOES = "_porcoes"
+
+# Nutrientes escalados pelo peso da porção (o percentual de descarte não escala)
+NUTRIENTES_PORCAO = [c for c in COLUNAS_NUTRIENTES if c != "Data.Refuse Percentage"]
+
+# "1 cup, diced" → quantidade "1", unidade "cup", detalhe "diced"
+PADRAO_MEDIDA = (
+    r"^\s*(?P<quantidade>\d+(?:\.\d+)?|\.\d+)?\s*"
+    r"(?P<unidade>fl oz|[^\s,(]+)?\s*,?\s*"
+    r"(?P<detalhe>.*?)\s*$"
+)
+
+# Grafias diferentes da mesma unidade
+SINONIMOS_UNIDADE = {
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "cups": "cup",
+    "ounce": "oz",
+    "ounces": "oz",
+    "pound": "lb",
+    "lbs": "lb",
+    "pieces": "piece",
+    "slices": "slice",
+    "items": "item",
+    "servings": "serving",
+}
+
+
+# ===============================================
+# 🧮 INTERPRETAÇÃO DAS MEDIDAS
+# ===============================================
+
+def interpretar_medidas(descricoes: pd.Series) -> pd.DataFrame:
+    """
+    Quantidade, unidade e detalhe de cada descrição, de uma vez para a coluna toda.
+
+    Descrição sem número vale 1 unidade; descrição vazia fica com unidade nula.
+    """
+    partes = descricoes.astype("string").str.extract(PADRAO_MEDIDA)
+    unidade = partes["unidade"].str.lower()
+    return pd.DataFrame({
+        "quantidade": pd.to_numeric(partes["quantidade"]).fillna(1.0).astype("float32"),
+        "unidade": unidade.replace(SINONIMOS_UNIDADE),
+        "detalhe": partes["detalhe"].replace("", pd.NA),
+    }, index=descricoes.index)
+
+
+def tabela_porcoes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uma linha por medida caseira válida: ID, número da medida (1 ou 2),
+    quantidade, unidade, detalhe, gramas da medida e gramas por unidade.
+
+    Medidas sem descrição ou com peso zero/nulo ficam de fora.
+    """
+    partes = []
+    for numero, (peso, descricao) in enumerate(zip(COLUNAS_PESO_PORCAO, COLUNAS_TEXTO_PORCAO), start=1):
+        medidas = interpretar_medidas(df[descricao])
+        medidas.insert(0, "porcao", np.int8(numero))
+        medidas.insert(0, COLUNA_ID, df[COLUNA_ID])
+        medidas["gramas"] = pd.to_numeric(df[peso], errors="coerce").astype("float32")
+        partes.append(medidas)
+
+    porcoes = pd.concat(partes, ignore_index=True)
+    porcoes = porcoes[porcoes["unidade"].notna() & (porcoes["gramas"] > 0)]
+    porcoes = porcoes.assign(gramas_por_unidade=porcoes["gramas"] / porcoes["quantidade"])
+    return porcoes.sort_values([COLUNA_ID, "porcao"], ignore_index=True)
+
+
+def matriz_por_porcao(df: pd.DataFrame, porcoes: pd.DataFrame | None = None,
+                      colunas=NUTRIENTES_PORCAO) -> pd.DataFrame:
+    """
+    Nutrientes de cada porção: valores por 100 g × gramas da porção / 100.
+
+    A conta é uma única operação sobre a matriz alimentos × nutrientes,
+    indexada pelas linhas de `porcoes` (padrão: `tabela_porcoes(df)`).
+    """
+    porcoes = tabela_porcoes(df) if porcoes is None else porcoes
+    colunas = [c for c in colunas if c in df.columns]
+
+    posicoes = pd.Index(df[COLUNA_ID]).get_indexer(porcoes[COLUNA_ID])
+    por_100g = df[colunas].to_numpy(dtype="float32", na_value=np.nan)
+    fator = porcoes["gramas"].to_numpy(dtype="float32") / 100
+    valores = por_100g[posicoes] * fator[:, None]
+
+    return pd.concat(
+        [porcoes.reset_index(drop=True), pd.DataFrame(valores, columns=colunas)],
+        axis=1,
+    )
+
+
+def gramas_por_medida(porcoes: pd.DataFrame, unidade: str) -> pd.Series:
+    """Gramas de 1 `unidade` (ex.: "cup") por ID; alimentos sem essa medida ficam de fora."""
+    unidade = SINONIMOS_UNIDADE.get(unidade.lower(), unidade.lower())
+    selecionadas = porcoes[porcoes["unidade"] == unidade]
+    return selecionadas.groupby(COLUNA_ID, sort=True)["gramas_por_unidade"].first()
+
+
+# ===============================================
+# 💾 MATRIZ GRAVADA AO LADO DO PARQUET
+# ===============================================
+
+def caminho_porcoes(fonte) -> Path:
+    """Parquet da matriz por porção de uma fonte (food.csv/food.parquet → food_porcoes.parquet)."""
+    fonte = Path(fonte)
+    return fonte.with_name(fonte.with_suffix("").name + SUFIXO_PORCOES + ".parquet")
+
+
+def gravar_porcoes(fonte=None, compression: str = "snappy") -> Path:
+    """Calcula a matriz por porção a partir da base (e dos fragmentos) e grava ao lado dela."""
+    fonte = Path(fonte) if fonte is not None else fonte_padrao()
+    colunas = [COLUNA_ID, *COLUNAS_PESO_PORCAO, *COLUNAS_TEXTO_PORCAO, *NUTRIENTES_PORCAO]
+    matriz = matriz_por_porcao(carregar_tabela(fonte, colunas=colunas))
+
+    destino = caminho_porcoes(fonte)
+    temporario = destino.with_suffix(".tmp")
+    matriz.to_parquet(temporario, index=False, compression=compression)
+    temporario.replace(destino)
+    return destino
+
+
+def carregar_porcoes(fonte=None, colunas=None) -> pd.DataFrame:
+    """
+    Matriz por porção da fonte, regenerada se a base mudou desde a gravação.
+
+    `colunas` projeta a leitura (ex.: só ID, unidade e calorias).
+    """
+    fonte = Path(fonte) if fonte is not None else fonte_padrao()
+    destino = caminho_porcoes(fonte)
+    parquet = fonte.with_suffix(".parquet")
+    if not all(_atualizado(destino, p) for p in (fonte, parquet, caminho_fragmentos(parquet))):
+        gravar_porcoes(fonte)
+    return pd.read_parquet(destino, columns=list(colunas) if colunas is not None else None)
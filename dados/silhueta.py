@@ -0,0 +1,231 @@
+"""
+silhueta.py
+-----------
+Silhouette exato, amostrado ou simplificado, escolhido pelo tamanho dos dados.
+
+O `silhouette_score` do scikit-learn calcula todas as distâncias entre pares
+de pontos: O(n²) em tempo e memória, inviável a partir de algumas dezenas de
+milhares de linhas. Aqui há dois estimadores aproximados:
+
+* amostrado: silhouette exato dos pontos de uma amostra estratificada por
+  cluster, medido contra todas as n linhas (O(m·n)), com intervalo de
+  confiança de 95% do estimador estratificado;
+* simplificado: distâncias só aos centroides (a = ao próprio, b = ao mais
+  próximo dos outros), O(n·k) e usando todas as linhas.
+
+Com `metodo="auto"` o estimador muda sozinho pelos limites de linhas abaixo;
+o resultado sempre informa qual foi usado.
+"""
+
+import numpy as np
+from sklearn.metrics import pairwise_distances_chunked, silhouette_score
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+# Até aqui o silhouette é exato; acima, amostrado
+LIMITE_EXATA = 10_000
+# Acima daqui, simplificado (centroides)
+LIMITE_AMOSTRADA = 1_000_000
+
+# Pontos da amostra (cada um é comparado com todas as linhas: O(m·n))
+TAMANHO_AMOSTRA = 2_000
+
+# Pontos mínimos por cluster na amostra (estratos pequenos demais deixam a
+# variância do estrato mal estimada e o IC estreito demais)
+MINIMO_ESTRATO = 30
+
+# Linhas por bloco no cálculo das distâncias aos centroides
+BLOCO = 100_000
+
+Z_95 = 1.96
+
+METODOS = ["auto", "exata", "amostrada", "simplificada"]
+
+NOMES_METODO = {
+    "auto": "Automático (pelo nº de linhas)",
+    "exata": "Exato",
+    "amostrada": "Amostrado (estratificado, IC 95%)",
+    "simplificada": "Simplificado (centroides)",
+}
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def escolher_metodo(linhas: int, metodo: str = "auto") -> str:
+    """Estimador efetivo para `linhas` pontos: o pedido, ou o dos limites se `auto`."""
+    if metodo not in METODOS:
+        raise ValueError(f"Método de silhouette desconhecido: {metodo!r} (use {METODOS}).")
+    if metodo != "auto":
+        return metodo
+    if linhas <= LIMITE_EXATA:
+        return "exata"
+    return "amostrada" if linhas <= LIMITE_AMOSTRADA else "simplificada"
+
+
+def amostra_estratificada(rotulos: np.ndarray, tamanho: int, random_state: int = 42) -> np.ndarray:
+    """
+    Posições de uma amostra com alocação proporcional por cluster.
+
+    Cada cluster entra com pelo menos `MINIMO_ESTRATO` pontos (ou todos, se
+    tiver menos), para que a variância de cada estrato seja estimável.
+    """
+    rng = np.random.default_rng(random_state)
+    ordem = np.argsort(rotulos, kind="stable")
+    grupos, inicios, contagens = np.unique(rotulos[ordem], return_index=True, return_counts=True)
+    cotas = np.round(contagens * tamanho / len(rotulos)).astype(int)
+    cotas = np.clip(cotas, np.minimum(contagens, MINIMO_ESTRATO), contagens)
+    partes = [
+        rng.choice(ordem[inicio:inicio + contagem], cota, replace=False)
+        for inicio, contagem, cota in zip(inicios, contagens, cotas)
+    ]
+    return np.sort(np.concatenate(partes))
+
+
+def centroides_dos_rotulos(dados: np.ndarray, rotulos: np.ndarray) -> np.ndarray:
+    """Média de cada cluster 0..max(rotulos); clusters vazios ficam no infinito."""
+    k = int(rotulos.max()) + 1
+    somas = np.zeros((k, dados.shape[1]))
+    np.add.at(somas, rotulos, dados)
+    contagens = np.bincount(rotulos, minlength=k)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(contagens > 0, somas / contagens, np.inf)
+
+
+# ===============================================
+# 🧮 ESTIMADORES
+# ===============================================
+
+def silhueta_pontos(dados: np.ndarray, rotulos: np.ndarray, posicoes: np.ndarray) -> np.ndarray:
+    """
+    Silhouette exato dos pontos em `posicoes`, medido contra todas as linhas.
+
+    Dá o mesmo valor que `silhouette_samples` daria a esses pontos com os
+    dados completos, mas custa O(m·n): as distâncias de cada bloco da
+    amostra a todas as linhas são somadas por cluster e descartadas.
+    """
+    ordem = np.argsort(rotulos, kind="stable")
+    grupos, inicios, contagens = np.unique(rotulos[ordem], return_index=True, return_counts=True)
+    ordenados = dados[ordem]
+
+    def somar_por_cluster(distancias, _inicio):
+        return np.add.reduceat(distancias, inicios, axis=1)
+
+    somas = np.vstack(list(pairwise_distances_chunked(dados[posicoes], ordenados, reduce_func=somar_por_cluster)))
+
+    proprio = np.searchsorted(grupos, rotulos[posicoes])
+    linhas = np.arange(len(posicoes))
+    # A distância do ponto a ele mesmo é 0: a média exclui só ele do próprio cluster
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a = somas[linhas, proprio] / (contagens[proprio] - 1)
+    medias = somas / contagens
+    medias[linhas, proprio] = np.inf
+    b = medias.min(axis=1)
+
+    maior = np.maximum(a, b)
+    s = np.divide(b - a, maior, out=np.zeros(len(posicoes)), where=maior > 0)
+    s[contagens[proprio] == 1] = 0.0
+    return s
+
+
+def silhueta_amostrada(dados: np.ndarray, rotulos: np.ndarray, tamanho: int = TAMANHO_AMOSTRA,
+                       random_state: int = 42) -> tuple[float, tuple[float, float], int]:
+    """
+    Silhouette por amostra estratificada: (estimativa, IC 95%, linhas da amostra).
+
+    Cada ponto sorteado tem o seu silhouette exato (contra todas as linhas,
+    ver `silhueta_pontos`), então a média de cada estrato é não enviesada.
+    A estimativa pondera essas médias pelo tamanho do cluster; a variância é
+    a do estimador estratificado, Σ (N_g/N)² · (1 − n_g/N_g) · s²_g / n_g.
+    """
+    posicoes = amostra_estratificada(rotulos, tamanho, random_state)
+    valores = silhueta_pontos(dados, rotulos, posicoes)
+    rotulos_amostra = rotulos[posicoes]
+
+    grupos, contagens = np.unique(rotulos, return_counts=True)
+    pesos = contagens / len(rotulos)
+    estimativa, variancia = 0.0, 0.0
+    for grupo, peso, total in zip(grupos, pesos, contagens):
+        s = valores[rotulos_amostra == grupo]
+        estimativa += peso * s.mean()
+        if len(s) > 1:
+            variancia += peso ** 2 * (1 - len(s) / total) * s.var(ddof=1) / len(s)
+
+    margem = Z_95 * np.sqrt(variancia)
+    return float(estimativa), (float(estimativa - margem), float(estimativa + margem)), len(posicoes)
+
+
+def silhueta_simplificada(dados: np.ndarray, rotulos: np.ndarray, centroides: np.ndarray | None = None,
+                          bloco: int = BLOCO) -> float:
+    """
+    Silhouette simplificado: a = distância ao próprio centroide, b = ao mais
+    próximo dos outros. Processado em blocos de linhas (memória O(bloco·k)).
+
+    Os rótulos são inteiros 0..k-1 e `centroides` segue essa numeração (ex.:
+    `kmeans.cluster_centers_`); sem ele, usa a média de cada cluster.
+    Pontos em clusters de um só ponto valem 0, como no silhouette exato.
+    """
+    centroides = centroides_dos_rotulos(dados, rotulos) if centroides is None else np.asarray(centroides, dtype="float64")
+    vazios = ~np.isfinite(centroides).all(axis=1)
+    centroides = np.where(vazios[:, None], 0.0, centroides)
+    normas_c = (centroides ** 2).sum(axis=1)
+    unitarios = np.bincount(rotulos, minlength=len(centroides)) == 1
+
+    total = 0.0
+    for inicio in range(0, len(dados), bloco):
+        x = dados[inicio:inicio + bloco]
+        r = rotulos[inicio:inicio + bloco]
+        # ‖x − c‖² = ‖x‖² − 2·x·c + ‖c‖², sem materializar linhas × k × colunas
+        quadrados = (x ** 2).sum(axis=1)[:, None] - 2 * x @ centroides.T + normas_c[None, :]
+        distancias = np.sqrt(np.maximum(quadrados, 0))
+        distancias[:, vazios] = np.inf
+        linhas = np.arange(len(x))
+        a = distancias[linhas, r]
+        distancias[linhas, r] = np.inf
+        b = distancias.min(axis=1)
+        maior = np.maximum(a, b)
+        s = np.divide(b - a, maior, out=np.zeros_like(a), where=maior > 0)
+        s[unitarios[r]] = 0.0
+        total += s.sum()
+    return float(total / len(dados))
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def silhueta(dados, rotulos, centroides=None, metodo: str = "auto",
+             tamanho_amostra: int = TAMANHO_AMOSTRA, random_state: int = 42) -> dict:
+    """
+    Silhouette pelo estimador pedido (ou escolhido pelo nº de linhas em `auto`).
+
+    Retorna `valor`, `metodo` (o efetivamente usado), `ic` (intervalo de
+    95%, só no amostrado; senão None) e `linhas` usadas no cálculo. Com um
+    único cluster o valor é 0.
+    """
+    dados = np.asarray(dados, dtype="float64")
+    rotulos = np.asarray(rotulos)
+    metodo = escolher_metodo(len(dados), metodo)
+    if len(np.unique(rotulos)) < 2:
+        return {"valor": 0.0, "metodo": metodo, "ic": None, "linhas": len(dados)}
+
+    if metodo == "amostrada" and tamanho_amostra >= len(dados):
+        metodo = "exata"
+
+    if metodo == "exata":
+        return {"valor": float(silhouette_score(dados, rotulos)), "metodo": metodo, "ic": None, "linhas": len(dados)}
+    if metodo == "amostrada":
+        valor, ic, linhas = silhueta_amostrada(dados, rotulos, tamanho_amostra, random_state)
+        return {"valor": valor, "metodo": metodo, "ic": ic, "linhas": linhas}
+    return {"valor": silhueta_simplificada(dados, rotulos, centroides), "metodo": metodo, "ic": None, "linhas": len(dados)}
+
+
+def descrever_silhueta(resultado: dict) -> str:
+    """Texto curto do estimador usado (e do IC, se houver) para exibir junto ao valor."""
+    texto = NOMES_METODO[resultado["metodo"]]
+    if resultado["ic"] is not None:
+        inferior, superior = resultado["ic"]
+        texto += f": IC 95% [{inferior:.3f}, {superior:.3f}] com {resultado['linhas']:,} linhas"
+    return texto
@@ -0,0 +1,221 @@
+"""
+validacao.py
+------------
+Validação do esquema da tabela de alimentos antes de qualquer análise.
+
+Confere tipo, nulos e faixa de valores das 48 colunas em passadas
+vetorizadas (uma operação por coluna, nunca linha a linha). Arquivos grandes
+são validados em blocos e a validação para no primeiro bloco com violação
+fatal, devolvendo um resumo compacto: uma linha por coluna/regra, com a
+quantidade de violações, a primeira linha afetada e alguns exemplos.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .esquema import (
+    COLUNA_CATEGORIA,
+    COLUNA_DESCRICAO,
+    COLUNA_ID,
+    COLUNAS,
+    COLUNAS_NUMERICAS,
+)
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+CHUNK_SIZE = 100_000
+MAX_EXEMPLOS = 3
+
+# Colunas que identificam o alimento: não podem ter nulos
+COLUNAS_OBRIGATORIAS = [COLUNA_CATEGORIA, COLUNA_DESCRICAO, COLUNA_ID]
+
+# Gramas por 100 g: entre 0 e 100
+COLUNAS_GRAMAS = [
+    "Data.Ash",
+    "Data.Carbohydrate",
+    "Data.Fiber",
+    "Data.Protein",
+    "Data.Sugar Total",
+    "Data.Water",
+    "Data.Fat.Monosaturated Fat",
+    "Data.Fat.Polysaturated Fat",
+    "Data.Fat.Saturated Fat",
+    "Data.Fat.Total Lipid",
+    "Data.Refuse Percentage",
+]
+
+# (mínimo, máximo) por coluna; as demais colunas numéricas só não podem ser negativas
+FAIXAS = {
+    **{c: (0, 100) for c in COLUNAS_GRAMAS},
+    "Data.Kilocalories": (0, 1000),  # 100 g de gordura pura ≈ 900 kcal
+    COLUNA_ID: (1, None),
+}
+
+COLUNAS_RESUMO = ["coluna", "regra", "violacoes", "primeira_linha", "exemplos", "fatal"]
+
+
+class ErroValidacao(ValueError):
+    """Violação fatal de esquema; `resumo` traz o detalhamento por coluna/regra."""
+
+    def __init__(self, resumo: pd.DataFrame):
+        self.resumo = resumo
+        fatais = resumo[resumo["fatal"]]
+        itens = ", ".join(f"{c} ({r}: {v})" for c, r, v in fatais[["coluna", "regra", "violacoes"]].itertuples(index=False))
+        super().__init__(f"Dados fora do esquema: {itens}")
+
+
+# ===============================================
+# ⚙️ REGRAS
+# ===============================================
+
+def _violacao(coluna, regra, mascara: pd.Series, valores: pd.Series, fatal: bool, deslocamento: int = 0):
+    """Linha do resumo para uma máscara booleana de violações (None se não houver)."""
+    total = int(mascara.sum())
+    if not total:
+        return None
+    posicoes = np.flatnonzero(mascara.to_numpy())
+    return {
+        "coluna": coluna,
+        "regra": regra,
+        "violacoes": total,
+        "primeira_linha": int(posicoes[0]) + deslocamento,
+        "exemplos": ", ".join(map(str, valores.iloc[posicoes[:MAX_EXEMPLOS]].tolist())),
+        "fatal": fatal,
+    }
+
+
+def validar_bloco(df: pd.DataFrame, colunas=None, deslocamento: int = 0, ids_vistos=None) -> list[dict]:
+    """
+    Valida um bloco e devolve as violações encontradas.
+
+    `colunas` são as colunas esperadas (padrão: as 48). `deslocamento` é a
+    posição do bloco no arquivo, para que `primeira_linha` seja global, e
+    `ids_vistos` (conjunto) detecta IDs repetidos entre blocos.
+    """
+    colunas = COLUNAS if colunas is None else list(colunas)
+    violacoes = []
+
+    for col in colunas:
+        if col not in df.columns:
+            violacoes.append({
+                "coluna": col, "regra": "coluna ausente", "violacoes": 1,
+                "primeira_linha": None, "exemplos": "", "fatal": True,
+            })
+            continue
+
+        serie = df[col]
+        nulos = serie.isna()
+        if col in COLUNAS_OBRIGATORIAS:
+            violacoes.append(_violacao(col, "nulo", nulos, serie, True, deslocamento))
+
+        if col not in COLUNAS_NUMERICAS and col != COLUNA_ID:
+            continue
+
+        # float64 também para Int32: comparações sem pd.NA
+        numeros = pd.to_numeric(serie, errors="coerce").astype("float64")
+        # Tinha valor, mas não é número: seria silenciosamente trocado por NaN
+        violacoes.append(_violacao(col, "tipo (não numérico)", numeros.isna() & ~nulos, serie, True, deslocamento))
+
+        minimo, maximo = FAIXAS.get(col, (0, None))
+        fora = pd.Series(False, index=serie.index)
+        if minimo is not None:
+            fora |= numeros < minimo
+        if maximo is not None:
+            fora |= numeros > maximo
+        faixa = f"faixa [{minimo}, {maximo if maximo is not None else '∞'}]"
+        violacoes.append(_violacao(col, faixa, fora, serie, col == COLUNA_ID, deslocamento))
+
+        if col == COLUNA_ID:
+            repetidos = numeros.duplicated() & numeros.notna()
+            if ids_vistos is not None:
+                repetidos |= numeros.isin(ids_vistos)
+                ids_vistos.update(numeros.dropna().tolist())
+            violacoes.append(_violacao(col, "ID repetido", repetidos, serie, True, deslocamento))
+
+    return [v for v in violacoes if v is not None]
+
+
+def _resumo(violacoes: list[dict]) -> pd.DataFrame:
+    """Consolida as violações de vários blocos em uma linha por coluna/regra."""
+    if not violacoes:
+        return pd.DataFrame(columns=COLUNAS_RESUMO)
+    bruto = pd.DataFrame(violacoes)
+    resumo = bruto.groupby(["coluna", "regra"], sort=False, as_index=False).agg(
+        violacoes=("violacoes", "sum"),
+        primeira_linha=("primeira_linha", "min"),
+        exemplos=("exemplos", "first"),
+        fatal=("fatal", "any"),
+    )
+    resumo["primeira_linha"] = resumo["primeira_linha"].astype("Int64")
+    return resumo.sort_values("fatal", ascending=False, kind="stable").reset_index(drop=True)
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def segue_esquema(df: pd.DataFrame) -> bool:
+    """True se o DataFrame tem ao menos metade das colunas da tabela de alimentos."""
+    return len(set(df.columns) & set(COLUNAS)) >= len(COLUNAS) // 2
+
+
+def validar_tabela(df: pd.DataFrame, colunas=None, levantar: bool = True) -> pd.DataFrame:
+    """
+    Valida um DataFrame já carregado.
+
+    Retorna o resumo de violações (vazio se está tudo certo). Com
+    `levantar=True`, uma violação fatal gera `ErroValidacao`; violações de
+    faixa em nutrientes são só avisos.
+    """
+    resumo = _resumo(validar_bloco(df, colunas))
+    if levantar and resumo["fatal"].any():
+        raise ErroValidacao(resumo)
+    return resumo
+
+
+def validar_blocos(blocos, colunas=None, violacoes: list | None = None):
+    """
+    Repassa os blocos de um leitor em blocos, validando cada um antes.
+
+    Para no primeiro bloco com violação fatal (`ErroValidacao`), sem ler o
+    resto do arquivo. `colunas` padrão: as do esquema presentes em cada
+    bloco. `violacoes` (lista) acumula as violações de todos os blocos,
+    inclusive avisos, para quem quiser o resumo no fim.
+    """
+    violacoes = [] if violacoes is None else violacoes
+    ids_vistos = set()
+    deslocamento = 0
+    for bloco in blocos:
+        esperadas = [c for c in bloco.columns if c in COLUNAS] if colunas is None else colunas
+        violacoes += validar_bloco(bloco, esperadas, deslocamento, ids_vistos)
+        deslocamento += len(bloco)
+        if any(v["fatal"] for v in violacoes):
+            raise ErroValidacao(_resumo(violacoes))
+        yield bloco
+
+
+def validar_arquivo(caminho, colunas=None, chunksize: int = CHUNK_SIZE, levantar: bool = True) -> pd.DataFrame:
+    """
+    Valida um CSV em blocos, parando no primeiro bloco com violação fatal.
+
+    A memória fica limitada a um bloco; outros formatos são lidos inteiros.
+    Sem `colunas`, todas as 48 são exigidas.
+    """
+    caminho = Path(caminho)
+    if caminho.suffix.lower() != ".csv":
+        from .carregamento import ler_arquivo  # carregamento.py depende deste módulo
+        return validar_tabela(ler_arquivo(caminho), colunas, levantar)
+
+    violacoes = []
+    try:
+        for _ in validar_blocos(pd.read_csv(caminho, chunksize=chunksize, dtype=str),
+                                COLUNAS if colunas is None else colunas, violacoes):
+            pass
+    except ErroValidacao as erro:
+        if levantar:
+            raise
+        return erro.resumo
+    return _resumo(violacoes)
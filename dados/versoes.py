@@ -0,0 +1,255 @@
+"""
+versoes.py
+----------
+Versões do dataset como fragmentos Parquet imutáveis e diffs entre elas.
+
+Cada versão grava um único fragmento com o que mudou em relação à anterior:
+linhas novas ou alteradas (completas) e marcas de remoção (só a chave). Um
+manifesto JSON lista as versões e as contagens. Ler a versão N é aplicar os
+fragmentos 1..N em ordem; guardar uma versão custa o tamanho da mudança, não
+o do dataset.
+
+Cada linha leva uma chave (`_chave`, o Nutrient Data Bank Number quando ele
+identifica as linhas) e um hash do conteúdo (`_hash`). O diff entre duas
+versões compara só essas duas colunas e depois lê as linhas completas apenas
+das chaves que mudaram, para que caches derivados (clusters, predições)
+sejam atualizados só nessas linhas.
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .carregamento import DIR_CACHE
+from .esquema import COLUNA_ID
+from .impressoes import HASH, NULOS, impressoes_linhas, resumo_impressoes
+
+# ===============================================
+# 🔧 CONFIGURAÇÕES
+# ===============================================
+MANIFESTO = "_versoes.json"
+
+# Colunas internas dos fragmentos (removidas na leitura)
+CHAVE = "_chave"
+REMOVIDO = "_removido"
+COLUNAS_INTERNAS = [CHAVE, HASH, NULOS, REMOVIDO]
+
+
+# ===============================================
+# ⚙️ FUNÇÕES AUXILIARES
+# ===============================================
+
+def caminho_versoes(nome: str) -> Path:
+    """Diretório de versões de um dataset (ex.: .cache/versoes/food.csv/)."""
+    return DIR_CACHE / "versoes" / nome
+
+
+def _ler_manifesto(pasta: Path) -> dict:
+    arquivo = pasta / MANIFESTO
+    if not arquivo.exists():
+        return {"chave": None, "versoes": []}
+    return json.loads(arquivo.read_text(encoding="utf-8"))
+
+
+def _gravar_manifesto(pasta: Path, manifesto: dict) -> None:
+    temporario = pasta / (MANIFESTO + ".tmp")
+    temporario.write_text(json.dumps(manifesto, indent=2, ensure_ascii=False), encoding="utf-8")
+    temporario.replace(pasta / MANIFESTO)
+
+
+def coluna_chave(df: pd.DataFrame) -> str | None:
+    """Nutrient Data Bank Number, se ele existir e identificar cada linha; senão None."""
+    if COLUNA_ID in df.columns and df[COLUNA_ID].notna().all() and df[COLUNA_ID].is_unique:
+        return COLUNA_ID
+    return None
+
+
+def marcar_linhas(df: pd.DataFrame, chave: str | None = None, impressoes: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Chave, hash de conteúdo e nulos de cada linha, calculados para o DataFrame todo.
+
+    `impressoes` reaproveita as já calculadas (ver `impressoes.py`). Sem
+    coluna-chave, a chave é o próprio hash (com um contador para linhas
+    repetidas): uma linha editada aparece como removida + adicionada.
+    """
+    impressoes = impressoes_linhas(df) if impressoes is None else impressoes
+    hashes = pd.Series(impressoes[HASH].to_numpy(), index=df.index)
+    if chave is not None:
+        chaves = df[chave].astype("string")
+    else:
+        ocorrencia = hashes.groupby(hashes).cumcount()
+        chaves = hashes.map("{:016x}".format) + "#" + ocorrencia.astype(str)
+    return pd.DataFrame(
+        {CHAVE: chaves.to_numpy(), HASH: hashes.to_numpy(), NULOS: impressoes[NULOS].to_numpy()},
+        index=df.index,
+    )
+
+
+def _numero(manifesto: dict, versao: int | None) -> int:
+    """Número da versão pedida (None = a mais recente), validado contra o manifesto."""
+    total = len(manifesto["versoes"])
+    if versao is None:
+        versao = total
+    if not 1 <= versao <= total:
+        raise ValueError(f"Versão {versao} não existe (há {total}).")
+    return versao
+
+
+def _aplicar_fragmentos(pasta: Path, manifesto: dict, versao: int, colunas=None, chaves=None) -> pd.DataFrame:
+    """
+    Estado da versão: fragmentos 1..versao em ordem, vale o último registro
+    de cada chave e as marcas de remoção tiram a linha.
+
+    `colunas` projeta a leitura (as internas sempre vêm); `chaves` restringe
+    às linhas dessas chaves, com o filtro empurrado para o leitor.
+    """
+    leitura = None if colunas is None else COLUNAS_INTERNAS + [c for c in colunas if c not in COLUNAS_INTERNAS]
+    filtros = [(CHAVE, "in", list(chaves))] if chaves is not None else None
+
+    partes = []
+    for entrada in manifesto["versoes"][:versao]:
+        if entrada["fragmento"] is None:
+            continue
+        arquivo = pasta / entrada["fragmento"]
+        existentes = pq.read_schema(arquivo).names
+        projecao = None if leitura is None else [c for c in leitura if c in existentes]
+        partes.append(pd.read_parquet(arquivo, columns=projecao, filters=filtros))
+
+    if not partes:
+        return pd.DataFrame(columns=leitura or COLUNAS_INTERNAS)
+
+    estado = pd.concat(partes, ignore_index=True).drop_duplicates(CHAVE, keep="last")
+    return estado[~estado[REMOVIDO]].reset_index(drop=True)
+
+
+# ===============================================
+# 🚀 API PRINCIPAL
+# ===============================================
+
+def listar_versoes(pasta) -> pd.DataFrame:
+    """Uma linha por versão: número, data, origem e contagens do que mudou."""
+    return pd.DataFrame(_ler_manifesto(Path(pasta))["versoes"])
+
+
+def gravar_versao(df: pd.DataFrame, pasta, origem: str | None = None,
+                  compression: str = "snappy", impressoes: pd.DataFrame | None = None) -> dict:
+    """
+    Grava `df` como nova versão, guardando só o que mudou desde a anterior.
+
+    Se nada mudou, nenhuma versão é criada e a entrada da mais recente é
+    devolvida. Retorna a entrada do manifesto (número, linhas, adicionadas,
+    alteradas, removidas, fragmento). `impressoes` evita recalcular os
+    hashes quando eles já existem.
+    """
+    pasta = Path(pasta)
+    pasta.mkdir(parents=True, exist_ok=True)
+    df = df.reset_index(drop=True)
+    manifesto = _ler_manifesto(pasta)
+    if not manifesto["versoes"]:
+        manifesto["chave"] = coluna_chave(df)
+    # Chave que deixou de ser única: as linhas passam a ser identificadas pelo hash
+    chave = manifesto["chave"] if manifesto["chave"] is not None and coluna_chave(df) == manifesto["chave"] else None
+
+    marcas = marcar_linhas(df, chave, impressoes)
+    anterior = (
+        _aplicar_fragmentos(pasta, manifesto, len(manifesto["versoes"]), colunas=[])
+        if manifesto["versoes"] else pd.DataFrame(columns=[CHAVE, HASH])
+    )
+    hash_anterior = pd.Series(anterior[HASH].to_numpy(), index=anterior[CHAVE].to_numpy())
+
+    existia = marcas[CHAVE].isin(hash_anterior.index).to_numpy()
+    mudou = np.zeros(len(marcas), dtype=bool)
+    mudou[existia] = marcas[HASH].to_numpy()[existia] != hash_anterior.loc[marcas[CHAVE][existia]].to_numpy()
+    gravar = ~existia | mudou
+    removidas = hash_anterior.index.difference(pd.Index(marcas[CHAVE]))
+
+    colunas = list(df.columns)
+    ultima = manifesto["versoes"][-1] if manifesto["versoes"] else None
+    if ultima is not None and not gravar.any() and removidas.empty and ultima["colunas"] == colunas:
+        return ultima
+
+    numero = len(manifesto["versoes"]) + 1
+    linhas = pd.concat([df[gravar], marcas[gravar]], axis=1).assign(**{REMOVIDO: False})
+    remocoes = pd.DataFrame({
+        CHAVE: removidas.astype(str),
+        HASH: np.zeros(len(removidas), dtype="uint64"),
+        NULOS: np.zeros(len(removidas), dtype="int32"),
+    })
+    fragmento = pd.concat([linhas, remocoes.assign(**{REMOVIDO: True})], ignore_index=True)
+
+    nome = None
+    if not fragmento.empty:
+        nome = f"versao-{numero:04d}.parquet"
+        temporario = pasta / (nome + ".tmp")
+        pq.write_table(pa.Table.from_pandas(fragmento, preserve_index=False), temporario, compression=compression)
+        temporario.replace(pasta / nome)
+
+    entrada = {
+        "versao": numero,
+        "criada_em": datetime.now().isoformat(timespec="seconds"),
+        "origem": origem,
+        "fragmento": nome,
+        "colunas": colunas,
+        "linhas": len(df),
+        "adicionadas": int((~existia).sum()),
+        "alteradas": int(mudou.sum()),
+        "removidas": len(removidas),
+    }
+    manifesto["versoes"].append(entrada)
+    _gravar_manifesto(pasta, manifesto)
+    return entrada
+
+
+def ler_versao(pasta, versao: int | None = None, colunas=None) -> pd.DataFrame:
+    """DataFrame de uma versão (None = a mais recente), só com as colunas dela."""
+    pasta = Path(pasta)
+    manifesto = _ler_manifesto(pasta)
+    versao = _numero(manifesto, versao)
+    colunas = list(colunas) if colunas is not None else manifesto["versoes"][versao - 1]["colunas"]
+    return _aplicar_fragmentos(pasta, manifesto, versao, colunas).reindex(columns=colunas)
+
+
+def resumo_versao(pasta, versao: int | None = None) -> dict:
+    """Linhas, nulos e duplicatas de uma versão, lidos só das impressões gravadas."""
+    pasta = Path(pasta)
+    manifesto = _ler_manifesto(pasta)
+    return resumo_impressoes(_aplicar_fragmentos(pasta, manifesto, _numero(manifesto, versao), colunas=[]))
+
+
+def diferenca(pasta, de: int, para: int | None = None, colunas=None) -> dict[str, pd.DataFrame]:
+    """
+    Linhas adicionadas, removidas e alteradas entre duas versões.
+
+    A comparação usa só chave e hash; as linhas completas são lidas apenas
+    para as chaves que mudaram. `alteradas` traz os valores de `para`,
+    `anteriores` os de `de` para as mesmas chaves e `removidas` os de `de`.
+    """
+    pasta = Path(pasta)
+    manifesto = _ler_manifesto(pasta)
+    de, para = _numero(manifesto, de), _numero(manifesto, para)
+
+    antes = _aplicar_fragmentos(pasta, manifesto, de, colunas=[]).set_index(CHAVE)[HASH]
+    depois = _aplicar_fragmentos(pasta, manifesto, para, colunas=[]).set_index(CHAVE)[HASH]
+
+    comuns = antes.index.intersection(depois.index)
+    alteradas = comuns[antes.loc[comuns].to_numpy() != depois.loc[comuns].to_numpy()]
+    adicionadas = depois.index.difference(antes.index)
+    removidas = antes.index.difference(depois.index)
+
+    def linhas(versao, chaves):
+        nomes = list(colunas) if colunas is not None else manifesto["versoes"][versao - 1]["colunas"]
+        if chaves.empty:
+            return pd.DataFrame(columns=nomes)
+        return _aplicar_fragmentos(pasta, manifesto, versao, nomes, chaves.tolist()).reindex(columns=nomes)
+
+    return {
+        "adicionadas": linhas(para, adicionadas),
+        "removidas": linhas(de, removidas),
+        "alteradas": linhas(para, alteradas),
+        "anteriores": linhas(de, alteradas),
+    }
@@ -3,11 +3,17 @@
 # OBJETIVO: Gerar gráficos personalizados de análise nutricional
 # ============================================================
 
+import sys
+from pathlib import Path
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from dados import carregar_tabela
+
 # --------------------- CONFIGURAÇÕES GERAIS ---------------------
 
 plt.style.use('default')
@@ -17,7 +23,14 @@ pd.set_option('display.float_format', lambda x: f'{x:.2f}')
 
 # ------------------------- CARREGAR DADOS -------------------------
 
-df = pd.read_csv('food.csv')
+colunas_nutricionais = [
+    'Data.Kilocalories', 'Data.Protein', 'Data.Fat.Total Lipid',
+    'Data.Carbohydrate', 'Data.Fiber', 'Data.Major Minerals.Calcium',
+    'Data.Cholesterol'
+]
+
+# Lê apenas as colunas usadas nos gráficos
+df = carregar_tabela('food.csv', colunas=colunas_nutricionais + ['Category', 'Description'])
 
 print("📊 DATASET CARREGADO COM SUCESSO!")
 print(f"Shape: {df.shape}")
@@ -25,12 +38,6 @@ print(f"Colunas disponíveis: {list(df.columns)}")
 
 # ------------------ SELEÇÃO E LIMPEZA ------------------
 
-colunas_nutricionais = [
-    'Data.Kilocalories', 'Data.Protein', 'Data.Fat.Total Lipid',
-    'Data.Carbohydrate', 'Data.Fiber', 'Data.Major Minerals.Calcium',
-    'Data.Cholesterol'
-]
-
 colunas_usar = [col for col in colunas_nutricionais if col in df.columns]
 nutrientes_df = df[colunas_usar].copy()
 nutrientes_df = nutrientes_df.fillna(nutrientes_df.median(numeric_only=True))
@@ -1,19 +1,18 @@
+import sys
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
 import numpy as np
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import Pipeline
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from sklearn.pipeline import Pipeline
-from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler
-from sklearn.cluster import KMeans
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from dados import carregar_tabela, impressao_dataset, listar_categorias
+from dados.agrupamento import progresso_varredura, resultado_kmeans, varredura_kmeans
+from dados.modelos import obter_modelo
 
 # --- Configuração da página ---
 st.set_page_config(
@@ -23,13 +22,26 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# --- Leitura dos dados ---
-df = pd.read_excel("/home/leandro/VS Code Projetos/food.xlsx")
+# --- Leitura dos dados (Parquet se houver; tipos já convertidos pelo loader) ---
+# Colunas usadas pela página; as demais nem são lidas do disco
+COLUNAS_USADAS = [
+    "Category", "Description",
+    "Data.Kilocalories", "Data.Protein", "Data.Carbohydrate", "Data.Fat.Total Lipid"
+]
 
-# Converter colunas numéricas
-for col in df.columns:
-    if col.startswith("Data."):
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+@st.cache_data
+def carregar_dados(categorias=None):
+    # Com categorias, só as partições selecionadas são lidas do disco
+    return carregar_tabela(categorias=categorias, colunas=COLUNAS_USADAS)
+
+@st.cache_data
+def impressao_dados(categorias=None):
+    # Identifica o dataset no registro de modelos (mesma chave do cache acima)
+    return impressao_dataset(carregar_dados(categorias))
+
+@st.cache_data
+def carregar_categorias():
+    return listar_categorias()
 
 # --- Paleta de cores ---
 cores = {
@@ -52,9 +64,9 @@ else:
 st.title("🍎 Dashboard Nutricional Completo com Machine Learning")
 
 # --- Filtros globais ---
-categorias = st.multiselect("Filtrar por categoria:", df["Category"].unique())
-if categorias:
-    df = df[df["Category"].isin(categorias)]
+categorias = st.multiselect("Filtrar por categoria:", carregar_categorias())
+df = carregar_dados(tuple(categorias) or None)
+impressao = impressao_dados(tuple(categorias) or None)
 
 # --- Abas principais ---
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
@@ -85,7 +97,7 @@ with tab2:
     st.subheader("🥗 Nutrientes Médios por Categoria")
     nutrientes = ["Data.Kilocalories", "Data.Protein", "Data.Carbohydrate", "Data.Fat.Total Lipid"]
     nutriente = st.selectbox("Escolha o nutriente:", nutrientes, index=0)
-    cat_media = df.groupby("Category")[nutrientes].mean().reset_index()
+    cat_media = df.groupby("Category", observed=True)[nutrientes].mean().reset_index()
     top20 = cat_media.nlargest(20, nutriente).sort_values(by=nutriente)
     fig_cat = px.bar(
         top20, x=nutriente, y="Category", orientation="h",
@@ -167,20 +179,41 @@ with tab5:
     st.markdown("### 🔮 Previsão de Calorias de um Alimento")
     st.markdown("Insira os valores de **proteínas, carboidratos e gorduras** de um alimento e veja a **estimativa de calorias**.")
 
-    X = df[["Data.Protein","Data.Carbohydrate","Data.Fat.Total Lipid"]]
-    y = df["Data.Kilocalories"]
-    pipeline_rf = Pipeline([
-        ("imputer", SimpleImputer(strategy="mean")),
-        ("model", RandomForestRegressor(n_estimators=100, random_state=42))
-    ])
-    pipeline_rf.fit(X, y)
+    # O modelo é ajustado uma vez por (dataset, hiperparâmetros) e gravado no
+    # registro; nos reruns seguintes (tema, outros widgets) só é carregado
+    params_rf = {
+        "features": ["Data.Protein", "Data.Carbohydrate", "Data.Fat.Total Lipid"],
+        "alvo": "Data.Kilocalories",
+        "imputer": "mean",
+        "n_estimators": 100,
+        "random_state": 42,
+    }
+
+    def ajustar_rf():
+        X = df[params_rf["features"]]
+        y = df[params_rf["alvo"]]
+        pipeline = Pipeline([
+            ("imputer", SimpleImputer(strategy=params_rf["imputer"])),
+            ("model", RandomForestRegressor(n_estimators=params_rf["n_estimators"],
+                                            random_state=params_rf["random_state"], oob_score=True))
+        ])
+        pipeline.fit(X, y)
+        return pipeline, {"r2_oob": float(pipeline.named_steps["model"].oob_score_), "linhas": len(X)}
 
     protein = st.number_input("Proteína (g):", min_value=0.0)
     carb = st.number_input("Carboidrato (g):", min_value=0.0)
     fat = st.number_input("Gordura (g):", min_value=0.0)
     if st.button("Prever Calorias"):
-        cal_pred = pipeline_rf.predict([[protein, carb, fat]])[0]
+        with st.spinner("Carregando modelo..."):
+            registro = obter_modelo("calorias-rf", impressao, params_rf, ajustar_rf)
+        pipeline_rf = registro["modelo"]
+        entrada = pd.DataFrame([[protein, carb, fat]], columns=params_rf["features"])
+        cal_pred = pipeline_rf.predict(entrada)[0]
         st.success(f"🍎 Calorias estimadas: **{cal_pred:.1f} kcal**")
+        st.caption(
+            f"Modelo {'ajustado agora' if registro['novo'] else 'do registro'} em {registro['criado_em']} "
+            f"({registro['tempo_ajuste']:.1f}s de ajuste, R² fora da amostra: {registro['metricas']['r2_oob']:.3f})"
+        )
 
         importances = pipeline_rf.named_steps["model"].feature_importances_
         fig_importance = px.bar(
@@ -210,25 +243,20 @@ with tab5:
     # --- Escolha de número de clusters ---
     k = st.slider("Número de grupos (clusters):", 2, 10, 4)
 
-    # --- Criação do pipeline de processamento ---
-    pipeline_kmeans = Pipeline([
-        ("imputer", SimpleImputer(strategy="mean")),
-        ("scaler", StandardScaler()),
-        ("kmeans", KMeans(n_clusters=k, random_state=42))
-    ])
-    pipeline_kmeans.fit(X_cluster)
+    # --- Pipeline (imputação, padronização, K-Means) pré-calculado para k de 2 a 10 ---
+    # Todos os k são ajustados uma vez por dataset em segundo plano; o slider
+    # só troca entre resultados prontos (rótulos, centroides e resumo)
+    with st.spinner(f"Agrupando com k={k}..."):
+        resultado_k = resultado_kmeans(X_cluster, impressao, k)
+    prontos, total = progresso_varredura(varredura_kmeans(X_cluster, impressao))
+    if prontos < total:
+        st.caption(f"⏳ Pré-calculando os demais valores de k em segundo plano ({prontos}/{total} prontos).")
 
     # --- Criação do DataFrame clusterizado ---
-    df_clustered = df.copy()
-    df_clustered["Cluster"] = pipeline_kmeans.named_steps["kmeans"].labels_
+    df_clustered = df.assign(Cluster=resultado_k["rotulos"])
 
     # --- Resumo dos clusters ---
-    cluster_summary = (
-        df_clustered.groupby("Cluster")[["Data.Kilocalories", "Data.Protein", "Data.Carbohydrate", "Data.Fat.Total Lipid"]]
-        .mean()
-        .round(1)
-    )
-    cluster_summary["Qtd. Itens"] = df_clustered.groupby("Cluster").size()
+    cluster_summary = resultado_k["resumo"].copy()
     cluster_summary["Descrição Nutricional"] = cluster_summary.apply(
         lambda row: f"Cal: {row['Data.Kilocalories']}, Prot: {row['Data.Protein']}, Carb: {row['Data.Carbohydrate']}, Gord: {row['Data.Fat.Total Lipid']}",
         axis=1
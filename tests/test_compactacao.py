@@ -0,0 +1,41 @@
+"""
+test_compactacao.py
+-------------------
+A compactação segue o esquema: nutrientes continuam float e nenhuma coluna
+passa a ocupar mais memória.
+"""
+
+import numpy as np
+import pandas as pd
+
+from dados.compactacao import compactar
+from dados.esquema import COLUNA_ID
+
+
+def test_tipos_nao_dependem_do_conteudo_do_upload():
+    df = pd.DataFrame({
+        COLUNA_ID: [1001.0, 1002.0, 1003.0],
+        "Data.Alpha Carotene": [0, 12, 40],
+        "Data.Beta Carotene": [0.0, 5.0, 9.0],
+        "Data.Protein": [1.5, np.inf, np.nan],
+    })
+
+    compacto, relatorio = compactar(df)
+
+    assert compacto[COLUNA_ID].dtype.kind == "i"
+    assert compacto["Data.Alpha Carotene"].dtype == np.float32
+    assert compacto["Data.Beta Carotene"].dtype == np.float32
+    assert compacto["Data.Protein"].dtype.kind == "f"
+    np.testing.assert_array_equal(compacto.to_numpy("float64"), df.to_numpy("float64"))
+    assert (relatorio["economia_bytes"] >= 0).all()
+
+
+def test_conversao_sem_ganho_e_descartada():
+    # Uma linha só: category (códigos + dicionário) ocupa mais que o texto
+    df = pd.DataFrame({"texto": ["a"]})
+    assert df["texto"].astype("category").memory_usage(deep=True) > df["texto"].memory_usage(deep=True)
+
+    compacto, relatorio = compactar(df)
+
+    assert compacto["texto"].dtype == df["texto"].dtype
+    assert relatorio.loc[0, "economia_bytes"] == 0
@@ -0,0 +1,32 @@
+"""
+test_compartilhado.py
+---------------------
+A visão pandas do Arrow mapeado em memória não copia e é somente leitura.
+"""
+
+import pandas as pd
+import pytest
+
+from dados.compartilhado import abrir_arrow, salvar_arrow, visao_pandas
+
+
+def _visao(tmp_path):
+    arquivo = salvar_arrow(pd.DataFrame({"Data.Ash": [1.5, 2.0], "Description": ["a", "b"]}), tmp_path / "dados.arrow")
+    return visao_pandas(abrir_arrow(arquivo))
+
+
+def test_escrever_celula_da_visao_levanta_erro(tmp_path):
+    df = _visao(tmp_path)
+    with pytest.raises(ValueError, match="read-only"):
+        df.loc[0, "Data.Ash"] = 3.0
+
+
+def test_coluna_inteira_e_copia_podem_ser_alteradas(tmp_path):
+    df = _visao(tmp_path)
+    df["Data.Ash"] = df["Data.Ash"] * 2
+    copia = _visao(tmp_path).copy()
+    copia.loc[0, "Data.Ash"] = 3.0
+
+    assert df["Data.Ash"].tolist() == [3.0, 4.0]
+    assert copia["Data.Ash"].tolist() == [3.0, 2.0]
+    assert _visao(tmp_path)["Data.Ash"].tolist() == [1.5, 2.0]
@@ -0,0 +1,54 @@
+"""
+test_consulta.py
+----------------
+O backend SQL (dados/consulta.py) tem de concordar com o caminho em pandas.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from dados.compartilhado import salvar_arrow
+from dados.consulta import faixas_numericas, filtrar
+from dados.indice import estatisticas_row_groups, gravar_indexado, row_groups_relevantes
+
+
+def test_faixas_numericas_igual_ao_pandas(tmp_path):
+    df = pd.DataFrame({
+        "com_lacuna": [1.5, np.nan, 3.25],
+        "inteira": [1, 2, 3],
+        "com_infinito": [np.inf, 1.0, np.nan],
+        "vazia": [np.nan, np.nan, np.nan],
+    })
+    arquivo = tmp_path / "dados.arrow"
+    salvar_arrow(df, arquivo)
+
+    limites = faixas_numericas(arquivo, df.columns)
+
+    for coluna in df.columns:
+        esperado = (df[coluna].min(), df[coluna].max())
+        obtido = tuple(np.nan if v is None else v for v in limites[coluna])
+        np.testing.assert_equal(obtido, esperado)
+
+
+def test_filtrar_parquet_indexado_igual_a_mascara(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "Description": [f"item {i}" for i in range(5_000)],
+        "Data.Kilocalories": rng.uniform(0, 900, 5_000),
+        "Data.Protein": rng.uniform(0, 90, 5_000),
+    })
+    df.loc[::97, "Data.Protein"] = np.nan
+    arquivo = gravar_indexado(df, tmp_path / "dados.parquet")
+    faixas = {"Data.Kilocalories": (50.0, 400.0), "Data.Protein": (20.0, 25.0)}
+
+    obtido = filtrar(arquivo, faixas=faixas)
+
+    mascara = pd.Series(True, index=df.index)
+    for coluna, (minimo, maximo) in faixas.items():
+        mascara &= (df[coluna] >= minimo) & (df[coluna] <= maximo)
+    esperado = df[mascara].reset_index(drop=True)
+    pd.testing.assert_frame_equal(obtido, esperado, check_dtype=False)
+    assert len(row_groups_relevantes(arquivo, faixas)) < len(estatisticas_row_groups(arquivo, []))
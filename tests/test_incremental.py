@@ -0,0 +1,42 @@
+"""
+test_incremental.py
+-------------------
+Upsert grava só linhas novas ou alteradas; a consolidação junta tudo na base.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from dados.carregamento import aplicar_esquema
+from dados.esquema import COLUNA_ID
+from dados.incremental import consolidar, ler_com_fragmentos, listar_fragmentos, upsert
+
+CSV = Path(__file__).resolve().parent.parent / "food.cv.csv"
+
+
+def test_upsert_e_consolidacao(tmp_path):
+    base = aplicar_esquema(pd.read_csv(CSV, nrows=20))
+    parquet = tmp_path / "food.parquet"
+    base.iloc[:15].to_parquet(parquet, index=False)
+
+    # Linha 0 alterada, linha 1 igual, linha 15 nova
+    delta = pd.read_csv(CSV, nrows=20).iloc[[0, 1, 15]].copy()
+    delta.loc[delta.index[0], "Data.Kilocalories"] += 1
+    delta.to_csv(tmp_path / "delta.csv", index=False)
+
+    resumo = upsert(tmp_path / "delta.csv", parquet)
+
+    assert (resumo["novas"], resumo["alteradas"]) == (1, 1)
+    assert len(listar_fragmentos(parquet)) == 1
+    atual = ler_com_fragmentos(parquet).set_index(COLUNA_ID)
+    assert len(atual) == 16
+    id_alterado = base[COLUNA_ID].iloc[0]
+    assert atual.loc[id_alterado, "Data.Kilocalories"] == base["Data.Kilocalories"].iloc[0] + 1
+
+    assert upsert(tmp_path / "delta.csv", parquet)["fragmento"] is None
+
+    assert consolidar(parquet) == 16
+    assert listar_fragmentos(parquet) == []
+    consolidado = aplicar_esquema(pd.read_parquet(parquet)).set_index(COLUNA_ID).sort_index()
+    pd.testing.assert_frame_equal(consolidado, aplicar_esquema(atual.reset_index()).set_index(COLUNA_ID).sort_index())
@@ -0,0 +1,30 @@
+"""
+test_porcoes.py
+---------------
+Interpretação das descrições de medidas caseiras ("1 cup, diced").
+"""
+
+import pandas as pd
+
+from dados.porcoes import gramas_por_medida, interpretar_medidas
+
+
+def test_quantidade_unidade_e_detalhe():
+    descricoes = pd.Series(["1 cup, diced", "2 tablespoons", ".5 oz", "slice", "1 fl oz", None])
+
+    medidas = interpretar_medidas(descricoes)
+
+    assert medidas["quantidade"].tolist() == [1.0, 2.0, 0.5, 1.0, 1.0, 1.0]
+    assert medidas["unidade"].tolist()[:5] == ["cup", "tbsp", "oz", "slice", "fl oz"]
+    assert pd.isna(medidas["unidade"].iloc[5])
+    assert medidas["detalhe"].iloc[0] == "diced"
+    assert pd.isna(medidas["detalhe"].iloc[1])
+
+
+def test_gramas_por_medida_aceita_sinonimos():
+    porcoes = pd.DataFrame({
+        "Nutrient Data Bank Number": [1, 2, 2],
+        "unidade": ["tbsp", "tbsp", "cup"],
+        "gramas_por_unidade": [14.0, 7.5, 240.0],
+    })
+    assert gramas_por_medida(porcoes, "Tablespoon").to_dict() == {1: 14.0, 2: 7.5}
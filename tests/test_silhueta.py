@@ -0,0 +1,42 @@
+"""
+test_silhueta.py
+----------------
+Os estimadores de silhouette concordam com o scikit-learn.
+"""
+
+import numpy as np
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+from sklearn.metrics import silhouette_samples, silhouette_score
+
+from dados.silhueta import silhueta, silhueta_pontos
+
+
+def _dados(n=1_500):
+    dados, _ = make_blobs(n_samples=n, centers=4, cluster_std=2.5, random_state=0)
+    rotulos = KMeans(n_clusters=4, n_init=3, random_state=0).fit_predict(dados)
+    return dados, rotulos
+
+
+def test_silhueta_pontos_igual_a_silhouette_samples():
+    dados, rotulos = _dados()
+    posicoes = np.array([0, 7, 100, 999, 1_499])
+    np.testing.assert_allclose(silhueta_pontos(dados, rotulos, posicoes),
+                               silhouette_samples(dados, rotulos)[posicoes])
+
+
+def test_exata_e_intervalo_da_amostrada():
+    dados, rotulos = _dados()
+    exata = silhouette_score(dados, rotulos)
+
+    assert silhueta(dados, rotulos, metodo="exata")["valor"] == exata
+    amostrada = silhueta(dados, rotulos, metodo="amostrada", tamanho_amostra=500)
+    inferior, superior = amostrada["ic"]
+    assert amostrada["metodo"] == "amostrada"
+    assert inferior <= exata <= superior
+    assert -1 <= silhueta(dados, rotulos, metodo="simplificada")["valor"] <= 1
+
+
+def test_um_cluster_vale_zero():
+    dados, _ = _dados(100)
+    assert silhueta(dados, np.zeros(100, dtype=int))["valor"] == 0.0
@@ -0,0 +1,42 @@
+"""
+test_validacao.py
+-----------------
+Validação em blocos: a posição das violações é a do arquivo e IDs repetidos
+são detectados mesmo em blocos diferentes.
+"""
+
+import pandas as pd
+import pytest
+
+from dados.esquema import COLUNA_ID
+from dados.validacao import ErroValidacao, validar_blocos, validar_tabela
+
+
+def test_id_repetido_entre_blocos_para_no_bloco_dele():
+    blocos = [
+        pd.DataFrame({COLUNA_ID: [1, 2, 3], "Data.Protein": [1.0, 2.0, 3.0]}),
+        pd.DataFrame({COLUNA_ID: [4, 2], "Data.Protein": [4.0, 5.0]}),
+        pd.DataFrame({COLUNA_ID: [9], "Data.Protein": [9.0]}),
+    ]
+    lidos = []
+
+    with pytest.raises(ErroValidacao) as erro:
+        for bloco in validar_blocos(iter(blocos)):
+            lidos.append(bloco)
+
+    assert len(lidos) == 1
+    resumo = erro.value.resumo
+    repetido = resumo[resumo["regra"] == "ID repetido"].iloc[0]
+    assert repetido["violacoes"] == 1
+    assert repetido["primeira_linha"] == 4
+
+
+def test_fora_da_faixa_e_aviso_e_texto_em_coluna_numerica_e_fatal():
+    df = pd.DataFrame({COLUNA_ID: [1, 2], "Data.Protein": [-1.0, 2.0]})
+    resumo = validar_tabela(df, df.columns)
+    assert not resumo["fatal"].any()
+    assert resumo["regra"].str.startswith("faixa").any()
+
+    df = pd.DataFrame({COLUNA_ID: [1, 2], "Data.Protein": ["abc", "2"]})
+    with pytest.raises(ErroValidacao, match="não numérico"):
+        validar_tabela(df, df.columns)
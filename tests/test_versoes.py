@@ -0,0 +1,33 @@
+"""
+test_versoes.py
+---------------
+Versões guardam só o que mudou e a diferença entre elas é exata.
+"""
+
+import pandas as pd
+
+from dados.esquema import COLUNA_ID
+from dados.versoes import diferenca, gravar_versao, ler_versao, listar_versoes
+
+
+def test_versoes_e_diferenca(tmp_path):
+    v1 = pd.DataFrame({COLUNA_ID: [1, 2, 3], "Data.Protein": [1.0, 2.0, 3.0]})
+    v2 = pd.DataFrame({COLUNA_ID: [1, 2, 4], "Data.Protein": [1.0, 2.5, 4.0]})
+
+    gravar_versao(v1, tmp_path, origem="v1.csv")
+    entrada = gravar_versao(v2, tmp_path, origem="v2.csv")
+
+    assert (entrada["adicionadas"], entrada["alteradas"], entrada["removidas"]) == (1, 1, 1)
+    # Sem mudanças, nenhuma versão nova
+    assert gravar_versao(v2, tmp_path)["versao"] == 2
+    assert len(listar_versoes(tmp_path)) == 2
+
+    pd.testing.assert_frame_equal(
+        ler_versao(tmp_path, 1).sort_values(COLUNA_ID, ignore_index=True), v1, check_dtype=False
+    )
+
+    mudancas = diferenca(tmp_path, 1, 2)
+    assert mudancas["adicionadas"][COLUNA_ID].tolist() == [4]
+    assert mudancas["removidas"][COLUNA_ID].tolist() == [3]
+    assert mudancas["alteradas"]["Data.Protein"].tolist() == [2.5]
+    assert mudancas["anteriores"]["Data.Protein"].tolist() == [2.0]